@@ -0,0 +1,174 @@
+"""Measure kitchen scheduling at thousands of open orders.
+
+    python -m api.benchmarks.kitchen --orders 1000 5000 20000 --lookups 2000
+
+For each size, times a full re-plan (priority queue, batching and station
+simulation) of that many open orders, then drives GET /kitchen/orders/{id}
+against a database holding them while a writer keeps changing order status,
+so lookups pay for re-plans the way they would during a lunch rush.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from ..controllers import kitchen
+from ..datagen.generator import Zipf
+from ..dependencies.config import conf
+from ..dependencies.database import Base, get_db
+from ..main import app
+from ..models import order_details as order_detail_model
+from ..models import orders as order_model
+from ..models import sandwiches as sandwich_model
+from ..models import user as user_model
+from .run import percentile
+
+SANDWICHES = 40
+
+
+def open_orders(count, seed_value=0, now=None):
+    """``(order, details)`` rows for ``count`` orders placed over the last 45 minutes."""
+    rng = random.Random(seed_value)
+    popular = Zipf(rng, SANDWICHES)
+    now = now or datetime.now()
+    orders, details = [], []
+    for order_id in range(1, count + 1):
+        orders.append({"id": order_id, "user_id": 1, "customer_name": f"Customer {order_id}",
+                       "order_date": now - timedelta(seconds=rng.uniform(0, 45 * 60)),
+                       "status": "Preparing" if rng.random() < 0.02 else "Placed"})
+        for sandwich_id in {popular() for _ in range(rng.choice([1, 1, 2, 2, 3, 4]))}:
+            details.append({"order_id": order_id, "sandwich_id": sandwich_id, "amount": rng.randint(1, 3)})
+    return orders, details
+
+
+def measure_plan(orders, details, repeats):
+    placed = {order["id"]: order for order in orders}
+    rows = [(line["order_id"], placed[line["order_id"]]["order_date"], placed[line["order_id"]]["status"],
+             line["sandwich_id"], line["amount"]) for line in details]
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        schedule = kitchen.plan(rows, datetime.now())
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    sandwiches = sum(line["amount"] for line in details)
+    waits = sorted(schedule.ready.values())
+    return {
+        "plan_p50_ms": round(percentile(timings, 50), 3),
+        "plan_p95_ms": round(percentile(timings, 95), 3),
+        "orders_planned_per_s": round(len(orders) / (percentile(timings, 50) / 1000)),
+        "batches": len(schedule.batches),
+        "sandwiches_per_batch": round(sandwiches / len(schedule.batches), 2),
+        "p50_wait_min": round(percentile(waits, 50) / 60, 1),
+        "p95_wait_min": round(percentile(waits, 95) / 60, 1),
+    }
+
+
+async def drive(order_count, lookups, concurrency, write_interval):
+    latencies, replans, failures = [], 0, 0
+    pending = iter(range(lookups))
+    done = asyncio.Event()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark") as client:
+        async def lookup_loop():
+            nonlocal failures
+            for i in pending:
+                started = time.perf_counter()
+                response = await client.get(f"/kitchen/orders/{i * 7919 % order_count + 1}")
+                latencies.append(time.perf_counter() - started)
+                # Orders the writer has marked Ready are no longer queued
+                failures += response.status_code not in (200, 404)
+
+        async def write_loop():
+            nonlocal replans
+            order_id = 1
+            while not done.is_set():
+                await client.put(f"/orders/{order_id}", json={"status": "Ready"})
+                replans += 1
+                order_id += 1
+                await asyncio.sleep(write_interval)
+
+        writer = asyncio.create_task(write_loop())
+        started = time.perf_counter()
+        await asyncio.gather(*(lookup_loop() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await writer
+
+    latencies = sorted(seconds * 1000 for seconds in latencies)
+    return {
+        "lookups_per_s": round(lookups / elapsed, 2),
+        "lookup_p50_ms": round(percentile(latencies, 50), 3),
+        "lookup_p95_ms": round(percentile(latencies, 95), 3),
+        "lookup_p99_ms": round(percentile(latencies, 99), 3),
+        "writes_during_run": replans,
+        "failures": failures,
+    }
+
+
+def run_size(order_count, lookups=2000, concurrency=16, repeats=5, write_interval=0.05, seed_value=0):
+    orders, details = open_orders(order_count, seed_value)
+    report = {"orders": order_count, **measure_plan(orders, details, repeats)}
+    if not lookups:
+        return report
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with SessionLocal() as db:
+        db.add(user_model.User(id=1, name="Kitchen", email="kitchen@example.com", password="x"))
+        db.execute(insert(sandwich_model.Sandwich), [
+            {"id": sandwich_id, "sandwich_name": f"Sandwich {sandwich_id}", "price": 5}
+            for sandwich_id in range(1, SANDWICHES + 1)
+        ])
+        db.execute(insert(order_model.Order), orders)
+        db.execute(insert(order_detail_model.OrderDetail), details)
+        db.commit()
+
+    def get_benchmark_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = get_benchmark_db
+    kitchen.kitchen.clear()
+    try:
+        report.update(asyncio.run(drive(order_count, lookups, concurrency, write_interval)))
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        kitchen.kitchen.clear()
+        engine.dispose()
+    return report
+
+
+def run(sizes=(1000, 5000, 20000), lookups=2000, concurrency=16, repeats=5, write_interval=0.05):
+    return {
+        "sizes": [run_size(size, lookups, concurrency, repeats, write_interval) for size in sizes],
+        "config": {"stations": conf.kitchen_stations, "batch_size": conf.kitchen_batch_size,
+                   "lookups": lookups, "concurrency": concurrency, "write_interval_s": write_interval},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--lookups", type=int, default=2000, help="0 to time planning only")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--write-interval", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run(args.orders, args.lookups, args.concurrency, args.repeats, args.write_interval), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
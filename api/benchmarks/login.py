@@ -0,0 +1,121 @@
+"""Measure login throughput and how responsive the app stays during a login burst.
+
+    python -m api.benchmarks.login --logins 400 --concurrency 32
+
+Logins run bcrypt at conf.auth_bcrypt_rounds on the dedicated hash pool. While
+they run, a probe keeps calling GET /users/me (token check only, no database);
+its latency shows whether hashing is stalling the event loop.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from ..dependencies import auth
+from ..dependencies.config import conf
+from ..dependencies.database import Base, get_db
+from ..main import app
+from ..models import user as user_model
+from .run import percentile
+
+PASSWORD = "benchmark-password"
+
+
+def _latency_summary(latencies):
+    latencies = sorted(seconds * 1000 for seconds in latencies)
+    return {
+        "count": len(latencies),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3),
+    }
+
+
+async def drive(users, logins, concurrency):
+    login_latencies, probe_latencies, failures = [], [], 0
+    pending = iter(range(logins))
+    done = asyncio.Event()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark") as client:
+        token = (await client.post("/users/login", json={"email": users[0], "password": PASSWORD})).json()["token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        async def login_loop():
+            nonlocal failures
+            for i in pending:
+                started = time.perf_counter()
+                response = await client.post("/users/login", json={"email": users[i % len(users)], "password": PASSWORD})
+                login_latencies.append(time.perf_counter() - started)
+                failures += response.status_code != 200
+
+        async def probe_loop():
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/users/me", headers=headers)
+                probe_latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(0.005)
+
+        probe = asyncio.create_task(probe_loop())
+        started = time.perf_counter()
+        await asyncio.gather(*(login_loop() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe
+
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "logins_per_s": round(logins / elapsed, 2),
+        "failures": failures,
+        "login": _latency_summary(login_latencies),
+        "probe_during_logins": _latency_summary(probe_latencies),
+    }
+
+
+def run(users=50, logins=400, concurrency=32):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    emails = [f"user{i}@example.com" for i in range(users)]
+    with SessionLocal() as db:
+        db.add_all([
+            user_model.User(name=f"User {i}", email=email, password=password_hash)
+            for i, (email, password_hash) in enumerate(zip(emails, auth.hash_passwords([PASSWORD] * users)))
+        ])
+        db.commit()
+
+    def get_benchmark_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = get_benchmark_db
+    try:
+        report = asyncio.run(drive(emails, logins, concurrency))
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        engine.dispose()
+    report["config"] = {"users": users, "logins": logins, "concurrency": concurrency,
+                        "bcrypt_rounds": conf.auth_bcrypt_rounds, "hash_workers": conf.auth_hash_workers}
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run(args.users, args.logins, args.concurrency), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
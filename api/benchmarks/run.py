@@ -0,0 +1,202 @@
+"""Seed a database and drive the FastAPI app with a mixed workload.
+
+    python -m api.benchmarks.run --requests 5000 --concurrency 16 --output before.json
+    python -m api.benchmarks.run --requests 5000 --concurrency 16 --baseline before.json
+
+Requests go through the ASGI app in-process (no network), so the numbers measure
+routing, validation, the controllers and the database, which is what changes
+between releases.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from collections import defaultdict
+from alembic import command
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from ..dependencies.cache import menu_cache
+from ..dependencies.database import get_db
+from ..main import app
+from ..models import model_loader
+from . import seed as seeder
+from . import workload
+
+DEFAULT_DB_URL = "sqlite:///./benchmark.db"
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(samples, elapsed):
+    """Per-route latency percentiles (milliseconds) and throughput from ``(route, status, seconds, bytes)``."""
+    by_route = defaultdict(list)
+    for sample in samples:
+        by_route[sample[0]].append(sample)
+
+    def stats(rows):
+        latencies = sorted(row[2] * 1000 for row in rows)
+        statuses = defaultdict(int)
+        for row in rows:
+            statuses[str(row[1])] += 1
+        return {
+            "count": len(rows),
+            "errors": sum(1 for row in rows if row[1] >= 500),
+            "statuses": dict(statuses),
+            "throughput_rps": round(len(rows) / elapsed, 2) if elapsed else None,
+            "mean_ms": round(sum(latencies) / len(latencies), 3),
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "max_ms": round(latencies[-1], 3),
+            "mean_bytes": round(sum(row[3] for row in rows) / len(rows)),
+        }
+
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "total": stats(samples) if samples else {"count": 0},
+        "routes": {route: stats(rows) for route, rows in sorted(by_route.items())},
+    }
+
+
+def compare(report, baseline, tolerance=0.2, metric="p95_ms"):
+    """Routes whose ``metric`` grew by more than ``tolerance`` (a fraction) against ``baseline``."""
+    regressions = []
+    for route, current in report["routes"].items():
+        previous = baseline.get("routes", {}).get(route)
+        if not previous or not previous.get(metric):
+            continue
+        change = current[metric] / previous[metric] - 1
+        if change > tolerance:
+            regressions.append({"route": route, "baseline": previous[metric], "current": current[metric],
+                                "change": round(change, 3)})
+    return regressions
+
+
+async def drive(requests, concurrency):
+    """Replay ``requests`` against the app with ``concurrency`` clients; returns samples and wall time."""
+    samples = []
+    pending = iter(requests)
+
+    async def client_loop(client):
+        for route, method, url, body in pending:
+            started = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            samples.append((route, response.status_code, time.perf_counter() - started, len(response.content)))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return samples, elapsed
+
+
+def prepare(db_url, volumes, seed_value=0):
+    """Migrate the database, seed it if empty and point the app's get_db at it."""
+    connect_args = {"check_same_thread": False, "timeout": 30} if db_url.startswith("sqlite") else {}
+    engine = create_engine(db_url, connect_args=connect_args)
+    with engine.begin() as connection:
+        command.upgrade(model_loader.alembic_config(connection), "head")
+
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with SessionLocal() as db:
+        counts = seeder.volumes(db)
+        if not counts["users"]:
+            counts = seeder.seed(db, seed_value=seed_value, **volumes)
+
+    def get_benchmark_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = get_benchmark_db
+    return engine, counts
+
+
+def run(db_url, requests=2000, concurrency=8, warmup=100, mix=None, seed_value=0, volumes=None):
+    engine, counts = prepare(db_url, volumes or {}, seed_value)
+    try:
+        menu_cache.clear()
+        requests_plan = workload.plan(counts, warmup + requests, mix, seed_value)
+        asyncio.run(drive(requests_plan[:warmup], concurrency))
+        samples, elapsed = asyncio.run(drive(requests_plan[warmup:], concurrency))
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        engine.dispose()
+
+    report = summarize(samples, elapsed)
+    report["config"] = {
+        "db": engine.dialect.name,
+        "volumes": counts,
+        "requests": requests,
+        "warmup": warmup,
+        "concurrency": concurrency,
+        "mix": mix or workload.DEFAULT_MIX,
+        "seed": seed_value,
+        "python": platform.python_version(),
+    }
+    return report
+
+
+def _mix(value):
+    # "menu=70,checkout=20,admin=10"
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in workload.SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario '{name}'")
+        mix[name] = int(weight)
+    return mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db-url", default=DEFAULT_DB_URL,
+                        help="database to seed and benchmark; an already seeded one is reused")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--mix", type=_mix, default=None, help="scenario weights, e.g. menu=70,checkout=20,admin=10")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--sandwiches", type=int, default=30)
+    parser.add_argument("--resources", type=int, default=20)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--details-per-order", type=int, default=3)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed p95 growth against the baseline before failing (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    volumes = {"users": args.users, "sandwiches": args.sandwiches, "resources": args.resources,
+               "orders": args.orders, "details_per_order": args.details_per_order}
+    report = run(args.db_url, args.requests, args.concurrency, args.warmup, args.mix, args.seed, volumes)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        report["regressions"] = regressions
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+from datetime import datetime
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from ..datagen import loader
+from ..datagen.generator import Generator
+from ..models import orders as order_model
+from ..models import resources as resource_model
+from ..models import sandwiches as sandwich_model
+from ..models import user as user_model
+
+# Large enough that a benchmark run never exhausts stock and turns checkouts into 409s
+RESOURCE_STOCK = 10_000_000
+
+
+def volumes(db: Session):
+    """Row counts of the seeded tables, used to pick valid ids for the workload."""
+    return {
+        "users": db.scalar(select(func.count()).select_from(user_model.User)),
+        "sandwiches": db.scalar(select(func.count()).select_from(sandwich_model.Sandwich)),
+        "resources": db.scalar(select(func.count()).select_from(resource_model.Resource)),
+        "orders": db.scalar(select(func.count()).select_from(order_model.Order)),
+    }
+
+
+def seed(db: Session, users=200, sandwiches=30, resources=20, orders=2000, details_per_order=3, days=90,
+         seed_value=0):
+    """Fill an empty database with a deterministic data set; ids start at 1 in every table."""
+    generator = Generator(
+        users=users, sandwiches=sandwiches, resources=resources, orders=orders,
+        details_per_order=details_per_order, days=days, stock=RESOURCE_STOCK,
+        end=datetime(2026, 1, 1), seed_value=seed_value,
+    )
+    loader.load(db.connection(), generator.batches())
+    db.commit()
+    return volumes(db)
@@ -0,0 +1,98 @@
+"""Measure the cost of serializing list responses, per 10k rows.
+
+    python -m api.benchmarks.serialization --orders 10000 --repeat 5
+
+Compares the ways a list of ORM rows can become a JSON body:
+
+* ``stdlib_json``: validate each row into the response model, dump to Python
+  and encode with the stdlib ``json`` (FastAPI's classic response_model path);
+* ``type_adapter``: a precompiled ``TypeAdapter(list[schema])`` validating and
+  dumping JSON in pydantic-core (``conf.fast_json`` off on current FastAPI);
+* ``direct_orjson``: ``serialization.dumps``, reading fields off the rows and
+  encoding with orjson, no validation (``conf.fast_json`` on).
+"""
+import argparse
+import json
+import sys
+import time
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import selectinload, sessionmaker
+from sqlalchemy.pool import StaticPool
+from ..datagen import loader
+from ..datagen.generator import Generator
+from ..dependencies import serialization
+from ..dependencies.database import Base
+from ..models import model_loader  # noqa: F401 - registers every model on Base.metadata
+from ..models import orders as order_model
+from ..models import order_details as order_detail_model
+from ..models import payment as payment_model
+from ..schemas import orders as order_schema
+from ..schemas import payment_schema
+
+
+def stdlib_json(schema, rows):
+    return json.dumps(
+        [schema.model_validate(row, from_attributes=True).model_dump(mode="json") for row in rows]
+    ).encode()
+
+
+def type_adapter(schema, rows):
+    adapter = serialization.adapter(schema)
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+def direct_orjson(schema, rows):
+    return serialization.dumps(schema, rows)
+
+
+STRATEGIES = {"stdlib_json": stdlib_json, "type_adapter": type_adapter, "direct_orjson": direct_orjson}
+
+
+def load_rows(orders, seed_value=0):
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    loader.load(db.connection(), Generator(users=max(1, orders // 10), orders=orders, seed_value=seed_value).batches())
+    db.commit()
+    order_rows = db.scalars(
+        select(order_model.Order).options(
+            selectinload(order_model.Order.order_details).joinedload(order_detail_model.OrderDetail.sandwich)
+        )
+    ).all()
+    payment_rows = db.scalars(select(payment_model.Payment)).all()
+    return {"orders": (order_schema.Order, order_rows), "payments": (payment_schema.Payment, payment_rows)}
+
+
+def measure(datasets, repeat=5):
+    """Best-of-``repeat`` milliseconds per 10k rows for each dataset and strategy."""
+    results = {}
+    for name, (schema, rows) in datasets.items():
+        timings = {}
+        for strategy, serialize in STRATEGIES.items():
+            serialize(schema, rows[:10])  # build validators and plans outside the timing
+            best = min(_time(serialize, schema, rows) for _ in range(repeat))
+            timings[strategy] = round(best * 1000 * 10000 / len(rows), 2)
+        timings["speedup_vs_stdlib_json"] = round(timings["stdlib_json"] / timings["direct_orjson"], 1)
+        results[name] = {"rows": len(rows), "ms_per_10k": timings}
+    return results
+
+
+def _time(serialize, schema, rows):
+    started = time.perf_counter()
+    serialize(schema, rows)
+    return time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(json.dumps(measure(load_rows(args.orders, args.seed), args.repeat), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
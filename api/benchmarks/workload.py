@@ -0,0 +1,54 @@
+import random
+
+# Relative weights of each scenario in the default mix
+DEFAULT_MIX = {"menu": 70, "checkout": 20, "admin": 10}
+
+
+def menu(rng, counts):
+    return rng.choice([
+        ("GET /sandwiches/", "GET", "/sandwiches/", None),
+        ("GET /sandwiches/{item_id}", "GET", f"/sandwiches/{rng.randint(1, counts['sandwiches'])}", None),
+        ("GET /recipes/", "GET", "/recipes/", None),
+        ("GET /promos/", "GET", "/promos/", None),
+        ("GET /reviews/", "GET", "/reviews/?limit=20", None),
+    ])
+
+
+def checkout(rng, counts):
+    user_id = rng.randint(1, counts["users"])
+    items = [
+        {"sandwich_id": rng.randint(1, counts["sandwiches"]), "amount": rng.randint(1, 3)}
+        for _ in range(rng.randint(1, 3))
+    ]
+    body = {
+        "customer_name": f"User {user_id}",
+        "user_id": user_id,
+        "items": items,
+        "payment": {"payment_method": rng.choice(["Credit Card", "Cash"])},
+    }
+    return "POST /orders/checkout", "POST", "/orders/checkout", body
+
+
+def admin(rng, counts):
+    return rng.choice([
+        ("GET /stats/", "GET", "/stats/?bucket=day", None),
+        ("GET /orders/", "GET", "/orders/?status=Placed&limit=50&sort=-order_date", None),
+        ("GET /orders/{item_id}", "GET", f"/orders/{rng.randint(1, counts['orders'])}", None),
+        ("GET /payment/", "GET", "/payment/?limit=50", None),
+    ])
+
+
+SCENARIOS = {"menu": menu, "checkout": checkout, "admin": admin}
+
+
+def plan(counts, requests, mix=None, seed_value=0):
+    """Build the full request list up front so every run replays the same workload.
+
+    Each entry is ``(route, method, url, json_body)``; ``route`` is the path
+    template used to group latencies in the report.
+    """
+    mix = mix or DEFAULT_MIX
+    rng = random.Random(seed_value)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    return [SCENARIOS[name](rng, counts) for name in rng.choices(names, weights, k=requests)]
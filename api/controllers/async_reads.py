@@ -0,0 +1,32 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+from ..dependencies.pagination import PageParams, keyset, next_page, filter_date_range
+from sqlalchemy.exc import SQLAlchemyError
+
+
+async def read_all(db: AsyncSession, model, params: PageParams, sort_keys=("id",), options=(),
+                   date_column=None, start_date=None, end_date=None, **filters):
+    try:
+        stmt = select(model).options(*options)
+        for name, value in filters.items():
+            if value is not None:
+                stmt = stmt.where(getattr(model, name) == value)
+        if date_column is not None:
+            stmt = filter_date_range(stmt, date_column, start_date, end_date)
+        rows = (await db.scalars(keyset(stmt, model, params, sort_keys))).all()
+    except SQLAlchemyError as e:
+        error = str(e.__dict__['orig'])
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+    return next_page(rows, params)
+
+
+async def read_one(db: AsyncSession, model, item_id, options=()):
+    try:
+        item = await db.scalar(select(model).options(*options).where(model.id == item_id))
+        if not item:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
+    except SQLAlchemyError as e:
+        error = str(e.__dict__['orig'])
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+    return item
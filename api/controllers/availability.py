@@ -0,0 +1,169 @@
+import math
+import threading
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from ..models import recipes as recipe_model
+from ..models import resources as resource_model
+from ..models import sandwiches as sandwich_model
+from ..dependencies.cache import VersionSnapshot, versions
+
+TABLES = ("sandwiches", "recipes", "resources")
+
+
+class AvailabilityEngine:
+    """How many of each sandwich the current stock can make.
+
+    Recipes are held as a dense sandwich x resource matrix of amounts needed
+    and stock as a vector, so the makeable quantity of every sandwich is one
+    vectorized ``min(stock / needed)`` over the resources it uses. Sandwiches
+    without a recipe are not limited by stock (``None``).
+
+    Writes made through the resource, recipe and checkout controllers update
+    the matrix in place and recompute only the affected sandwiches. Any other
+    write (bulk routes, another worker, a new sandwich or resource) shows up as
+    a table version this engine has not absorbed, and the next read reloads
+    everything in one query. With the per-process version store another
+    worker's writes move no version, so the matrix is also reloaded once it
+    is ``conf.cache_ttl`` seconds old.
+    """
+
+    def __init__(self, versions):
+        self.versions = versions
+        self._snapshot = VersionSnapshot(versions, TABLES)
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self._snapshot.clear()
+        self._sandwiches = {}
+        self._resources = {}
+        self._recipes = {}
+        self.matrix = np.zeros((0, 0))
+        self.stock = np.zeros(0)
+        self.makeable = np.zeros(0)
+        self._served = {}
+        self._listing = []
+
+    def _refresh(self, db: Session):
+        if not self._snapshot.stale():
+            return
+        with self._lock:
+            seen = self._snapshot.current()
+            if not self._snapshot.stale(seen):
+                return
+            stmt = (
+                select(sandwich_model.Sandwich.id, recipe_model.Recipe.id, recipe_model.Recipe.resource_id,
+                       recipe_model.Recipe.amount, resource_model.Resource.amount)
+                .outerjoin(recipe_model.Recipe, recipe_model.Recipe.sandwich_id == sandwich_model.Sandwich.id)
+                .outerjoin(resource_model.Resource, resource_model.Resource.id == recipe_model.Recipe.resource_id)
+                .order_by(sandwich_model.Sandwich.id)
+            )
+            try:
+                rows = db.execute(stmt).all()
+            except SQLAlchemyError as e:
+                error = str(e.__dict__['orig'])
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+            self._load(rows)
+            self._snapshot.mark(seen)
+
+    def _load(self, rows):
+        sandwiches, resources, recipes, stock = {}, {}, {}, []
+        for sandwich_id, recipe_id, resource_id, needed, amount in rows:
+            sandwiches.setdefault(sandwich_id, len(sandwiches))
+            if recipe_id is None or resource_id is None:
+                continue
+            if resource_id not in resources:
+                resources[resource_id] = len(resources)
+                stock.append(amount or 0)
+            recipes[recipe_id] = (sandwich_id, resource_id, needed or 0)
+
+        self._sandwiches, self._resources, self._recipes = sandwiches, resources, recipes
+        self.matrix = np.zeros((len(sandwiches), len(resources)))
+        for sandwich_id, resource_id, needed in recipes.values():
+            self.matrix[sandwiches[sandwich_id], resources[resource_id]] += needed
+        self.stock = np.array(stock, dtype=float)
+        self.makeable = np.full(len(sandwiches), np.inf)
+        self._compute(slice(None))
+
+    def _compute(self, rows):
+        if len(self._resources):
+            needed = self.matrix[rows]
+            with np.errstate(divide="ignore"):
+                ratio = np.where(needed > 0, np.maximum(self.stock, 0) / needed, np.inf)
+            self.makeable[rows] = np.floor(ratio.min(axis=1))
+        # Reads are plain dict lookups and a prebuilt list
+        # (rows are numbered in the order sandwiches were added)
+        self._served = {
+            sandwich_id: None if quantity == math.inf else int(quantity)
+            for sandwich_id, quantity in zip(self._sandwiches, self.makeable.tolist())
+        }
+        self._listing = [
+            {"sandwich_id": sandwich_id, "available": quantity is None or quantity > 0, "max_quantity": quantity}
+            for sandwich_id, quantity in self._served.items()
+        ]
+
+    def _affected(self, columns):
+        return np.flatnonzero((self.matrix[:, columns] > 0).any(axis=1))
+
+    def resource_changed(self, resource_id, amount):
+        self.resources_changed({resource_id: amount})
+
+    def resources_changed(self, amounts):
+        """Apply one write's new ``{resource_id: amount}`` stock levels.
+
+        Absolute amounts rather than deltas: a reload that ran while the write
+        was committing may already hold them, and setting them again is harmless.
+        """
+        with self._lock:
+            if not self._snapshot.absorb("resources"):
+                return
+            # Resources no recipe uses are not in the matrix
+            columns = {self._resources[resource_id]: amount for resource_id, amount in amounts.items()
+                       if resource_id in self._resources}
+            if not columns:
+                return
+            self.stock[list(columns)] = list(columns.values())
+            self._compute(self._affected(list(columns)))
+
+    def recipe_changed(self, recipe_id, sandwich_id=None, resource_id=None, amount=None):
+        """Apply a created or updated recipe, or a deleted one when only ``recipe_id`` is given."""
+        with self._lock:
+            if sandwich_id is not None and (sandwich_id not in self._sandwiches
+                                            or resource_id not in self._resources):
+                # A resource new to the matrix needs its stock loaded: leave the
+                # write unabsorbed so the next read reloads
+                return
+            if not self._snapshot.absorb("recipes"):
+                return
+            rows = []
+            old = self._recipes.pop(recipe_id, None)
+            if old is not None:
+                row = self._sandwiches[old[0]]
+                self.matrix[row, self._resources[old[1]]] -= old[2]
+                rows.append(row)
+            if sandwich_id is not None:
+                self._recipes[recipe_id] = (sandwich_id, resource_id, amount)
+                row = self._sandwiches[sandwich_id]
+                self.matrix[row, self._resources[resource_id]] += amount
+                rows.append(row)
+            self._compute(rows)
+
+    def max_quantity(self, db: Session, sandwich_id):
+        self._refresh(db)
+        return self._served.get(sandwich_id)
+
+    def listing(self, db: Session):
+        self._refresh(db)
+        return self._listing
+
+    def annotate(self, db: Session, items):
+        """Copies of serialized sandwiches with their ``available`` flag."""
+        self._refresh(db)
+        served = self._served
+        return [{**item, "available": served.get(item["id"]) != 0} for item in items]
+
+
+engine = AvailabilityEngine(versions)
@@ -0,0 +1,82 @@
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from sqlalchemy.exc import SQLAlchemyError
+from ..dependencies.cache import versions
+from ..dependencies.config import conf
+
+
+def _check_size(items):
+    if len(items) > conf.bulk_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {conf.bulk_max_items} items per bulk request"
+        )
+
+
+def _existing_ids(db: Session, model, ids):
+    return set(db.scalars(select(model.id).where(model.id.in_(ids))))
+
+
+def create_many(db: Session, model, requests):
+    """Insert every row in one transaction and report the new id of each."""
+    _check_size(requests)
+    rows = [request.model_dump() for request in requests]
+    try:
+        if db.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+            ids = list(db.scalars(insert(model).returning(model.id, sort_by_parameter_order=True), rows))
+        else:
+            # MySQL has no RETURNING; let the ORM batch the inserts and read back lastrowid
+            new_items = [model(**row) for row in rows]
+            db.add_all(new_items)
+            db.flush()
+            ids = [item.id for item in new_items]
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        error = str(e.__dict__['orig'])
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+
+    versions.bump(model.__tablename__)
+    return [{"index": index, "id": item_id, "status": "created"} for index, item_id in enumerate(ids)]
+
+
+def update_many(db: Session, model, requests):
+    """Apply partial updates keyed by id as one executemany; missing ids are reported, not fatal."""
+    _check_size(requests)
+    rows = [request.model_dump(exclude_unset=True) for request in requests]
+    try:
+        existing = _existing_ids(db, model, [row["id"] for row in rows])
+        found = [row for row in rows if row["id"] in existing and len(row) > 1]
+        if found:
+            db.execute(update(model), found)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        error = str(e.__dict__['orig'])
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+
+    versions.bump(model.__tablename__)
+    return [
+        {"index": index, "id": row["id"], "status": "updated" if row["id"] in existing else "not_found"}
+        for index, row in enumerate(rows)
+    ]
+
+
+def delete_many(db: Session, model, ids):
+    _check_size(ids)
+    try:
+        existing = _existing_ids(db, model, ids)
+        if existing:
+            db.execute(delete(model).where(model.id.in_(existing)))
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        error = str(e.__dict__['orig'])
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+
+    versions.bump(model.__tablename__)
+    return [
+        {"index": index, "id": item_id, "status": "deleted" if item_id in existing else "not_found"}
+        for index, item_id in enumerate(ids)
+    ]
@@ -0,0 +1,91 @@
+from sqlalchemy import delete as sql_delete, select, update as sql_update
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status, Response
+from sqlalchemy.exc import SQLAlchemyError
+from ..dependencies.cache import versions
+
+# Shared single-row CRUD used by every resource controller. ``options`` are
+# loader options for the relationships the response schema serializes, so a
+# row is always loaded together with them in the same statement.
+
+
+def _database_error(db: Session, e: SQLAlchemyError):
+    db.rollback()
+    error = str(e.__dict__['orig'])
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+
+
+def _not_found():
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
+
+
+def create(db: Session, model, request):
+    new_item = model(**request.model_dump())
+
+    try:
+        db.add(new_item)
+        db.commit()
+        db.refresh(new_item)
+    except SQLAlchemyError as e:
+        _database_error(db, e)
+
+    versions.bump(model.__tablename__)
+    return new_item
+
+
+def read_one(db: Session, model, item_id, options=()):
+    try:
+        item = db.scalars(select(model).options(*options).where(model.id == item_id)).unique().first()
+    except SQLAlchemyError as e:
+        _database_error(db, e)
+    if not item:
+        _not_found()
+    return item
+
+
+def update(db: Session, model, item_id, request, options=()):
+    """Update one row in a single statement and hand back the new state.
+
+    Existence is checked through the statement's rowcount rather than a
+    SELECT beforehand. Where the dialect supports ``UPDATE ... RETURNING``
+    and the response needs no relationships, the updated row comes back with
+    the UPDATE itself; otherwise (MySQL) it is re-selected once after commit.
+    """
+    update_data = request.model_dump(exclude_unset=True)
+    if not update_data:
+        return read_one(db, model, item_id, options)
+
+    stmt = sql_update(model).where(model.id == item_id).values(**update_data)
+    use_returning = not options and db.get_bind().dialect.update_returning
+    try:
+        if use_returning:
+            item = db.scalars(stmt.returning(model), execution_options={"synchronize_session": False}).first()
+            if item is None:
+                _not_found()
+            # Detach before committing so the commit does not expire the
+            # values RETURNING just loaded
+            db.expunge(item)
+        elif db.execute(stmt, execution_options={"synchronize_session": False}).rowcount == 0:
+            _not_found()
+        db.commit()
+    except SQLAlchemyError as e:
+        _database_error(db, e)
+
+    versions.bump(model.__tablename__)
+    if use_returning:
+        return item
+    return read_one(db, model, item_id, options)
+
+
+def delete(db: Session, model, item_id):
+    try:
+        result = db.execute(sql_delete(model).where(model.id == item_id),
+                            execution_options={"synchronize_session": False})
+        if result.rowcount == 0:
+            _not_found()
+        db.commit()
+    except SQLAlchemyError as e:
+        _database_error(db, e)
+
+    versions.bump(model.__tablename__)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,123 @@
+import threading
+from collections import namedtuple
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+from fastapi import HTTPException, status
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from ..models import promo as promo_model
+from ..dependencies.cache import VersionSnapshot, versions
+
+CENT = Decimal("0.01")
+PERCENTAGE = "Percentage"
+FIXED_AMOUNT = "Fixed Amount"
+
+PromoRule = namedtuple("PromoRule", "id code discount_type value start_date end_date")
+
+
+def normalize(code: str) -> str:
+    return code.strip().upper()
+
+
+class PromoIndex:
+    """Active promos keyed by normalized code.
+
+    The snapshot is rebuilt only when the "promos" table version moves (every
+    promo write bumps it, in any worker when the file version store is used)
+    or, with the per-process store, once it is ``conf.cache_ttl`` seconds old,
+    so a lookup is a dict access with no query. Date windows are checked at
+    lookup time because a promo starts and expires without a write.
+    """
+
+    def __init__(self, versions):
+        self.versions = versions
+        self._snapshot = VersionSnapshot(versions, ("promos",))
+        self._rules = {}
+        self._lock = threading.Lock()
+
+    def _refresh(self, db: Session):
+        seen = self._snapshot.current()
+        if not self._snapshot.stale(seen):
+            return
+        with self._lock:
+            if not self._snapshot.stale(seen):
+                return
+            try:
+                rows = db.query(promo_model.Promo).filter(promo_model.Promo.is_active == 1).all()
+            except SQLAlchemyError as e:
+                error = str(e.__dict__['orig'])
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+            self._rules = {
+                normalize(row.code): PromoRule(row.id, row.code, row.discount_type, Decimal(str(row.value)),
+                                               row.start_date, row.end_date)
+                for row in rows
+            }
+            self._snapshot.mark(seen)
+
+    def lookup(self, db: Session, code: str, now=None):
+        """``(rule, None)`` for a usable code, ``(rule or None, reason)`` otherwise."""
+        self._refresh(db)
+        rule = self._rules.get(normalize(code))
+        if rule is None:
+            return None, "Unknown or inactive promo code"
+        now = now or datetime.now()
+        if rule.start_date and now < rule.start_date:
+            return rule, "Promo has not started yet"
+        if rule.end_date and now > rule.end_date:
+            return rule, "Promo has expired"
+        if rule.discount_type not in (PERCENTAGE, FIXED_AMOUNT):
+            return rule, f"Unsupported discount type '{rule.discount_type}'"
+        return rule, None
+
+    def clear(self):
+        with self._lock:
+            self._rules = {}
+            self._snapshot.clear()
+
+
+def discount(rule: PromoRule, amount: Decimal) -> Decimal:
+    """What ``rule`` takes off ``amount``; never more than the amount itself."""
+    if rule.discount_type == PERCENTAGE:
+        off = amount * rule.value / 100
+    else:
+        off = rule.value
+    return min(off, amount).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def evaluate(db: Session, codes, subtotal: Decimal, now=None):
+    """Apply stacked promo codes to a cart subtotal.
+
+    Percentage promos are applied first, each to the running total, then fixed
+    amounts; a code listed twice counts once and the total never drops below 0.
+    Returns a dict with the applied breakdown and the rejected codes with reasons.
+    """
+    subtotal = Decimal(subtotal).quantize(CENT, rounding=ROUND_HALF_UP)
+    accepted, rejected, seen = [], [], set()
+    for code in codes:
+        key = normalize(code)
+        if key in seen:
+            continue
+        seen.add(key)
+        rule, reason = promo_index.lookup(db, code, now)
+        if reason:
+            rejected.append({"code": code, "reason": reason})
+        else:
+            accepted.append(rule)
+
+    applied = []
+    total = subtotal
+    for rule in sorted(accepted, key=lambda rule: rule.discount_type != PERCENTAGE):
+        off = discount(rule, total)
+        total -= off
+        applied.append({"promo_id": rule.id, "code": rule.code, "discount_type": rule.discount_type,
+                        "value": rule.value, "discount": off})
+    return {
+        "subtotal": subtotal,
+        "discount": subtotal - total,
+        "total": total,
+        "applied": applied,
+        "rejected": rejected,
+    }
+
+
+promo_index = PromoIndex(versions)
@@ -0,0 +1,70 @@
+import csv
+import io
+import json
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+CHUNK_ROWS = 1000
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _ndjson(columns, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), default=str) + "\n"
+
+
+def _csv(columns, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def _chunked(lines):
+    # Group lines so each write to the socket carries a batch of rows
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= CHUNK_ROWS:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+def stream(db: Session, stmt, filename: str, export_format: str = "ndjson"):
+    """Stream the rows of a Core select as NDJSON or CSV.
+
+    The statement runs on a server-side cursor (``yield_per``), so only one
+    batch of rows is held in memory however large the result is.
+    """
+    if export_format not in MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported format '{export_format}', expected one of: {', '.join(MEDIA_TYPES)}"
+        )
+
+    result = db.execute(stmt.execution_options(yield_per=CHUNK_ROWS))
+    columns = list(result.keys())
+    encode = _csv if export_format == "csv" else _ndjson
+
+    def body():
+        try:
+            yield from _chunked(encode(columns, result))
+        finally:
+            result.close()
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
@@ -0,0 +1,60 @@
+from fastapi import HTTPException, status
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, configure_mappers
+from . import order_details, orders, payment, promo, ratings, recipes, resources, reviews, sandwiches, search, user
+from ..models import model_loader
+from ..dependencies import auth
+from ..dependencies.config import conf
+from ..dependencies.database import SessionLocal, engine
+from ..dependencies.pagination import DEFAULT_LIMIT, PageParams
+from ..dependencies.startup import Startup, warm_pool
+
+LIST_CONTROLLERS = (orders, order_details, payment, promo, recipes, resources, sandwiches, user, reviews)
+
+
+def warm_reads(db: Session):
+    """Run the hot read paths once, so their SQL is compiled and cached and the
+    menu caches, availability matrix and search index are loaded."""
+    params = PageParams(limit=DEFAULT_LIMIT, cursor=None, sort="id")
+    for controller in LIST_CONTROLLERS:
+        controller.read_all(db, params)
+        try:
+            controller.read_one(db, 0)
+        except HTTPException:
+            pass  # not found, but the statement is compiled
+    sandwiches.read_availability(db)
+    ratings.read_all(db, "sandwich")
+    # Any query loads the index
+    search.index.search(db, "warm")
+
+
+def _warm_reads():
+    if not conf.startup_warm_reads:
+        return
+    with SessionLocal() as db:
+        warm_reads(db)
+
+
+startup = Startup([
+    ("mappers", configure_mappers),
+    ("schema", model_loader.index),
+    ("pool", lambda: warm_pool(engine, min(conf.startup_warm_connections, conf.db_pool_size))),
+    ("reads", _warm_reads),
+    ("auth", auth.warm),
+])
+
+
+def live():
+    return {"status": "live"}
+
+
+def ready(db: Session):
+    if not startup.ready:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=startup.report())
+    try:
+        db.execute(text("SELECT 1"))
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail={**startup.report(), "ready": False, "error": str(e.__dict__['orig'])})
+    return {"status": "ready", **startup.report()}
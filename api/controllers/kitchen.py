@@ -0,0 +1,210 @@
+import heapq
+import threading
+from collections import defaultdict, namedtuple
+from datetime import datetime, timedelta
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from ..models import orders as order_model
+from ..models import order_details as order_detail_model
+from ..dependencies.cache import VersionSnapshot, versions
+from ..dependencies.config import conf
+
+OPEN_STATUSES = ("Placed", "Preparing")
+
+PREPARING_HEAD_START = 365 * 24 * 3600
+
+Batch = namedtuple("Batch", "station sandwich_id amount order_ids start finish")
+
+
+class OpenOrder:
+    """An order still waiting on the kitchen, with the sandwiches left to make."""
+
+    __slots__ = ("id", "rank", "lines", "remaining")
+
+    def __init__(self, order_id, placed_at: datetime, order_status, lines):
+        self.id = order_id
+        self.lines = dict(lines)
+        self.remaining = sum(self.lines.values())
+        # Oldest first, each sandwich counting as kitchen_item_weight seconds
+        # of extra age against the order; orders already being prepared are
+        # moved a year earlier so they finish first. Every order ages at the
+        # same rate, so this rank never has to be recomputed as time passes.
+        self.rank = placed_at.timestamp() + self.remaining * conf.kitchen_item_weight
+        if order_status == "Preparing":
+            self.rank -= PREPARING_HEAD_START
+
+
+def simulate(orders, stations, batch_size, batch_seconds, item_seconds):
+    """Run the open orders through ``stations`` and return ``(batches, ready)``.
+
+    A free station takes the sandwich the highest ranked order still needs and
+    fills the batch with the same sandwich from the next orders in rank order.
+    Times are seconds from the start of the plan; ``ready`` maps each order id
+    to when its last sandwich is done. ``orders`` (id -> OpenOrder) is used up.
+    """
+    queue = [(order.rank, order.id) for order in orders.values() if order.remaining]
+    heapq.heapify(queue)
+    by_sandwich = defaultdict(list)
+    for rank, order_id in queue:
+        for sandwich_id in orders[order_id].lines:
+            by_sandwich[sandwich_id].append((rank, order_id))
+    for waiting in by_sandwich.values():
+        heapq.heapify(waiting)
+    free = [(0.0, station) for station in range(stations)]
+
+    batches, ready = [], {}
+    while queue:
+        order = orders[queue[0][1]]
+        if not order.remaining:
+            heapq.heappop(queue)
+            continue
+        sandwich_id = next(sandwich_id for sandwich_id, amount in order.lines.items() if amount)
+
+        # The top order is also first in its sandwich's heap, so it always makes the batch
+        waiting = by_sandwich[sandwich_id]
+        taken, order_ids = 0, []
+        while waiting and taken < batch_size:
+            candidate = orders[waiting[0][1]]
+            amount = min(candidate.lines[sandwich_id], batch_size - taken)
+            if amount:
+                candidate.lines[sandwich_id] -= amount
+                candidate.remaining -= amount
+                taken += amount
+                order_ids.append(candidate.id)
+            if not candidate.lines[sandwich_id]:
+                heapq.heappop(waiting)
+
+        start, station = heapq.heappop(free)
+        finish = start + batch_seconds + item_seconds * taken
+        heapq.heappush(free, (finish, station))
+        batches.append(Batch(station, sandwich_id, taken, order_ids, start, finish))
+        for order_id in order_ids:
+            # Batches of one order can run side by side on different stations
+            ready[order_id] = max(ready.get(order_id, 0.0), finish)
+    return batches, ready
+
+
+class Schedule:
+    def __init__(self, planned_at: datetime, batches, ready, empty_orders=()):
+        self.planned_at = planned_at
+        self.batches = batches
+        self.ready = ready
+        for order_id in empty_orders:
+            ready.setdefault(order_id, 0.0)
+        self.positions = {}
+        for batch in batches:
+            for order_id in batch.order_ids:
+                self.positions.setdefault(order_id, len(self.positions) + 1)
+
+    def at(self, seconds: float) -> datetime:
+        return self.planned_at + timedelta(seconds=seconds)
+
+
+def plan(rows, now: datetime) -> Schedule:
+    """Schedule ``(order_id, order_date, status, sandwich_id, amount)`` rows from ``now``."""
+    lines, placed = defaultdict(lambda: defaultdict(int)), {}
+    for order_id, order_date, order_status, sandwich_id, amount in rows:
+        placed[order_id] = (order_date or now, order_status)
+        if sandwich_id is not None and amount:
+            lines[order_id][sandwich_id] += amount
+    orders = {
+        order_id: OpenOrder(order_id, order_date, order_status, lines[order_id])
+        for order_id, (order_date, order_status) in placed.items()
+    }
+    batches, ready = simulate(orders, conf.kitchen_stations, conf.kitchen_batch_size,
+                              conf.kitchen_batch_seconds, conf.kitchen_item_seconds)
+    # Open orders without any sandwich have nothing to wait for
+    return Schedule(now, batches, ready, empty_orders=[order_id for order_id in placed if not lines[order_id]])
+
+
+class Kitchen:
+    """The current schedule of open orders.
+
+    It is re-planned when the orders or order_details version moves, or once
+    it is ``conf.kitchen_replan_interval`` seconds old, so a burst of ETA
+    lookups costs one query and one simulation. During a rush, writes would
+    otherwise force a re-plan per lookup: re-plans are at least
+    ``conf.kitchen_replan_min_interval`` apart, and while one runs the other
+    requests are answered from the schedule it replaces.
+    """
+
+    def __init__(self, versions):
+        self.versions = versions
+        self._snapshot = VersionSnapshot(versions, ("orders", "order_details"))
+        self._schedule = None
+        self._lock = threading.Lock()
+
+    def _fresh(self, seen, now):
+        if self._schedule is None:
+            return False
+        age = (now - self._schedule.planned_at).total_seconds()
+        if age < conf.kitchen_replan_min_interval:
+            return True
+        return not self._snapshot.stale(seen) and age < conf.kitchen_replan_interval
+
+    def schedule(self, db: Session, now=None) -> Schedule:
+        now = now or datetime.now()
+        seen = self._snapshot.current()
+        if self._fresh(seen, now):
+            return self._schedule
+        if not self._lock.acquire(blocking=self._schedule is None):
+            return self._schedule
+        try:
+            if self._fresh(seen, now):
+                return self._schedule
+            stmt = (
+                select(order_model.Order.id, order_model.Order.order_date, order_model.Order.status,
+                       order_detail_model.OrderDetail.sandwich_id, order_detail_model.OrderDetail.amount)
+                .outerjoin(order_detail_model.OrderDetail,
+                           order_detail_model.OrderDetail.order_id == order_model.Order.id)
+                .where(order_model.Order.status.in_(OPEN_STATUSES))
+            )
+            try:
+                rows = db.execute(stmt).all()
+            except SQLAlchemyError as e:
+                error = str(e.__dict__['orig'])
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+            self._schedule = plan(rows, now)
+            self._snapshot.mark(seen)
+            return self._schedule
+        finally:
+            self._lock.release()
+
+    def clear(self):
+        with self._lock:
+            self._schedule = None
+            self._snapshot.clear()
+
+
+kitchen = Kitchen(versions)
+
+
+def read_queue(db: Session, limit: int):
+    schedule = kitchen.schedule(db)
+    batches = [
+        {"station": batch.station + 1, "sandwich_id": batch.sandwich_id, "amount": batch.amount,
+         "order_ids": batch.order_ids, "start": schedule.at(batch.start), "finish": schedule.at(batch.finish)}
+        for batch in schedule.batches[:limit]
+    ]
+    return {
+        "planned_at": schedule.planned_at,
+        "stations": conf.kitchen_stations,
+        "open_orders": len(schedule.ready),
+        "pending_batches": len(schedule.batches),
+        "batches": batches,
+    }
+
+
+def read_eta(db: Session, order_id):
+    schedule = kitchen.schedule(db)
+    if order_id not in schedule.ready:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order is not waiting in the kitchen")
+    seconds = schedule.ready[order_id]
+    return {
+        "order_id": order_id,
+        "position": schedule.positions.get(order_id, 0),
+        "ready_at": schedule.at(seconds),
+        "wait_seconds": round(seconds),
+    }
@@ -0,0 +1,5 @@
+from ..dependencies import metrics
+
+
+def read():
+    return metrics.render()
@@ -1,26 +1,26 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException, status, Response, Depends
 from ..models import order_details as model
 from sqlalchemy.exc import SQLAlchemyError
+from . import bulk, crud
+from ..dependencies.pagination import PageParams, paginate
 
 
-def create(db: Session, request):
-    new_item = model.OrderDetail(**request.model_dump())
+LOAD_OPTIONS = (joinedload(model.OrderDetail.sandwich),)
 
-    try:
-        db.add(new_item)
-        db.commit()
-        db.refresh(new_item)
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
 
-    return new_item
+def create(db: Session, request):
+    return crud.create(db, model.OrderDetail, request)
 
 
-def read_all(db: Session):
+def read_all(db: Session, params: PageParams, order_id=None, sandwich_id=None):
     try:
-        result = db.query(model.OrderDetail).all()
+        query = db.query(model.OrderDetail).options(*LOAD_OPTIONS)
+        if order_id is not None:
+            query = query.filter(model.OrderDetail.order_id == order_id)
+        if sandwich_id is not None:
+            query = query.filter(model.OrderDetail.sandwich_id == sandwich_id)
+        result = paginate(query, model.OrderDetail, params, sort_keys=("id", "amount"))
     except SQLAlchemyError as e:
         error = str(e.__dict__['orig'])
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
@@ -28,38 +28,24 @@ def read_all(db: Session):
 
 
 def read_one(db: Session, item_id):
-    try:
-        item = db.query(model.OrderDetail).filter(model.OrderDetail.id == item_id).first()
-        if not item:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return item
+    return crud.read_one(db, model.OrderDetail, item_id, LOAD_OPTIONS)
 
 
 def update(db: Session, item_id, request):
-    try:
-        item = db.query(model.OrderDetail).filter(model.OrderDetail.id == item_id)
-        if not item.first():
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-        update_data = request.dict(exclude_unset=True)
-        item.update(update_data, synchronize_session=False)
-        db.commit()
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return item.first()
+    return crud.update(db, model.OrderDetail, item_id, request, LOAD_OPTIONS)
 
 
 def delete(db: Session, item_id):
-    try:
-        item = db.query(model.OrderDetail).filter(model.OrderDetail.id == item_id)
-        if not item.first():
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-        item.delete(synchronize_session=False)
-        db.commit()
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return crud.delete(db, model.OrderDetail, item_id)
+
+
+def bulk_create(db: Session, requests):
+    return bulk.create_many(db, model.OrderDetail, requests)
+
+
+def bulk_update(db: Session, requests):
+    return bulk.update_many(db, model.OrderDetail, requests)
+
+
+def bulk_delete(db: Session, ids):
+    return bulk.delete_many(db, model.OrderDetail, ids)
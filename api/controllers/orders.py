@@ -1,70 +1,240 @@
-from sqlalchemy.orm import Session, joinedload
+from collections import defaultdict
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session, joinedload, selectinload
 from fastapi import HTTPException, status, Response, Depends
+from fastapi.responses import StreamingResponse
 from ..models import orders as model
 from ..models import order_details as order_detail_model
+from ..models import payment as payment_model
+from ..models import recipes as recipe_model
+from ..models import resources as resource_model
+from ..models import sandwiches as sandwich_model
 from sqlalchemy.exc import SQLAlchemyError
+from . import bulk, crud, discounts, export as exporter
+from .availability import engine as availability
+from .search import index as search_index
+from ..dependencies import events
+from ..dependencies.cache import menu_cache, versions
+from ..dependencies.config import conf
+from ..dependencies.pagination import PageParams, paginate, filter_date_range
 
 
-def create(db: Session, request):
-    new_item = model.Order(**request.model_dump())
+LOAD_OPTIONS = (joinedload(model.Order.order_details).joinedload(order_detail_model.OrderDetail.sandwich),)
+
+# Columns an order's "created" event carries; "updated" events carry only what changed
+EVENT_FIELDS = ("id", "user_id", "customer_name", "description", "order_date", "status", "tracking_number")
+
+
+def _publish(event_type, order_id, user_id, data=None):
+    events.broker.publish({"type": event_type, "order_id": order_id, "user_id": user_id, "data": data or {}})
+
+
+def _created(order):
+    _publish("created", order.id, order.user_id, {field: getattr(order, field) for field in EVENT_FIELDS})
 
+
+def _owners(db: Session, ids):
+    """Map each existing order id to its user_id, so events can be filtered by user."""
     try:
-        db.add(new_item)
-        db.commit()
-        db.refresh(new_item)
+        return dict(db.execute(select(model.Order.id, model.Order.user_id).where(model.Order.id.in_(ids))).all())
     except SQLAlchemyError as e:
+        db.rollback()
         error = str(e.__dict__['orig'])
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
 
-    return new_item
 
+def stream(user_id=None, order_id=None):
+    """Server-Sent Events of order changes, optionally for one user or one order."""
+    def matches(event):
+        return ((user_id is None or event["user_id"] == user_id)
+                and (order_id is None or event["order_id"] == order_id))
+
+    return StreamingResponse(
+        events.sse(events.broker, matches, conf.events_heartbeat),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def create(db: Session, request):
+    order = crud.create(db, model.Order, request)
+    search_index.changed("order", order.id, order.description)
+    _created(order)
+    return order
+
+
+def checkout(db: Session, request):
+    """Place an order with all of its lines in one transaction.
+
+    Inventory rows needed by the cart are locked (SELECT ... FOR UPDATE, in id
+    order so concurrent checkouts cannot deadlock), checked and decremented
+    before the order, its details and the optional payment are inserted.
+    Nothing is written if any resource is short or any promo code is invalid;
+    valid codes are stacked and the payment is taken for the discounted total.
+    """
+    quantities = defaultdict(int)
+    for line in request.items:
+        quantities[line.sandwich_id] += line.amount
 
-def read_all(db: Session):
     try:
-        result = db.query(model.Order).options(
-            joinedload(model.Order.order_details).joinedload(order_detail_model.OrderDetail.sandwich)
-        ).all()
+        sandwiches = {
+            sandwich.id: sandwich
+            for sandwich in db.query(sandwich_model.Sandwich).filter(sandwich_model.Sandwich.id.in_(quantities))
+        }
+        missing = sorted(set(quantities) - set(sandwiches))
+        if missing:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Sandwich not found: {missing}")
+
+        total = sum(sandwiches[sandwich_id].price * amount for sandwich_id, amount in quantities.items())
+        if request.promo_codes:
+            pricing = discounts.evaluate(db, request.promo_codes, total)
+            if pricing["rejected"]:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                    detail={"invalid_promo_codes": pricing["rejected"]})
+            total = pricing["total"]
+
+        needed = defaultdict(int)
+        recipes = db.query(recipe_model.Recipe).filter(recipe_model.Recipe.sandwich_id.in_(quantities))
+        for recipe in recipes:
+            needed[recipe.resource_id] += recipe.amount * quantities[recipe.sandwich_id]
+
+        stock = (
+            db.query(resource_model.Resource)
+            .filter(resource_model.Resource.id.in_(needed))
+            .order_by(resource_model.Resource.id)
+            .with_for_update()
+            .all()
+        )
+        short = [
+            {"resource_id": resource.id, "item": resource.item, "needed": needed[resource.id],
+             "available": resource.amount}
+            for resource in stock if resource.amount < needed[resource.id]
+        ]
+        if short:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail={"insufficient_stock": short})
+        for resource in stock:
+            resource.amount -= needed[resource.id]
+        # Read before the commit expires the rows
+        remaining = {resource.id: resource.amount for resource in stock}
+
+        order_data = request.model_dump(exclude={"items", "payment", "promo_codes"})
+        new_order = model.Order(**order_data)
+        db.add(new_order)
+        db.flush()
+
+        db.execute(insert(order_detail_model.OrderDetail), [
+            {"order_id": new_order.id, "sandwich_id": sandwich_id, "amount": amount}
+            for sandwich_id, amount in quantities.items()
+        ])
+        if request.payment:
+            db.add(payment_model.Payment(
+                order_id=new_order.id, amount=total, payment_method=request.payment.payment_method
+            ))
+
+        db.commit()
+    except HTTPException:
+        db.rollback()
+        raise
     except SQLAlchemyError as e:
+        db.rollback()
         error = str(e.__dict__['orig'])
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return result
 
+    versions.bump("orders")
+    versions.bump("order_details")
+    if request.payment:
+        versions.bump("payments")
+    if needed:
+        menu_cache.invalidate("resources")
+        availability.resources_changed(remaining)
+    order = read_one(db, new_order.id)
+    search_index.changed("order", order.id, order.description)
+    _created(order)
+    return order
 
-def read_one(db: Session, item_id):
+
+def read_all(db: Session, params: PageParams, order_status=None, user_id=None, start_date=None, end_date=None):
     try:
-        item = db.query(model.Order).options(
-            joinedload(model.Order.order_details).joinedload(order_detail_model.OrderDetail.sandwich)
-        ).filter(model.Order.id == item_id).first()
-        if not item:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
+        query = db.query(model.Order).options(
+            selectinload(model.Order.order_details).joinedload(order_detail_model.OrderDetail.sandwich)
+        )
+        if order_status is not None:
+            query = query.filter(model.Order.status == order_status)
+        if user_id is not None:
+            query = query.filter(model.Order.user_id == user_id)
+        query = filter_date_range(query, model.Order.order_date, start_date, end_date)
+        result = paginate(query, model.Order, params, sort_keys=("id", "order_date"))
     except SQLAlchemyError as e:
         error = str(e.__dict__['orig'])
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return item
+    return result
+
+
+def export(db: Session, export_format="ndjson", start_date=None, end_date=None):
+    order_total = func.coalesce(
+        func.sum(order_detail_model.OrderDetail.amount * sandwich_model.Sandwich.price), 0
+    ).label("total")
+    stmt = (
+        select(
+            model.Order.id, model.Order.user_id, model.Order.customer_name, model.Order.description,
+            model.Order.order_date, model.Order.tracking_number, model.Order.status, order_total,
+        )
+        .outerjoin(order_detail_model.OrderDetail, order_detail_model.OrderDetail.order_id == model.Order.id)
+        .outerjoin(sandwich_model.Sandwich, order_detail_model.OrderDetail.sandwich_id == sandwich_model.Sandwich.id)
+        .group_by(model.Order.id)
+        .order_by(model.Order.id)
+    )
+    stmt = filter_date_range(stmt, model.Order.order_date, start_date, end_date)
+    return exporter.stream(db, stmt, "orders", export_format)
+
+
+def read_one(db: Session, item_id):
+    return crud.read_one(db, model.Order, item_id, LOAD_OPTIONS)
 
 
 def update(db: Session, item_id, request):
-    try:
-        item = db.query(model.Order).filter(model.Order.id == item_id)
-        if not item.first():
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-        update_data = request.dict(exclude_unset=True)
-        item.update(update_data, synchronize_session=False)
-        db.commit()
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return item.first()
+    order = crud.update(db, model.Order, item_id, request, LOAD_OPTIONS)
+    search_index.changed("order", order.id, order.description)
+    _publish("updated", order.id, order.user_id, request.model_dump(exclude_unset=True))
+    return order
 
 
 def delete(db: Session, item_id):
-    try:
-        item = db.query(model.Order).filter(model.Order.id == item_id)
-        if not item.first():
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-        item.delete(synchronize_session=False)
-        db.commit()
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
+    owners = _owners(db, [item_id]) if events.broker.listening() else {}
+    response = crud.delete(db, model.Order, item_id)
+    search_index.changed("order", item_id)
+    if owners:
+        _publish("deleted", item_id, owners[item_id])
+    return response
+
+
+def bulk_create(db: Session, requests):
+    results = bulk.create_many(db, model.Order, requests)
+    if events.broker.listening():
+        for result, request in zip(results, requests):
+            # Bulk inserts return only ids; status is the model's Python-side default
+            data = {"id": result["id"], "status": model.Order.status.default.arg, "tracking_number": None,
+                    **request.model_dump()}
+            _publish("created", result["id"], request.user_id, data)
+    return results
+
+
+def bulk_update(db: Session, requests):
+    results = bulk.update_many(db, model.Order, requests)
+    if events.broker.listening():
+        updated = [request for request, result in zip(requests, results) if result["status"] == "updated"]
+        owners = _owners(db, [request.id for request in updated])
+        for request in updated:
+            changes = request.model_dump(exclude_unset=True, exclude={"id"})
+            if changes:
+                _publish("updated", request.id, owners.get(request.id), changes)
+    return results
+
+
+def bulk_delete(db: Session, ids):
+    owners = _owners(db, ids) if events.broker.listening() else {}
+    results = bulk.delete_many(db, model.Order, ids)
+    for result in results:
+        if result["status"] == "deleted" and result["id"] in owners:
+            _publish("deleted", result["id"], owners[result["id"]])
+    return results
@@ -1,65 +1,56 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status, Response, Depends
 from ..models import payment as model
 from sqlalchemy.exc import SQLAlchemyError
+from . import bulk, crud, export as exporter
+from ..dependencies.pagination import PageParams, paginate, filter_date_range
 
 
 def create(db: Session, request):
-    new_item = model.Payment(**request.model_dump())
+    return crud.create(db, model.Payment, request)
 
-    try:
-        db.add(new_item)
-        db.commit()
-        db.refresh(new_item)
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
 
-    return new_item
-
-
-def read_all(db: Session):
+def read_all(db: Session, params: PageParams, order_id=None, transaction_status=None, start_date=None, end_date=None):
     try:
-        result = db.query(model.Payment).all()
+        query = db.query(model.Payment)
+        if order_id is not None:
+            query = query.filter(model.Payment.order_id == order_id)
+        if transaction_status is not None:
+            query = query.filter(model.Payment.transaction_status == transaction_status)
+        query = filter_date_range(query, model.Payment.payment_date, start_date, end_date)
+        result = paginate(query, model.Payment, params, sort_keys=("id", "payment_date", "amount"))
     except SQLAlchemyError as e:
         error = str(e.__dict__['orig'])
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
     return result
 
 
+def export(db: Session, export_format="ndjson", start_date=None, end_date=None):
+    stmt = select(*model.Payment.__table__.columns).order_by(model.Payment.id)
+    stmt = filter_date_range(stmt, model.Payment.payment_date, start_date, end_date)
+    return exporter.stream(db, stmt, "payments", export_format)
+
+
 def read_one(db: Session, item_id):
-    try:
-        item = db.query(model.Payment).filter(model.Payment.id == item_id).first()
-        if not item:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return item
+    return crud.read_one(db, model.Payment, item_id)
 
 
 def update(db: Session, item_id, request):
-    try:
-        item = db.query(model.Payment).filter(model.Payment.id == item_id)
-        if not item.first():
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-        update_data = request.dict(exclude_unset=True)
-        item.update(update_data, synchronize_session=False)
-        db.commit()
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return item.first()
+    return crud.update(db, model.Payment, item_id, request)
 
 
 def delete(db: Session, item_id):
-    try:
-        item = db.query(model.Payment).filter(model.Payment.id == item_id)
-        if not item.first():
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-        item.delete(synchronize_session=False)
-        db.commit()
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return crud.delete(db, model.Payment, item_id)
+
+
+def bulk_create(db: Session, requests):
+    return bulk.create_many(db, model.Payment, requests)
+
+
+def bulk_update(db: Session, requests):
+    return bulk.update_many(db, model.Payment, requests)
+
+
+def bulk_delete(db: Session, ids):
+    return bulk.delete_many(db, model.Payment, ids)
@@ -0,0 +1,6 @@
+from ..dependencies.database import engine
+from ..dependencies import pool_metrics
+
+
+def read():
+    return pool_metrics.snapshot(engine.pool)
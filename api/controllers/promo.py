@@ -1,65 +1,96 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status, Response, Depends
 from ..models import promo as model
+from ..models import sandwiches as sandwich_model
 from sqlalchemy.exc import SQLAlchemyError
+from . import bulk, crud, discounts
+from ..schemas import promo_schema as schema
+from ..dependencies.cache import menu_cache
+from ..dependencies.pagination import PageParams, paginate
+
+CACHE_TABLES = ("promos",)
 
 
 def create(db: Session, request):
-    new_item = model.Promo(**request.model_dump())
+    return crud.create(db, model.Promo, request)
+
+
+def read_all(db: Session, params: PageParams, is_active=None):
+    return menu_cache.get_or_load(
+        CACHE_TABLES, ("read_all", params.limit, params.cursor, params.sort, is_active),
+        lambda: _read_all(db, params, is_active=is_active)
+    )
 
-    try:
-        db.add(new_item)
-        db.commit()
-        db.refresh(new_item)
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
 
-    return new_item
+def read_one(db: Session, item_id):
+    return menu_cache.get_or_load(CACHE_TABLES, ("read_one", item_id), lambda: _read_one(db, item_id))
 
 
-def read_all(db: Session):
+def _read_all(db: Session, params: PageParams, is_active=None):
     try:
-        result = db.query(model.Promo).all()
+        query = db.query(model.Promo)
+        if is_active is not None:
+            query = query.filter(model.Promo.is_active == is_active)
+        rows, next_cursor = paginate(query, model.Promo, params, sort_keys=("id", "code"))
+        result = ([schema.Promo.model_validate(row, from_attributes=True).model_dump() for row in rows], next_cursor)
     except SQLAlchemyError as e:
         error = str(e.__dict__['orig'])
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
     return result
 
 
-def read_one(db: Session, item_id):
-    try:
-        item = db.query(model.Promo).filter(model.Promo.id == item_id).first()
-        if not item:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return item
+def _read_one(db: Session, item_id):
+    item = crud.read_one(db, model.Promo, item_id)
+    return schema.Promo.model_validate(item, from_attributes=True).model_dump()
 
 
 def update(db: Session, item_id, request):
-    try:
-        item = db.query(model.Promo).filter(model.Promo.id == item_id)
-        if not item.first():
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-        update_data = request.dict(exclude_unset=True)
-        item.update(update_data, synchronize_session=False)
-        db.commit()
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return item.first()
+    return crud.update(db, model.Promo, item_id, request)
 
 
 def delete(db: Session, item_id):
+    return crud.delete(db, model.Promo, item_id)
+
+
+def bulk_create(db: Session, requests):
+    return bulk.create_many(db, model.Promo, requests)
+
+
+def bulk_update(db: Session, requests):
+    return bulk.update_many(db, model.Promo, requests)
+
+
+def bulk_delete(db: Session, ids):
+    return bulk.delete_many(db, model.Promo, ids)
+
+
+def validate(db: Session, request):
+    """Check one code against the in-memory promo index and, given a subtotal, price it."""
+    rule, reason = discounts.promo_index.lookup(db, request.code)
+    result = {"code": request.code, "valid": reason is None, "reason": reason}
+    if rule is not None:
+        result.update(discount_type=rule.discount_type, value=rule.value)
+    if reason is None and request.subtotal is not None:
+        quote = discounts.evaluate(db, [request.code], request.subtotal)
+        result.update(discount=quote["discount"], total=quote["total"])
+    return result
+
+
+def quote(db: Session, request):
+    """Price a cart and apply a stack of promo codes to it, without placing an order."""
+    quantities = {}
+    for line in request.items:
+        quantities[line.sandwich_id] = quantities.get(line.sandwich_id, 0) + line.amount
     try:
-        item = db.query(model.Promo).filter(model.Promo.id == item_id)
-        if not item.first():
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-        item.delete(synchronize_session=False)
-        db.commit()
+        prices = dict(
+            db.query(sandwich_model.Sandwich.id, sandwich_model.Sandwich.price)
+            .filter(sandwich_model.Sandwich.id.in_(quantities))
+        )
     except SQLAlchemyError as e:
         error = str(e.__dict__['orig'])
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
+    missing = sorted(set(quantities) - set(prices))
+    if missing:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Sandwich not found: {missing}")
+    subtotal = sum(prices[sandwich_id] * amount for sandwich_id, amount in quantities.items())
+    return discounts.evaluate(db, request.codes, subtotal)
@@ -0,0 +1,181 @@
+import logging
+from collections import Counter, defaultdict
+from fastapi import HTTPException, status
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from ..models import order_details as order_detail_model
+from ..models import rating_summary as model
+from ..models import review as review_model
+from ..dependencies.cache import versions
+
+logger = logging.getLogger(__name__)
+
+STARS = range(1, 6)
+COUNT_COLUMNS = ("count", "total") + tuple(f"stars_{stars}" for stars in STARS)
+UPSERT_DIALECTS = {"mysql": mysql, "postgresql": postgresql, "sqlite": sqlite}
+
+
+def _order_sandwiches(db: Session, order_ids):
+    """The distinct sandwiches on each order; a review counts once for each of them.
+
+    Detail rows without a sandwich are skipped: they have no summary row to count towards.
+    """
+    if not order_ids:
+        return {}
+    rows = db.execute(
+        select(order_detail_model.OrderDetail.order_id, order_detail_model.OrderDetail.sandwich_id)
+        .where(order_detail_model.OrderDetail.order_id.in_(order_ids),
+               order_detail_model.OrderDetail.sandwich_id.is_not(None))
+        .distinct()
+    )
+    sandwiches = defaultdict(set)
+    for order_id, sandwich_id in rows:
+        sandwiches[order_id].add(sandwich_id)
+    return sandwiches
+
+
+def _deltas(db: Session, changes):
+    sandwiches = _order_sandwiches(db, {order_id for _, order_id, _, _ in changes if order_id is not None})
+    deltas = defaultdict(Counter)
+    for user_id, order_id, rating, sign in changes:
+        subjects = [("global", 0), ("user", user_id)]
+        subjects += [("sandwich", sandwich_id) for sandwich_id in sandwiches.get(order_id, ())]
+        for subject in subjects:
+            delta = deltas[subject]
+            delta["count"] += sign
+            delta["total"] += sign * rating
+            delta[f"stars_{rating}"] += sign
+    return deltas
+
+
+def record(db: Session, changes):
+    """Add ``(user_id, order_id, rating, +1 | -1)`` review changes to the summaries, in the caller's transaction.
+
+    All affected rows go out as one upsert that adds the deltas in the
+    database, so concurrent reviews of the same sandwich never lose a count.
+    """
+    table = model.RatingSummary.__table__
+    rows = [
+        {"scope": scope, "subject_id": subject_id, **{column: delta[column] for column in COUNT_COLUMNS}}
+        # Sorted so concurrent upserts lock the rows in the same order
+        for (scope, subject_id), delta in sorted(_deltas(db, changes).items())
+        if any(delta.values())
+    ]
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    stmt = UPSERT_DIALECTS[dialect].insert(table).values(rows)
+    if dialect == "mysql":
+        stmt = stmt.on_duplicate_key_update({column: table.c[column] + stmt.inserted[column]
+                                             for column in COUNT_COLUMNS})
+    else:
+        stmt = stmt.on_conflict_do_update(index_elements=["scope", "subject_id"],
+                                          set_={column: table.c[column] + stmt.excluded[column]
+                                                for column in COUNT_COLUMNS})
+    db.execute(stmt)
+
+
+def record_after(db: Session, changes):
+    """Record changes for reviews another transaction has already committed (the bulk routes).
+
+    A failure here leaves the summaries behind rather than failing a write
+    that has happened; the next rebuild() repairs them.
+    """
+    if not changes:
+        return
+    try:
+        record(db, changes)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.warning("Rating summaries not updated, run a rebuild: %s", e.__dict__.get('orig', e))
+        return
+    versions.bump(model.RatingSummary.__tablename__)
+
+
+def rebuild(db: Session):
+    """Recompute every summary from ``reviews`` and rewrite the rows that drifted.
+
+    Summaries drift when an order's sandwiches change after it was reviewed or
+    when a write to them failed. Summary rows are locked first, which makes
+    review writes wait until the rebuild commits.
+    """
+    review = review_model.Review
+    pairs = select(order_detail_model.OrderDetail.order_id, order_detail_model.OrderDetail.sandwich_id) \
+        .where(order_detail_model.OrderDetail.sandwich_id.is_not(None)).distinct().subquery()
+    aggregates = [func.count(review.id), func.coalesce(func.sum(review.rating), 0)]
+    aggregates += [func.coalesce(func.sum(case((review.rating == stars, 1), else_=0)), 0) for stars in STARS]
+    queries = {
+        "user": select(review.user_id, *aggregates).group_by(review.user_id),
+        "sandwich": select(pairs.c.sandwich_id, *aggregates).select_from(review)
+        .join(pairs, pairs.c.order_id == review.order_id).group_by(pairs.c.sandwich_id),
+    }
+
+    table = model.RatingSummary.__table__
+
+    try:
+        existing = {
+            (scope, subject_id): tuple(counts)
+            for scope, subject_id, *counts in db.execute(
+                select(table.c.scope, table.c.subject_id, *(table.c[column] for column in COUNT_COLUMNS))
+                .with_for_update()
+            )
+        }
+        expected = {}
+        overall = db.execute(select(*aggregates)).one()
+        if overall[0]:
+            expected[("global", 0)] = tuple(overall)
+        for scope, query in queries.items():
+            for subject_id, *counts in db.execute(query):
+                expected[(scope, subject_id)] = tuple(counts)
+
+        drifted = sorted(key for key in existing.keys() | expected.keys() if existing.get(key) != expected.get(key))
+        for scope, subject_id in drifted:
+            db.execute(delete(model.RatingSummary).where(model.RatingSummary.scope == scope,
+                                                         model.RatingSummary.subject_id == subject_id))
+            if (scope, subject_id) in expected:
+                db.add(model.RatingSummary(scope=scope, subject_id=subject_id,
+                                           **dict(zip(COUNT_COLUMNS, expected[(scope, subject_id)]))))
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        error = str(e.__dict__['orig'])
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+
+    if drifted:
+        versions.bump(model.RatingSummary.__tablename__)
+    return {"checked": len(existing.keys() | expected.keys()), "fixed": len(drifted)}
+
+
+def _summary(scope, subject_id, row=None):
+    count = row.count if row else 0
+    return {
+        "scope": scope,
+        "subject_id": subject_id,
+        "count": count,
+        "average": round(row.total / count, 2) if count else None,
+        "histogram": [getattr(row, f"stars_{stars}") if row else 0 for stars in STARS],
+    }
+
+
+def read_one(db: Session, scope, subject_id):
+    try:
+        row = db.get(model.RatingSummary, (scope, subject_id))
+    except SQLAlchemyError as e:
+        error = str(e.__dict__['orig'])
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+    return _summary(scope, subject_id, row)
+
+
+def read_all(db: Session, scope):
+    try:
+        rows = db.scalars(
+            select(model.RatingSummary).where(model.RatingSummary.scope == scope)
+            .order_by(model.RatingSummary.subject_id)
+        ).all()
+    except SQLAlchemyError as e:
+        error = str(e.__dict__['orig'])
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+    return [_summary(scope, row.subject_id, row) for row in rows if row.count]
@@ -1,65 +1,73 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException, status, Response, Depends
 from ..models import recipes as model
 from sqlalchemy.exc import SQLAlchemyError
+from . import bulk, crud
+from .availability import engine as availability
+from ..schemas import recipes as schema
+from ..dependencies.cache import menu_cache
+from ..dependencies.pagination import PageParams, paginate
+
+CACHE_TABLES = ("recipes", "sandwiches", "resources")
+LOAD_OPTIONS = (joinedload(model.Recipe.sandwich), joinedload(model.Recipe.resource))
 
 
 def create(db: Session, request):
-    new_item = model.Recipe(**request.model_dump())
+    item = crud.create(db, model.Recipe, request)
+    availability.recipe_changed(item.id, item.sandwich_id, item.resource_id, item.amount)
+    return item
 
-    try:
-        db.add(new_item)
-        db.commit()
-        db.refresh(new_item)
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
 
-    return new_item
+def read_all(db: Session, params: PageParams, sandwich_id=None, resource_id=None):
+    return menu_cache.get_or_load(
+        CACHE_TABLES, ("read_all", params.limit, params.cursor, params.sort, sandwich_id, resource_id),
+        lambda: _read_all(db, params, sandwich_id=sandwich_id, resource_id=resource_id)
+    )
 
 
-def read_all(db: Session):
+def read_one(db: Session, item_id):
+    return menu_cache.get_or_load(CACHE_TABLES, ("read_one", item_id), lambda: _read_one(db, item_id))
+
+
+def _read_all(db: Session, params: PageParams, sandwich_id=None, resource_id=None):
     try:
-        result = db.query(model.Recipe).all()
+        query = db.query(model.Recipe).options(*LOAD_OPTIONS)
+        if sandwich_id is not None:
+            query = query.filter(model.Recipe.sandwich_id == sandwich_id)
+        if resource_id is not None:
+            query = query.filter(model.Recipe.resource_id == resource_id)
+        rows, next_cursor = paginate(query, model.Recipe, params)
+        result = ([schema.Recipe.model_validate(row, from_attributes=True).model_dump() for row in rows], next_cursor)
     except SQLAlchemyError as e:
         error = str(e.__dict__['orig'])
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
     return result
 
 
-def read_one(db: Session, item_id):
-    try:
-        item = db.query(model.Recipe).filter(model.Recipe.id == item_id).first()
-        if not item:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return item
+def _read_one(db: Session, item_id):
+    item = crud.read_one(db, model.Recipe, item_id, LOAD_OPTIONS)
+    return schema.Recipe.model_validate(item, from_attributes=True).model_dump()
 
 
 def update(db: Session, item_id, request):
-    try:
-        item = db.query(model.Recipe).filter(model.Recipe.id == item_id)
-        if not item.first():
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-        update_data = request.dict(exclude_unset=True)
-        item.update(update_data, synchronize_session=False)
-        db.commit()
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return item.first()
+    item = crud.update(db, model.Recipe, item_id, request, LOAD_OPTIONS)
+    availability.recipe_changed(item.id, item.sandwich_id, item.resource_id, item.amount)
+    return item
 
 
 def delete(db: Session, item_id):
-    try:
-        item = db.query(model.Recipe).filter(model.Recipe.id == item_id)
-        if not item.first():
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-        item.delete(synchronize_session=False)
-        db.commit()
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
+    response = crud.delete(db, model.Recipe, item_id)
+    availability.recipe_changed(item_id)
+    return response
+
+
+def bulk_create(db: Session, requests):
+    return bulk.create_many(db, model.Recipe, requests)
+
+
+def bulk_update(db: Session, requests):
+    return bulk.update_many(db, model.Recipe, requests)
+
+
+def bulk_delete(db: Session, ids):
+    return bulk.delete_many(db, model.Recipe, ids)
@@ -2,64 +2,65 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status, Response, Depends
 from ..models import resources as model
 from sqlalchemy.exc import SQLAlchemyError
+from . import bulk, crud
+from .availability import engine as availability
+from ..schemas import resources as schema
+from ..dependencies.cache import menu_cache
+from ..dependencies.pagination import PageParams, paginate
+
+CACHE_TABLES = ("resources",)
 
 
 def create(db: Session, request):
-    new_item = model.Resource(**request.model_dump())
+    item = crud.create(db, model.Resource, request)
+    availability.resource_changed(item.id, item.amount)
+    return item
 
-    try:
-        db.add(new_item)
-        db.commit()
-        db.refresh(new_item)
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
 
-    return new_item
+def read_all(db: Session, params: PageParams):
+    return menu_cache.get_or_load(
+        CACHE_TABLES, ("read_all", params.limit, params.cursor, params.sort),
+        lambda: _read_all(db, params)
+    )
 
 
-def read_all(db: Session):
+def read_one(db: Session, item_id):
+    return menu_cache.get_or_load(CACHE_TABLES, ("read_one", item_id), lambda: _read_one(db, item_id))
+
+
+def _read_all(db: Session, params: PageParams):
     try:
-        result = db.query(model.Resource).all()
+        query = db.query(model.Resource)
+        rows, next_cursor = paginate(query, model.Resource, params, sort_keys=("id", "item", "amount"))
+        result = ([schema.Resource.model_validate(row, from_attributes=True).model_dump() for row in rows], next_cursor)
     except SQLAlchemyError as e:
         error = str(e.__dict__['orig'])
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
     return result
 
 
-def read_one(db: Session, item_id):
-    try:
-        item = db.query(model.Resource).filter(model.Resource.id == item_id).first()
-        if not item:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return item
+def _read_one(db: Session, item_id):
+    item = crud.read_one(db, model.Resource, item_id)
+    return schema.Resource.model_validate(item, from_attributes=True).model_dump()
 
 
 def update(db: Session, item_id, request):
-    try:
-        item = db.query(model.Resource).filter(model.Resource.id == item_id)
-        if not item.first():
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-        update_data = request.dict(exclude_unset=True)
-        item.update(update_data, synchronize_session=False)
-        db.commit()
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return item.first()
+    item = crud.update(db, model.Resource, item_id, request)
+    availability.resource_changed(item.id, item.amount)
+    return item
 
 
 def delete(db: Session, item_id):
-    try:
-        item = db.query(model.Resource).filter(model.Resource.id == item_id)
-        if not item.first():
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-        item.delete(synchronize_session=False)
-        db.commit()
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return crud.delete(db, model.Resource, item_id)
+
+
+def bulk_create(db: Session, requests):
+    return bulk.create_many(db, model.Resource, requests)
+
+
+def bulk_update(db: Session, requests):
+    return bulk.update_many(db, model.Resource, requests)
+
+
+def bulk_delete(db: Session, ids):
+    return bulk.delete_many(db, model.Resource, ids)
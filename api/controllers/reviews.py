@@ -1,60 +1,125 @@
+from sqlalchemy import delete as sql_delete, select, update as sql_update
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status, Response, Depends
 from ..models import review as model
 from sqlalchemy.exc import SQLAlchemyError
+from . import bulk, crud, ratings
+from .search import index as search_index
+from ..dependencies.cache import versions
+from ..dependencies.pagination import PageParams, paginate, filter_date_range
 
-def read_all(db: Session):
+# Review writes update the rating summaries in the same transaction, so the
+# summaries only drift through the bulk routes or later order_details changes.
+WRITTEN_TABLES = ("reviews", "rating_summaries")
+
+def _database_error(db: Session, e: SQLAlchemyError):
+    db.rollback()
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e.__dict__['orig']))
+
+def _bump():
+    for table in WRITTEN_TABLES:
+        versions.bump(table)
+
+def _locked(db: Session, item_id):
+    """The review's ``(user_id, order_id, rating)``, locked until commit so concurrent writes apply in turn."""
+    row = db.execute(
+        select(model.Review.user_id, model.Review.order_id, model.Review.rating)
+        .where(model.Review.id == item_id).with_for_update()
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
+    return row
+
+def _current(db: Session, ids):
+    rows = db.execute(
+        select(model.Review.id, model.Review.user_id, model.Review.order_id, model.Review.rating)
+        .where(model.Review.id.in_(ids))
+    )
+    return {row.id: row for row in rows}
+
+def read_all(db: Session, params: PageParams, user_id=None, order_id=None, start_date=None, end_date=None):
     try:
-        result = db.query(model.Review).all()
+        query = db.query(model.Review)
+        if user_id is not None:
+            query = query.filter(model.Review.user_id == user_id)
+        if order_id is not None:
+            query = query.filter(model.Review.order_id == order_id)
+        query = filter_date_range(query, model.Review.review_date, start_date, end_date)
+        result = paginate(query, model.Review, params, sort_keys=("id", "review_date", "rating"))
     except SQLAlchemyError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     return result
 
 def read_one(db: Session, item_id):
-    try:
-        item = db.query(model.Review).filter(model.Review.id == item_id).first()
-        if not item:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return item
+    return crud.read_one(db, model.Review, item_id)
 
 def create(db: Session, request):
-    db_review = model.Review(**request.model_dump())
-
+    new_item = model.Review(**request.model_dump())
     try:
-        db.add(db_review)
+        db.add(new_item)
+        db.flush()
+        ratings.record(db, [(new_item.user_id, new_item.order_id, new_item.rating, 1)])
         db.commit()
-        db.refresh(db_review)
+        db.refresh(new_item)
     except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-
-    return db_review
+        _database_error(db, e)
+    _bump()
+    search_index.changed("review", new_item.id, new_item.comment)
+    return new_item
 
 def update(db: Session, request, item_id):
+    update_data = request.model_dump(exclude_unset=True)
+    if update_data.get("rating") is None:
+        item = crud.update(db, model.Review, item_id, request)
+        search_index.changed("review", item.id, item.comment)
+        return item
     try:
-        item = db.query(model.Review).filter(model.Review.id == item_id)
-
-        if not item.first():
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="ID not found!")
-        update_data = request.dict(exclude_unset=True)
-        item.update(update_data, synchronize_session=False)
+        old = _locked(db, item_id)
+        db.execute(sql_update(model.Review).where(model.Review.id == item_id).values(**update_data),
+                   execution_options={"synchronize_session": False})
+        ratings.record(db, [(old.user_id, old.order_id, old.rating, -1),
+                            (old.user_id, old.order_id, update_data["rating"], 1)])
         db.commit()
     except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return item.first()
+        _database_error(db, e)
+    _bump()
+    item = crud.read_one(db, model.Review, item_id)
+    search_index.changed("review", item.id, item.comment)
+    return item
 
 def delete(db: Session, item_id):
     try:
-        item = db.query(model.Review).filter(model.Review.id == item_id)
-        if not item.first():
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="ID not found")
-        item.delete(synchronize_session=False)
+        old = _locked(db, item_id)
+        db.execute(sql_delete(model.Review).where(model.Review.id == item_id),
+                   execution_options={"synchronize_session": False})
+        ratings.record(db, [(old.user_id, old.order_id, old.rating, -1)])
         db.commit()
     except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        _database_error(db, e)
+    _bump()
+    search_index.changed("review", item_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+def bulk_create(db: Session, requests):
+    results = bulk.create_many(db, model.Review, requests)
+    ratings.record_after(db, [(request.user_id, request.order_id, request.rating, 1) for request in requests])
+    return results
+
+def bulk_update(db: Session, requests):
+    rated = {request.id: request.rating for request in requests if request.rating is not None}
+    old = _current(db, list(rated)) if rated else {}
+    results = bulk.update_many(db, model.Review, requests)
+    changes = []
+    for review_id, rating in rated.items():
+        if review_id in old:
+            row = old[review_id]
+            changes += [(row.user_id, row.order_id, row.rating, -1), (row.user_id, row.order_id, rating, 1)]
+    ratings.record_after(db, changes)
+    return results
+
+def bulk_delete(db: Session, ids):
+    old = _current(db, ids)
+    results = bulk.delete_many(db, model.Review, ids)
+    deleted = [old[result["id"]] for result in results if result["status"] == "deleted"]
+    ratings.record_after(db, [(row.user_id, row.order_id, row.rating, -1) for row in deleted])
+    return results
@@ -1,66 +1,101 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status, Response, Depends
 from ..models import sandwiches as model
+from ..models import rating_summary as summary_model
+from sqlalchemy import and_, select
 from sqlalchemy.exc import SQLAlchemyError
+from . import bulk, crud
+from .availability import engine as availability
+from .search import index as search_index
+from ..schemas import sandwiches as schema
+from ..dependencies.cache import menu_cache
+from ..dependencies.pagination import PageParams, keyset, next_page
+
+CACHE_TABLES = ("sandwiches", "rating_summaries")
+
+
+def _rated():
+    """Sandwich columns with the sandwich's review count and rating total, in one statement."""
+    summary = summary_model.RatingSummary
+    return select(
+        model.Sandwich.id, model.Sandwich.sandwich_name, model.Sandwich.price,
+        summary.count.label("rating_count"), summary.total.label("rating_total"),
+    ).outerjoin(summary, and_(summary.scope == "sandwich", summary.subject_id == model.Sandwich.id))
+
+
+def _serialize(row):
+    count = row.rating_count or 0
+    item = schema.Sandwich.model_validate(row, from_attributes=True).model_dump()
+    item["rating_count"] = count
+    item["average_rating"] = round(row.rating_total / count, 2) if count else None
+    return item
 
 
 def create(db: Session, request):
-    new_item = model.Sandwich(**request.model_dump())
+    item = crud.create(db, model.Sandwich, request)
+    search_index.changed("sandwich", item.id, item.sandwich_name)
+    return item
+
+
+def read_all(db: Session, params: PageParams):
+    items, next_cursor = menu_cache.get_or_load(
+        CACHE_TABLES, ("read_all", params.limit, params.cursor, params.sort),
+        lambda: _read_all(db, params)
+    )
+    # Availability moves with stock, so it is added after the cache rather than cached with the rows
+    return availability.annotate(db, items), next_cursor
+
+
+def read_one(db: Session, item_id):
+    item = menu_cache.get_or_load(CACHE_TABLES, ("read_one", item_id), lambda: _read_one(db, item_id))
+    return availability.annotate(db, [item])[0]
 
-    try:
-        db.add(new_item)
-        db.commit()
-        db.refresh(new_item)
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
 
-    return new_item
+def read_availability(db: Session):
+    return availability.listing(db)
 
 
-def read_all(db: Session):
+def _read_all(db: Session, params: PageParams):
     try:
-        result = db.query(model.Sandwich).all()
+        stmt = keyset(_rated(), model.Sandwich, params, sort_keys=("id", "price"))
+        rows, next_cursor = next_page(db.execute(stmt), params)
+        result = ([_serialize(row) for row in rows], next_cursor)
     except SQLAlchemyError as e:
         error = str(e.__dict__['orig'])
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
     return result
 
 
-def read_one(db: Session, item_id):
+def _read_one(db: Session, item_id):
     try:
-        item = db.query(model.Sandwich).filter(model.Sandwich.id == item_id).first()
-        if not item:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
+        row = db.execute(_rated().where(model.Sandwich.id == item_id)).first()
     except SQLAlchemyError as e:
         error = str(e.__dict__['orig'])
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return item
+    if not row:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
+    return _serialize(row)
 
 
 def update(db: Session, item_id, request):
-    try:
-        item = db.query(model.Sandwich).filter(model.Sandwich.id == item_id)
-        if not item.first():
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-        update_data = request.dict(exclude_unset=True)
-        item.update(update_data, synchronize_session=False)
-        db.commit()
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return item.first()
+    item = crud.update(db, model.Sandwich, item_id, request)
+    search_index.changed("sandwich", item.id, item.sandwich_name)
+    return item
 
 
 def delete(db: Session, item_id):
-    try:
-        item = db.query(model.Sandwich).filter(model.Sandwich.id == item_id)
-        if not item.first():
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-        item.delete(synchronize_session=False)
-        db.commit()
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
+    response = crud.delete(db, model.Sandwich, item_id)
+    search_index.changed("sandwich", item_id)
+    return response
+
+
+def bulk_create(db: Session, requests):
+    return bulk.create_many(db, model.Sandwich, requests)
+
+
+def bulk_update(db: Session, requests):
+    return bulk.update_many(db, model.Sandwich, requests)
+
 
+def bulk_delete(db: Session, ids):
+    return bulk.delete_many(db, model.Sandwich, ids)
@@ -0,0 +1,242 @@
+import bisect
+import heapq
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from ..models import orders as order_model
+from ..models import review as review_model
+from ..models import sandwiches as sandwich_model
+from ..dependencies.cache import VersionSnapshot, versions
+from ..dependencies.config import conf
+from ..dependencies.pagination import decode_cursor, encode_cursor
+
+# Kinds of result, in the order they are listed when scores tie
+KINDS = ("sandwich", "review", "order")
+
+WORD = re.compile(r"\w+")
+
+# BM25 term frequency saturation and length normalization
+K1 = 1.2
+B = 0.75
+# A word found only because it starts with the query word scores this much of an exact match
+PREFIX_WEIGHT = 0.5
+
+
+def tokenize(text):
+    return WORD.findall(text.lower()) if text else []
+
+
+class Field:
+    """Inverted index of one text column: word -> {row id: occurrences}."""
+
+    def __init__(self, table, column):
+        self.table = table
+        self.column = column
+        self.clear()
+
+    def clear(self):
+        self.texts = {}
+        self.lengths = {}
+        self.postings = defaultdict(dict)
+        self.total_length = 0
+
+    def add(self, item_id, text):
+        """Index ``text`` under ``item_id`` and return the words that are new to this field."""
+        words = Counter(tokenize(text))
+        if not words:
+            return []
+        self.texts[item_id] = text
+        self.lengths[item_id] = sum(words.values())
+        self.total_length += self.lengths[item_id]
+        new = []
+        for word, count in words.items():
+            postings = self.postings[word]
+            if not postings:
+                new.append(word)
+            postings[item_id] = count
+        return new
+
+    def remove(self, item_id):
+        text = self.texts.pop(item_id, None)
+        if text is None:
+            return
+        self.total_length -= self.lengths.pop(item_id)
+        for word in set(tokenize(text)):
+            postings = self.postings[word]
+            postings.pop(item_id, None)
+            if not postings:
+                del self.postings[word]
+
+
+class SearchIndex:
+    """In-process full-text index over sandwich names, review comments and order descriptions.
+
+    Each column is loaded with one query the first time it is searched and
+    kept as an inverted index; results are ranked with BM25 over all three.
+    The sandwiches, reviews and orders controllers pass their single-row
+    writes in with changed(). A write they did not pass in (bulk routes,
+    another worker) leaves a table version this index has not absorbed, and
+    the next search reloads that column alone. With the per-process version
+    store another worker's writes move no version, so a column is also
+    reloaded once it is ``conf.cache_ttl`` seconds old.
+    """
+
+    def __init__(self, versions):
+        self.versions = versions
+        self.fields = {
+            "sandwich": Field("sandwiches", sandwich_model.Sandwich.sandwich_name),
+            "review": Field("reviews", review_model.Review.comment),
+            "order": Field("orders", order_model.Order.description),
+        }
+        self._snapshot = VersionSnapshot(versions, [field.table for field in self.fields.values()])
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            for field in self.fields.values():
+                field.clear()
+            self._snapshot.clear()
+            # Every indexed word in order, for prefix lookups; words whose
+            # last row went away stay until the next reload and match nothing
+            self._vocabulary = []
+
+    def _refresh(self, db: Session):
+        if not self._snapshot.stale():
+            return
+        with self._lock:
+            stale = self._snapshot.stale()
+            for field in self.fields.values():
+                if field.table not in stale:
+                    continue
+                seen = self._snapshot.current([field.table])
+                stmt = select(field.column.class_.id, field.column).where(field.column.is_not(None))
+                try:
+                    rows = db.execute(stmt).all()
+                except SQLAlchemyError as e:
+                    error = str(e.__dict__['orig'])
+                    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+                field.clear()
+                for item_id, text in rows:
+                    field.add(item_id, text)
+                self._snapshot.mark(seen)
+            self._vocabulary = sorted(set().union(*(field.postings for field in self.fields.values())))
+
+    def changed(self, kind, item_id, text=None):
+        """Re-index a created or updated row, or drop a deleted one when ``text`` is None."""
+        with self._lock:
+            field = self.fields[kind]
+            if not self._snapshot.absorb(field.table):
+                return
+            field.remove(item_id)
+            for word in field.add(item_id, text):
+                position = bisect.bisect_left(self._vocabulary, word)
+                if position == len(self._vocabulary) or self._vocabulary[position] != word:
+                    self._vocabulary.insert(position, word)
+
+    def _expand(self, word):
+        """``(word, weight)`` for the query word and the indexed words it is a prefix of."""
+        matches = [(word, 1.0)]
+        if len(word) < conf.search_min_prefix:
+            return matches
+        vocabulary = self._vocabulary
+        position = bisect.bisect_right(vocabulary, word)
+        while (position < len(vocabulary) and len(matches) <= conf.search_max_expansions
+               and vocabulary[position].startswith(word)):
+            matches.append((vocabulary[position], PREFIX_WEIGHT))
+            position += 1
+        return matches
+
+    def search(self, db: Session, query, kinds=KINDS, limit=20, after=None):
+        """Up to ``limit`` ``(kind, id, score, text)`` hits containing every word of ``query``.
+
+        Hits are ordered by descending score, then kind and id; ``after`` is
+        the ``(-score, kind rank, id)`` key of the last hit of the previous page.
+        """
+        words = list(dict.fromkeys(tokenize(query)))
+        if not words:
+            return []
+        self._refresh(db)
+        with self._lock:
+            documents = sum(len(field.lengths) for field in self.fields.values())
+            if not documents:
+                return []
+            average_length = sum(field.total_length for field in self.fields.values()) / documents
+            searched = [(KINDS.index(kind), self.fields[kind]) for kind in kinds]
+
+            matched = []
+            for word in words:
+                terms = []
+                for term, weight in self._expand(word):
+                    frequency = sum(len(field.postings.get(term, ())) for field in self.fields.values())
+                    if frequency:
+                        idf = math.log(1 + (documents - frequency + 0.5) / (frequency + 0.5))
+                        terms.append((term, weight * idf, frequency))
+                if not terms:
+                    return []
+                matched.append(terms)
+            # Rarest word first, so the common ones only look up the rows still in the running
+            matched.sort(key=lambda terms: sum(frequency for _, _, frequency in terms))
+
+            scores = None
+            for terms in matched:
+                best = {}
+                for term, weight, _ in terms:
+                    for rank, field in searched:
+                        postings = field.postings.get(term)
+                        if not postings:
+                            continue
+                        if scores is None or len(postings) <= len(scores):
+                            found = postings.items()
+                        else:
+                            found = [(item_id, postings[item_id]) for key_rank, item_id in scores
+                                     if key_rank == rank and item_id in postings]
+                        for item_id, count in found:
+                            norm = K1 * (1 - B + B * field.lengths[item_id] / average_length)
+                            score = weight * count * (K1 + 1) / (count + norm)
+                            key = (rank, item_id)
+                            if score > best.get(key, 0):
+                                best[key] = score
+                # Every word has to match; a row's score is the sum of its best match per word
+                if scores is not None:
+                    best = {key: scores[key] + score for key, score in best.items() if key in scores}
+                scores = best
+                if not scores:
+                    return []
+
+            ranked = ((-score, rank, item_id) for (rank, item_id), score in scores.items())
+            if after is not None:
+                ranked = (key for key in ranked if key > after)
+            return [(KINDS[rank], item_id, -negative, self.fields[KINDS[rank]].texts[item_id])
+                    for negative, rank, item_id in heapq.nsmallest(limit, ranked)]
+
+
+index = SearchIndex(versions)
+
+
+def _after(cursor):
+    value, last_id = decode_cursor(cursor, "rank", None)
+    if not (isinstance(value, list) and len(value) == 2 and isinstance(value[0], (int, float))
+            and value[1] in KINDS and isinstance(last_id, int)):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    score, kind = value
+    return -score, KINDS.index(kind), last_id
+
+
+def read(db: Session, q, kind=None, limit=20, cursor=None):
+    after = _after(cursor) if cursor else None
+    hits = index.search(db, q, [kind] if kind else KINDS, limit + 1, after)
+    next_cursor = None
+    if len(hits) > limit:
+        hits = hits[:limit]
+        last_kind, last_id, last_score, _ = hits[-1]
+        next_cursor = encode_cursor("rank", [last_score, last_kind], last_id)
+    return [
+        {"kind": hit_kind, "id": item_id, "score": round(score, 4), "text": text}
+        for hit_kind, item_id, score, text in hits
+    ], next_cursor
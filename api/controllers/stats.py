@@ -0,0 +1,126 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import Integer, cast, func
+from fastapi import HTTPException, status
+from ..models import orders as order_model
+from ..models import order_details as order_detail_model
+from ..models import sandwiches as sandwich_model
+from ..models import review as review_model
+from ..models import rating_summary as summary_model
+from ..dependencies.pagination import filter_date_range
+from sqlalchemy.exc import SQLAlchemyError
+
+BUCKET_FORMATS = {
+    "mysql": {"day": "%Y-%m-%d", "week": "%x-W%v", "month": "%Y-%m"},
+    # SQLite before 3.46 has no ISO week format; weeks are built by _sqlite_iso_week
+    "sqlite": {"day": "%Y-%m-%d", "week": None, "month": "%Y-%m"},
+}
+
+
+def _sqlite_iso_week(column):
+    """``YYYY-Www`` ISO year and week, matching MySQL's ``%x-W%v``.
+
+    An ISO week belongs to the year of its Thursday and is numbered from the
+    week holding that year's first Thursday, so both are read off the Thursday
+    of the date's Monday-to-Sunday week.
+    """
+    thursday = func.date(column, "-3 days", "weekday 4")
+    week = (cast(func.strftime("%j", thursday), Integer) - 1) // 7 + 1
+    return func.printf("%s-W%02d", func.strftime("%Y", thursday), week)
+
+
+def _bucket_expression(db: Session, column, bucket):
+    dialect = db.get_bind().dialect.name
+    formats = BUCKET_FORMATS.get(dialect)
+    if formats is None or bucket not in formats:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported bucket '{bucket}' for {dialect}"
+        )
+    if dialect == "sqlite":
+        if bucket == "week":
+            return _sqlite_iso_week(column)
+        return func.strftime(formats[bucket], column)
+    return func.date_format(column, formats[bucket])
+
+
+def _order_stats(db: Session, start_date, end_date, group_by=None):
+    columns = [func.count(order_model.Order.id)]
+    if group_by is not None:
+        columns.insert(0, group_by)
+    query = filter_date_range(db.query(*columns), order_model.Order.order_date, start_date, end_date)
+    return query.group_by(group_by).all() if group_by is not None else query.one()
+
+
+def _revenue_stats(db: Session, start_date, end_date, group_by=None):
+    revenue = func.coalesce(
+        func.sum(order_detail_model.OrderDetail.amount * sandwich_model.Sandwich.price), 0
+    )
+    columns = [revenue]
+    if group_by is not None:
+        columns.insert(0, group_by)
+    query = (
+        db.query(*columns)
+        .select_from(order_detail_model.OrderDetail)
+        .join(sandwich_model.Sandwich, order_detail_model.OrderDetail.sandwich_id == sandwich_model.Sandwich.id)
+        .join(order_model.Order, order_detail_model.OrderDetail.order_id == order_model.Order.id)
+    )
+    query = filter_date_range(query, order_model.Order.order_date, start_date, end_date)
+    return query.group_by(group_by).all() if group_by is not None else query.one()
+
+
+def _review_stats(db: Session, start_date, end_date, group_by=None):
+    columns = [func.count(review_model.Review.id), func.avg(review_model.Review.rating)]
+    if group_by is not None:
+        columns.insert(0, group_by)
+    query = filter_date_range(db.query(*columns), review_model.Review.review_date, start_date, end_date)
+    return query.group_by(group_by).all() if group_by is not None else query.one()
+
+
+def _review_totals(db: Session, start_date, end_date):
+    """``(count, average)`` of reviews; the all-time figures come from the running summary row."""
+    if start_date or end_date:
+        return _review_stats(db, start_date, end_date)
+    row = db.get(summary_model.RatingSummary, ("global", 0))
+    if not row or not row.count:
+        return 0, None
+    return row.count, row.total / row.count
+
+
+def _buckets(db: Session, start_date, end_date, bucket):
+    buckets = {}
+
+    def get(period):
+        return buckets.setdefault(period, {"period": period})
+
+    order_bucket = _bucket_expression(db, order_model.Order.order_date, bucket)
+    for period, count in _order_stats(db, start_date, end_date, order_bucket):
+        get(period)["total_orders"] = count
+    for period, revenue in _revenue_stats(db, start_date, end_date, order_bucket):
+        get(period)["total_revenue"] = float(revenue)
+
+    review_bucket = _bucket_expression(db, review_model.Review.review_date, bucket)
+    for period, count, average in _review_stats(db, start_date, end_date, review_bucket):
+        bucket_stats = get(period)
+        bucket_stats["total_reviews"] = count
+        bucket_stats["average_rating"] = round(float(average), 2) if average is not None else None
+
+    return [buckets[period] for period in sorted(buckets)]
+
+
+def read(db: Session, start_date=None, end_date=None, bucket=None):
+    try:
+        (total_orders,) = _order_stats(db, start_date, end_date)
+        (total_revenue,) = _revenue_stats(db, start_date, end_date)
+        total_reviews, average_rating = _review_totals(db, start_date, end_date)
+        result = {
+            "total_orders": total_orders,
+            "total_revenue": float(total_revenue),
+            "total_reviews": total_reviews,
+            "average_rating": round(float(average_rating), 2) if average_rating is not None else None,
+        }
+        if bucket:
+            result["buckets"] = _buckets(db, start_date, end_date, bucket)
+    except SQLAlchemyError as e:
+        error = str(e.__dict__['orig'])
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+    return result
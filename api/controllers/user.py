@@ -2,74 +2,77 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status, Response, Depends
 from ..models import user as model
 from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
+from . import bulk, crud
+from ..dependencies import auth
+from ..dependencies.pagination import PageParams, paginate
+from ..schemas import user_schema as schema
 
-def read_all(db: Session):
+def read_all(db: Session, params: PageParams, user_role=None):
     try:
-        result = db.query(model.User).all()
+        query = db.query(model.User)
+        if user_role is not None:
+            query = query.filter(model.User.user_role == user_role)
+        result = paginate(query, model.User, params, sort_keys=("id", "name", "email"))
     except SQLAlchemyError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     return result
 
 def read_one(db: Session, item_id):
-    try:
-        item = db.query(model.User).filter(model.User.id == item_id).first()
-        if not item:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return item
+    return crud.read_one(db, model.User, item_id)
+
+def _find_by_email(db: Session, email: str):
+    return db.query(model.User).filter(model.User.email == email).first()
+
+def _save_password(db: Session, user, password_hash: str):
+    user.password = password_hash
+    db.commit()
+
+async def login(db: Session, email: str, password: str):
+    """Check the password on the bcrypt pool and issue a signed token.
 
-def login(db: Session, email: str, password: str):
+    The sync session is only touched from the threadpool, one call at a time.
+    Passwords still stored in plain text are rehashed on their first login.
+    """
     try:
-        user = db.query(model.User).filter(model.User.email == email).first()
-        if not user or user.password != password:
+        user = await run_in_threadpool(_find_by_email, db, email)
+        if not await auth.verify_password(password, user.password if user else None):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
             )
-        return user
+        # Built before any commit below expires the row's attributes
+        result = schema.User.model_validate(user).model_dump()
+        result["token"] = auth.issue_token(user)
+        if not auth.is_hashed(user.password):
+            await run_in_threadpool(_save_password, db, user, await auth.hash_password_async(password))
     except HTTPException:
         raise
     except SQLAlchemyError as e:
         error = str(e.__dict__['orig'])
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+    return result
+
+def _with_hashed_password(request):
+    return request.model_copy(update={"password": auth.hash_password(request.password)})
 
 def create(db: Session, request):
-    new_item = model.User(**request.model_dump())
+    return crud.create(db, model.User, _with_hashed_password(request))
 
-    try:
-        db.add(new_item)
-        db.commit()
-        db.refresh(new_item)
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+def update(db: Session, request, item_id):
+    return crud.update(db, model.User, item_id, request)
 
-    return new_item
+def delete(db: Session, item_id):
+    return crud.delete(db, model.User, item_id)
 
-def update(db: Session, request, item_id):
-    try:
-        item = db.query(model.User).filter(model.User.id == item_id)
+def bulk_create(db: Session, requests):
+    hashes = auth.hash_passwords([request.password for request in requests])
+    return bulk.create_many(db, model.User, [
+        request.model_copy(update={"password": password_hash}) for request, password_hash in zip(requests, hashes)
+    ])
 
-        if not item.first():
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="ID not found!")
-        update_data = request.dict(exclude_unset=True)
-        item.update(update_data, synchronize_session=False)
-        db.commit()
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return item.first()
+def bulk_update(db: Session, requests):
+    return bulk.update_many(db, model.User, requests)
 
-def delete(db: Session, item_id):
-    try:
-        item = db.query(model.User).filter(model.User.id == item_id)
-        if not item.first():
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="ID not found")
-        item.delete(synchronize_session=False)
-        db.commit()
-    except SQLAlchemyError as e:
-        error = str(e.__dict__['orig'])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+def bulk_delete(db: Session, ids):
+    return bulk.delete_many(db, model.User, ids)
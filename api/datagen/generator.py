@@ -0,0 +1,201 @@
+import bisect
+import itertools
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+               "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Carlos", "Maria",
+               "Wei", "Aisha", "Omar", "Priya", "Kenji", "Olga", "Noah", "Emma", "Liam", "Sofia"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+              "Hernandez", "Lopez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee",
+              "Chen", "Khan", "Patel", "Nguyen", "Kim", "Ivanova", "Tanaka", "Okafor", "Rossi", "Silva"]
+STREETS = ["Main St", "Oak Ave", "Pine Rd", "Maple Dr", "College Blvd", "Elm St", "Park Ave", "Lake Rd"]
+BREADS = ["Italian", "Wheat", "Sourdough", "Rye", "Ciabatta", "Baguette", "Wrap", "Bagel"]
+FILLINGS = ["Turkey", "Ham", "Roast Beef", "Chicken", "Tuna", "BLT", "Veggie", "Meatball", "Pastrami", "Egg Salad",
+            "Reuben", "Club", "Caprese", "Falafel", "Philly"]
+INGREDIENTS = ["Bread", "Turkey", "Ham", "Roast Beef", "Chicken", "Tuna", "Bacon", "Lettuce", "Tomato", "Onion",
+               "Cheddar", "Swiss", "Provolone", "Mayo", "Mustard", "Pickles", "Peppers", "Avocado", "Egg", "Olives"]
+PAYMENT_METHODS = ["Credit Card", "Credit Card", "Credit Card", "Cash", "Token"]
+COMMENTS = {1: "Not what I ordered", 2: "Cold when it arrived", 3: "It was fine", 4: "Tasty, will order again",
+            5: "Best sandwich in town"}
+# Lunch and dinner rushes: relative order volume per hour of the day
+HOURLY_WEIGHTS = [1, 0, 0, 0, 0, 1, 3, 6, 8, 7, 9, 20, 28, 22, 10, 7, 8, 14, 18, 14, 9, 5, 3, 2]
+# Fridays and weekends are busier than early in the week
+WEEKDAY_WEIGHTS = [8, 8, 9, 10, 13, 14, 12]
+RATING_WEIGHTS = [5, 7, 15, 33, 40]
+
+
+class Zipf:
+    """Draws 1..n with probability proportional to 1 / rank**s.
+
+    Few customers place most of the orders and a handful of sandwiches dominate
+    sales, which is what makes indexes and caches behave as they do in production.
+    """
+
+    def __init__(self, rng, n, s=1.1):
+        self.rng = rng
+        self.cumulative = list(itertools.accumulate(1 / rank ** s for rank in range(1, n + 1)))
+
+    def __call__(self):
+        return bisect.bisect(self.cumulative, self.rng.random() * self.cumulative[-1]) + 1
+
+
+class Generator:
+    """Streams referentially consistent rows for every table, keyed by column name.
+
+    ``start_ids`` gives the first id to use per table so a run can append to a
+    database that already holds data; ids are assigned here so child rows never
+    need to read their parents back.
+    """
+
+    def __init__(self, users=1000, sandwiches=40, resources=20, orders=10000, promos=20, details_per_order=4,
+                 review_rate=0.25, days=365, stock=1_000_000, end=None, seed_value=0, start_ids=None):
+        self.rng = random.Random(seed_value)
+        self.users = users
+        self.sandwiches = sandwiches
+        self.resources = resources
+        self.orders = orders
+        self.promos = promos
+        self.details_per_order = details_per_order
+        self.review_rate = review_rate
+        self.days = days
+        self.stock = stock
+        self.end = end or datetime.now().replace(microsecond=0)
+        self.start_ids = start_ids or {}
+        self.prices = {}
+
+    def _ids(self, table, count):
+        first = self.start_ids.get(table, 1)
+        return range(first, first + count)
+
+    def users_rows(self):
+        rng = self.rng
+        for user_id in self._ids("users", self.users):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            yield {
+                "id": user_id,
+                "name": f"{first} {last}",
+                "phone_number": f"555-{rng.randrange(1000):03d}-{rng.randrange(10000):04d}",
+                "address": f"{rng.randint(1, 9999)} {rng.choice(STREETS)}",
+                "email": f"{first.lower()}.{last.lower()}.{user_id}@example.com",
+                "password": "password",
+                "user_role": "Staff" if rng.random() < 0.02 else "Customer",
+            }
+
+    def sandwiches_rows(self):
+        rng = self.rng
+        for sandwich_id in self._ids("sandwiches", self.sandwiches):
+            price = Decimal(round(min(max(rng.lognormvariate(2.1, 0.3), 3.5), 19.99), 2)).quantize(Decimal("0.01"))
+            self.prices[sandwich_id] = price
+            yield {
+                "id": sandwich_id,
+                "sandwich_name": f"{rng.choice(FILLINGS)} on {rng.choice(BREADS)} #{sandwich_id}",
+                "price": price,
+            }
+
+    def resources_rows(self):
+        for resource_id in self._ids("resources", self.resources):
+            name = INGREDIENTS[(resource_id - 1) % len(INGREDIENTS)]
+            yield {"id": resource_id, "item": f"{name} #{resource_id}", "amount": self.stock}
+
+    def recipes_rows(self):
+        rng = self.rng
+        resource_ids = list(self._ids("resources", self.resources))
+        recipe_ids = itertools.count(self.start_ids.get("recipes", 1))
+        for sandwich_id in self._ids("sandwiches", self.sandwiches):
+            for resource_id in rng.sample(resource_ids, min(len(resource_ids), rng.randint(3, 6))):
+                yield {"id": next(recipe_ids), "sandwich_id": sandwich_id, "resource_id": resource_id,
+                       "amount": rng.choices([1, 2, 3], [6, 3, 1])[0]}
+
+    def promos_rows(self):
+        rng = self.rng
+        for promo_id in self._ids("promos", self.promos):
+            start = self.end - timedelta(days=rng.randrange(self.days))
+            percentage = rng.random() < 0.7
+            yield {
+                "id": promo_id,
+                "code": f"SAVE{promo_id:05d}",
+                "description": "Seasonal discount",
+                "discount_type": "Percentage" if percentage else "Fixed Amount",
+                "value": Decimal(rng.choice([5, 10, 15, 20, 25]) if percentage else rng.choice([1, 2, 3, 5])),
+                "start_date": start,
+                "end_date": start + timedelta(days=rng.choice([7, 14, 30, 90])),
+                "is_active": 1 if rng.random() < 0.8 else 0,
+            }
+
+    def _order_date(self):
+        rng = self.rng
+        while True:
+            day = self.end - timedelta(days=rng.randrange(self.days))
+            # Rejection-sample the weekday so busy days get proportionally more orders
+            if rng.random() * max(WEEKDAY_WEIGHTS) < WEEKDAY_WEIGHTS[day.weekday()]:
+                break
+        hour = rng.choices(range(24), HOURLY_WEIGHTS)[0]
+        return day.replace(hour=hour, minute=rng.randrange(60), second=rng.randrange(60))
+
+    def _status(self, order_date):
+        age = self.end - order_date
+        if age < timedelta(hours=1):
+            return self.rng.choice(["Placed", "Preparing", "Ready"])
+        return "Cancelled" if self.rng.random() < 0.03 else "Delivered"
+
+    def order_batches(self, batch_size=10000):
+        """Yield ``{table: rows}`` for each batch of orders, with their details, payments and reviews."""
+        rng = self.rng
+        user_ids = list(self._ids("users", self.users))
+        sandwich_ids = list(self._ids("sandwiches", self.sandwiches))
+        pick_user = Zipf(rng, len(user_ids))
+        pick_sandwich = Zipf(rng, len(sandwich_ids))
+        detail_ids = itertools.count(self.start_ids.get("order_details", 1))
+        payment_ids = itertools.count(self.start_ids.get("payments", 1))
+        review_ids = itertools.count(self.start_ids.get("reviews", 1))
+
+        order_ids = self._ids("orders", self.orders)
+        for start in range(0, len(order_ids), batch_size):
+            batch = {"orders": [], "order_details": [], "payments": [], "reviews": []}
+            for order_id in order_ids[start:start + batch_size]:
+                user_id = user_ids[pick_user() - 1]
+                order_date = self._order_date()
+                status = self._status(order_date)
+                batch["orders"].append({
+                    "id": order_id, "user_id": user_id, "customer_name": f"Customer {user_id}",
+                    "description": None, "order_date": order_date, "tracking_number": f"TRK{order_id:010d}",
+                    "status": status,
+                })
+
+                amounts = {}
+                for _ in range(rng.randint(1, self.details_per_order)):
+                    sandwich_id = sandwich_ids[pick_sandwich() - 1]
+                    amounts[sandwich_id] = amounts.get(sandwich_id, 0) + rng.choices([1, 2, 3], [7, 2, 1])[0]
+                total = Decimal(0)
+                for sandwich_id, amount in amounts.items():
+                    total += self.prices.get(sandwich_id, Decimal("8.00")) * amount
+                    batch["order_details"].append({"id": next(detail_ids), "order_id": order_id,
+                                                   "sandwich_id": sandwich_id, "amount": amount})
+
+                batch["payments"].append({
+                    "id": next(payment_ids), "order_id": order_id, "amount": total,
+                    "payment_method": rng.choice(PAYMENT_METHODS),
+                    "transaction_status": "Refunded" if status == "Cancelled" else "Completed",
+                    "payment_date": order_date,
+                })
+                if status == "Delivered" and rng.random() < self.review_rate:
+                    rating = rng.choices(range(1, 6), RATING_WEIGHTS)[0]
+                    batch["reviews"].append({
+                        "id": next(review_ids), "user_id": user_id, "order_id": order_id, "rating": rating,
+                        "comment": COMMENTS[rating], "review_date": order_date + timedelta(hours=rng.randint(1, 72)),
+                    })
+            yield batch
+
+    def batches(self, batch_size=10000):
+        """Every table's rows in foreign-key order, as ``(table name, rows)`` pairs of at most ``batch_size``."""
+        for table, rows in (("users", self.users_rows()), ("sandwiches", self.sandwiches_rows()),
+                            ("resources", self.resources_rows()), ("recipes", self.recipes_rows()),
+                            ("promos", self.promos_rows())):
+            while chunk := list(itertools.islice(rows, batch_size)):
+                yield table, chunk
+        for batch in self.order_batches(batch_size):
+            for table, rows in batch.items():
+                if rows:
+                    yield table, rows
@@ -0,0 +1,86 @@
+import csv
+import os
+import tempfile
+from sqlalchemy import func, select, text
+from ..dependencies.database import Base
+
+# Parents before children; delete in the reverse order
+TABLES = ["users", "sandwiches", "resources", "recipes", "promos", "orders", "order_details", "payments", "reviews"]
+METHODS = ("insert", "load-data")
+
+
+def next_ids(connection):
+    """First free id per table, so generated rows can be appended to existing data."""
+    return {
+        name: (connection.scalar(select(func.max(Base.metadata.tables[name].c.id))) or 0) + 1
+        for name in TABLES
+    }
+
+
+def truncate(connection):
+    for name in reversed(TABLES):
+        connection.execute(Base.metadata.tables[name].delete())
+
+
+def _columns(table, rows):
+    unknown = set(rows[0]) - set(table.c.keys())
+    if unknown:
+        raise ValueError(f"{table.name} has no column(s) {', '.join(sorted(unknown))}")
+    return [column.name for column in table.c if column.name in rows[0]]
+
+
+def insert_rows(connection, table, rows):
+    # executemany; SQLAlchemy batches this into multi-row INSERT ... VALUES statements
+    connection.execute(table.insert(), rows)
+
+
+def load_data_rows(connection, table, rows):
+    """Bulk load through MySQL's LOAD DATA LOCAL INFILE (needs ``local_infile`` on client and server)."""
+    columns = _columns(table, rows)
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    try:
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            for row in rows:
+                writer.writerow([r"\N" if row[name] is None else row[name] for name in columns])
+        connection.execute(
+            text(
+                f"LOAD DATA LOCAL INFILE :path INTO TABLE `{table.name}` CHARACTER SET utf8mb4 "
+                "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' LINES TERMINATED BY '\\n' "
+                f"({', '.join(f'`{name}`' for name in columns)})"
+            ),
+            {"path": path},
+        )
+    finally:
+        os.remove(path)
+
+
+def load(connection, batches, method="insert", progress=None):
+    """Write ``(table name, rows)`` batches on ``connection`` and return the row count per table.
+
+    The caller owns the transaction. On MySQL, foreign key and unique checks are
+    switched off for the session while loading, as mysqldump does; the generator
+    guarantees the rows are consistent.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown load method '{method}', expected one of: {', '.join(METHODS)}")
+    mysql = connection.dialect.name == "mysql"
+    if method == "load-data" and not mysql:
+        raise ValueError("load-data is only supported on MySQL")
+    write = load_data_rows if method == "load-data" else insert_rows
+
+    if mysql:
+        connection.execute(text("SET foreign_key_checks = 0, unique_checks = 0"))
+    counts = dict.fromkeys(TABLES, 0)
+    try:
+        for name, rows in batches:
+            table = Base.metadata.tables[name]
+            _columns(table, rows)
+            write(connection, table, rows)
+            counts[name] += len(rows)
+            if progress:
+                progress(name, counts[name])
+    finally:
+        if mysql:
+            connection.execute(text("SET foreign_key_checks = 1, unique_checks = 1"))
+    return counts
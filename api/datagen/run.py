@@ -0,0 +1,78 @@
+"""Generate production-scale synthetic data and bulk load it.
+
+    python -m api.datagen.run --users 200000 --orders 2000000
+    python -m api.datagen.run --db-url sqlite:///./local.db --migrate --orders 100000
+    python -m api.datagen.run --method load-data --orders 5000000 --batch-size 50000
+
+Rows are appended after the current maximum id of each table unless --truncate
+is given. Every run is self-contained: its orders reference the users and
+sandwiches generated in the same run. Rating summaries are rebuilt afterwards,
+since the reviews are loaded without going through the reviews controller.
+"""
+import argparse
+import sys
+import time
+from alembic import command
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from ..controllers import ratings
+from ..dependencies.database import SQLALCHEMY_DATABASE_URL
+from ..models import model_loader
+from . import loader
+from .generator import Generator
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db-url", default=SQLALCHEMY_DATABASE_URL)
+    parser.add_argument("--method", choices=loader.METHODS, default="insert",
+                        help="multi-row INSERTs (any database) or LOAD DATA LOCAL INFILE (MySQL)")
+    parser.add_argument("--migrate", action="store_true", help="run 'alembic upgrade head' first")
+    parser.add_argument("--truncate", action="store_true", help="delete existing rows first")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--sandwiches", type=int, default=40)
+    parser.add_argument("--resources", type=int, default=20)
+    parser.add_argument("--promos", type=int, default=20)
+    parser.add_argument("--orders", type=int, default=10000)
+    parser.add_argument("--details-per-order", type=int, default=4)
+    parser.add_argument("--review-rate", type=float, default=0.25, help="share of delivered orders with a review")
+    parser.add_argument("--days", type=int, default=365, help="spread order dates over this many days")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.users < 1 or args.sandwiches < 1:
+        parser.error("--users and --sandwiches must be at least 1")
+
+    connect_args = {"local_infile": True} if args.method == "load-data" else {}
+    engine = create_engine(args.db_url, connect_args=connect_args)
+    started = time.perf_counter()
+
+    def progress(table, rows):
+        print(f"\r{table:<14} {rows:>12,} rows  {time.perf_counter() - started:8.1f}s", end="", file=sys.stderr)
+
+    with engine.begin() as connection:
+        if args.migrate:
+            command.upgrade(model_loader.alembic_config(connection), "head")
+        if args.truncate:
+            loader.truncate(connection)
+        generator = Generator(
+            users=args.users, sandwiches=args.sandwiches, resources=args.resources, orders=args.orders,
+            promos=args.promos, details_per_order=args.details_per_order, review_rate=args.review_rate,
+            days=args.days, seed_value=args.seed, start_ids=loader.next_ids(connection),
+        )
+        counts = loader.load(connection, generator.batches(args.batch_size), args.method, progress)
+    with Session(engine) as db:
+        ratings.rebuild(db)
+    engine.dispose()
+
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    print(file=sys.stderr)
+    for table, rows in counts.items():
+        print(f"{table:<14} {rows:>12,}")
+    print(f"{'total':<14} {total:>12,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional
+import bcrypt
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from .config import conf
+
+# bcrypt only reads the first 72 bytes; longer inputs are cut here so hashing
+# and checking always agree (bcrypt 5 raises instead of truncating)
+BCRYPT_MAX_BYTES = 72
+
+# bcrypt releases the GIL, so these threads hash in parallel with the event loop
+hash_pool = ThreadPoolExecutor(max_workers=conf.auth_hash_workers, thread_name_prefix="bcrypt")
+
+
+def _secret(password: str) -> bytes:
+    return password.encode()[:BCRYPT_MAX_BYTES]
+
+
+def _hash(password: str) -> str:
+    return bcrypt.hashpw(_secret(password), bcrypt.gensalt(conf.auth_bcrypt_rounds)).decode()
+
+
+def is_hashed(stored: str) -> bool:
+    return stored.startswith(("$2a$", "$2b$", "$2y$"))
+
+
+def _check(password: str, stored: str) -> bool:
+    if not is_hashed(stored):
+        # Rows created before passwords were hashed; login rehashes them
+        return hmac.compare_digest(password.encode(), stored.encode())
+    return bcrypt.checkpw(_secret(password), stored.encode())
+
+
+@lru_cache(maxsize=None)
+def _dummy_hash() -> str:
+    # Checked when the email is unknown so a miss costs as much as a wrong password
+    return _hash("not-a-real-password")
+
+
+def warm():
+    """Build the dummy hash now rather than on the first login for an unknown email."""
+    _dummy_hash()
+
+
+def hash_password(password: str) -> str:
+    """Hash on the bcrypt pool; for sync code paths (blocks the calling thread only)."""
+    return hash_pool.submit(_hash, password).result()
+
+
+def hash_passwords(passwords) -> list:
+    """Hash a batch across the whole pool."""
+    return list(hash_pool.map(_hash, passwords))
+
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(hash_pool, _hash, password)
+
+
+async def verify_password(password: str, stored: Optional[str]) -> bool:
+    loop = asyncio.get_running_loop()
+    if stored is None:
+        await loop.run_in_executor(hash_pool, lambda: _check(password, _dummy_hash()))
+        return False
+    return await loop.run_in_executor(hash_pool, _check, password, stored)
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: str) -> str:
+    return _b64encode(hmac.new(conf.auth_secret.encode(), payload.encode(), hashlib.sha256).digest())
+
+
+def issue_token(user) -> str:
+    """Signed ``payload.signature`` token carrying what routes need to know about the user."""
+    claims = {
+        "sub": user.id,
+        "email": user.email,
+        "name": user.name,
+        "role": user.user_role,
+        "exp": int(time.time()) + conf.auth_token_ttl,
+    }
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+    return f"{payload}.{_sign(payload)}"
+
+
+@lru_cache(maxsize=conf.auth_token_cache_size)
+def _decode(token: str):
+    """Signature check and parse, cached per token; expiry is checked by the caller on every use."""
+    payload, _, signature = token.partition(".")
+    if not signature or not hmac.compare_digest(signature, _sign(payload)):
+        return None
+    try:
+        return json.loads(_b64decode(payload))
+    except ValueError:
+        return None
+
+
+def decode_token(token: str):
+    claims = _decode(token)
+    if claims is None or claims.get("exp", 0) < time.time():
+        return None
+    return claims
+
+
+bearer = HTTPBearer(auto_error=False)
+
+
+async def current_user(credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer)):
+    """Claims of the bearer token; no database lookup and no threadpool hop."""
+    claims = decode_token(credentials.credentials) if credentials else None
+    if claims is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return claims
+
+
+def require_role(*roles):
+    async def check(user: dict = Depends(current_user)):
+        if user["role"] not in roles:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed for this role")
+        return user
+    return check
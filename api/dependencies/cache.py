@@ -0,0 +1,189 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from .config import conf
+
+try:
+    import fcntl
+except ImportError:  # Windows: bumps are still atomic, just not serialized across workers
+    fcntl = None
+
+
+class LocalVersionStore:
+    """Per-table write counters held in this process only."""
+
+    # Other workers' writes never reach these counters
+    shared = False
+
+    def __init__(self):
+        # Counters restart at 0 in every process, so anything derived from
+        # them (ETags) must not be comparable across processes
+        self.token = uuid.uuid4().hex
+        self._versions = {}
+        self._modified = {}
+        self._lock = threading.Lock()
+
+    def get(self, table: str) -> int:
+        return self._versions.get(table, 0)
+
+    def last_modified(self, table: str):
+        return self._modified.get(table)
+
+    def bump(self, table: str):
+        with self._lock:
+            self._versions[table] = self._versions.get(table, 0) + 1
+            self._modified[table] = time.time()
+
+
+class FileVersionStore:
+    """Per-table write counters kept as small files in a shared directory.
+
+    Every uvicorn worker reads the same files, so a write handled by one worker
+    invalidates the cached entries of all the others on their next lookup.
+    """
+
+    shared = True
+
+    def __init__(self, directory: str):
+        self.token = ""
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, table: str) -> str:
+        return os.path.join(self.directory, f"{table}.version")
+
+    def get(self, table: str) -> int:
+        try:
+            with open(self._path(table)) as f:
+                return int(f.read() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def last_modified(self, table: str):
+        try:
+            return os.stat(self._path(table)).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def bump(self, table: str):
+        path = self._path(table)
+        with open(path + ".lock", "w") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            version = self.get(table) + 1
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(str(version))
+            os.replace(tmp_path, path)
+
+
+class VersionSnapshot:
+    """The table versions an in-process copy of some tables was loaded at.
+
+    Engines that keep such a copy reload the tables that are stale() and
+    mark() the versions they read before loading. A write the process applies
+    to its copy itself is absorb()ed instead, which only succeeds when it is
+    the one write since the snapshot, so nothing another worker wrote is lost.
+    With a version store that is not shared, other workers' writes never move
+    the versions, so a table also goes stale ``conf.cache_ttl`` seconds after
+    it was loaded.
+    """
+
+    def __init__(self, versions, tables):
+        self.versions = versions
+        self.tables = tuple(tables)
+        self.clear()
+
+    def clear(self):
+        self._seen = {}
+        self._loaded_at = {}
+
+    def current(self, tables=None):
+        return {table: self.versions.get(table) for table in tables or self.tables}
+
+    def stale(self, current=None):
+        """The tables whose version moved since they were marked (or that never were, or expired)."""
+        current = current or self.current()
+        expired = () if self.versions.shared else self._expired()
+        return [table for table, version in current.items()
+                if self._seen.get(table) != version or table in expired]
+
+    def _expired(self):
+        now = time.monotonic()
+        return {table for table, loaded_at in self._loaded_at.items() if now - loaded_at >= conf.cache_ttl}
+
+    def mark(self, seen):
+        self._seen.update(seen)
+        now = time.monotonic()
+        self._loaded_at.update((table, now) for table in seen)
+
+    def absorb(self, table):
+        """Move the snapshot past this process's own write to ``table``.
+
+        False when some other write to the table has not been seen, in which
+        case the caller leaves its copy alone and the next read reloads it.
+        """
+        seen = self._seen.get(table)
+        if seen is None:
+            return False
+        current = self.versions.get(table)
+        if current == seen + 1:
+            self._seen[table] = current
+            return True
+        return False
+
+
+class TTLCache:
+    """In-process read-through cache with TTL expiry and LRU eviction.
+
+    Entries are keyed on the current version of every table they were built
+    from, so bumping a table's version makes its entries unreachable at once;
+    the stale ones then age out through LRU eviction.
+    """
+
+    def __init__(self, versions, maxsize: int = 1024, ttl: float = 60, enabled: bool = True):
+        self.versions = versions
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = enabled
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_load(self, tables, key, loader):
+        if not self.enabled:
+            return loader()
+
+        full_key = (tables, tuple(self.versions.get(table) for table in tables), key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(full_key)
+            if entry and entry[0] > now:
+                self._data.move_to_end(full_key)
+                return entry[1]
+
+        value = loader()
+
+        with self._lock:
+            self._data[full_key] = (now + self.ttl, value)
+            self._data.move_to_end(full_key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def invalidate(self, *tables):
+        for table in tables:
+            self.versions.bump(table)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+if conf.cache_backend == "file":
+    versions = FileVersionStore(conf.cache_dir)
+else:
+    versions = LocalVersionStore()
+
+menu_cache = TTLCache(versions, maxsize=conf.cache_maxsize, ttl=conf.cache_ttl, enabled=conf.cache_enabled)
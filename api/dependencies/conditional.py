@@ -0,0 +1,78 @@
+import hashlib
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import HTTPException, Request, Response, status
+from .cache import versions
+from .config import conf
+
+
+def _etag(request: Request, tables) -> str:
+    parts = [versions.token, request.url.path, str(request.query_params)]
+    parts.extend(f"{table}:{versions.get(table)}" for table in tables)
+    if not versions.shared:
+        # This worker never sees writes handled by the others, so its ETags
+        # lapse every cache_ttl seconds, the same bound as the menu cache
+        parts.append(f"ttl:{int(time.time() // conf.cache_ttl)}")
+    return '"' + hashlib.blake2b("|".join(parts).encode(), digest_size=12).hexdigest() + '"'
+
+
+def _last_modified(tables):
+    if not versions.shared:
+        # A date from this worker's counters alone could predate another worker's write
+        return None
+    stamps = [versions.last_modified(table) for table in tables]
+    if not stamps or None in stamps:
+        return None
+    newest = max(stamps)
+    # HTTP dates have one-second resolution. Only advertise a date once its
+    # second is over, so a later write can never share it.
+    if time.time() - newest < 1:
+        return None
+    return int(newest)
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _not_modified_since(if_modified_since: str, last_modified) -> bool:
+    if last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return last_modified <= since
+
+
+def conditional(*tables):
+    """Build a dependency that answers 304 Not Modified for unchanged reads.
+
+    The ETag is derived from the request URL and the write counters of the
+    tables the response is built from, which the controllers bump on every
+    write. A matching ``If-None-Match`` therefore short-circuits before the
+    database session is opened or the body is serialized. With the local
+    version store only ETags are sent, and they also change every
+    ``conf.cache_ttl`` seconds; configure the shared "file" store to have
+    them stay valid until a write and to send Last-Modified.
+    """
+    def check(request: Request, response: Response):
+        etag = _etag(request, tables)
+        last_modified = _last_modified(tables)
+        headers = {"ETag": etag}
+        if last_modified is not None:
+            headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+
+        if_none_match = request.headers.get("if-none-match")
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_none_match is not None:
+            not_modified = _matches(if_none_match, etag)
+        else:
+            not_modified = if_modified_since is not None and _not_modified_since(if_modified_since, last_modified)
+        if not_modified:
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        response.headers.update(headers)
+
+    return check
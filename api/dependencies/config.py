@@ -4,4 +4,109 @@ class conf:
     db_user = "root"
     db_password = "rootroot"
     db_host = "localhost"
-    app_port = 8000
\ No newline at end of file
+    app_port = 8000
+
+    # Largest array accepted by the /bulk endpoints
+    bulk_max_items = 5000
+
+    # Connection pool. Size it so that pool_size + max_overflow per worker,
+    # times the number of uvicorn workers, stays under MySQL's max_connections.
+    db_pool_size = 5
+    db_max_overflow = 10
+    db_pool_timeout = 30  # seconds to wait for a connection before failing
+    db_pool_recycle = 3600  # seconds; keep below MySQL's wait_timeout
+    db_pool_pre_ping = True
+
+    # Read replicas for GET routes, e.g. ["mysql+pymysql://reader:pw@replica-1:3306/sandwich_maker_api"].
+    # Replicas further behind than db_replica_max_lag seconds are skipped, and
+    # tables written within that window are read from the primary so a client
+    # sees its own writes. Lag is re-checked every db_replica_check_interval seconds.
+    db_replica_urls = []
+    db_replica_max_lag = 5
+    db_replica_check_interval = 5
+
+    # Read-through cache for menu data (sandwiches, recipes, resources, promos).
+    # The same per-table write counters also produce the ETags of every GET,
+    # refresh the promo index, the sandwich availability engine and the search
+    # index, and send recent writers' tables to the primary instead of a
+    # replica. Use the "file" backend when running several uvicorn workers:
+    # with "local", a worker only learns of its own writes, so its ETags, menu
+    # cache entries, promo index, availability engine and search index lag up
+    # to cache_ttl seconds behind a write elsewhere, Last-Modified is not sent,
+    # and replica read-your-writes only follow writes made in the same worker.
+    cache_enabled = True
+    cache_ttl = 60  # seconds
+    cache_maxsize = 1024  # entries
+    cache_backend = "local"  # "local" or "file"
+    cache_dir = "/tmp/sandwich_maker_cache"
+
+    # Debug mode adds X-Query-Count / X-Query-Time-Ms / X-Query-Duplicates
+    # headers to every response and logs statements repeated at least
+    # n_plus_one_threshold times within one request.
+    debug = False
+    n_plus_one_threshold = 5
+
+    # Serve list endpoints by reading rows straight into orjson instead of
+    # validating every row through the Pydantic response_model.
+    fast_json = False
+
+    # Prometheus metrics served at /metrics. With several uvicorn workers, point
+    # metrics_multiproc_dir at an empty directory shared by the workers (it is
+    # exported as PROMETHEUS_MULTIPROC_DIR) so every worker's samples are merged.
+    metrics_enabled = True
+    metrics_multiproc_dir = None
+
+    # Authentication. Tokens are HMAC-signed with auth_secret, which must be the
+    # same in every worker and changed for any real deployment.
+    auth_secret = "change-me-in-production"
+    auth_token_ttl = 12 * 3600  # seconds
+    auth_token_cache_size = 4096  # verified tokens kept in memory per worker
+    auth_bcrypt_rounds = 12
+    # bcrypt runs in its own small pool so a burst of logins cannot occupy the
+    # threadpool that serves every sync route
+    auth_hash_workers = 4
+
+    # Order create/update/delete events pushed at /orders/stream. The "local"
+    # backend only reaches clients connected to the worker that made the write;
+    # "redis" relays every event through events_channel on events_redis_url.
+    events_backend = "local"  # "local" or "redis"
+    events_redis_url = "redis://localhost:6379/0"
+    events_channel = "sandwich_maker:orders"
+    events_queue_size = 256  # events held per slow client before it is told to resync
+    events_heartbeat = 15  # seconds
+
+    # Kitchen scheduler behind /kitchen. Open orders are served oldest first,
+    # each sandwich in an order counting as kitchen_item_weight seconds less
+    # waiting so small orders can slip ahead. Identical sandwiches from queued
+    # orders are made together, up to kitchen_batch_size per batch.
+    kitchen_stations = 4
+    kitchen_batch_size = 6
+    kitchen_batch_seconds = 60  # setup time of a batch
+    kitchen_item_seconds = 20  # per sandwich in a batch
+    kitchen_item_weight = 30  # seconds
+    kitchen_replan_interval = 10  # seconds a schedule is reused while no order changes
+    kitchen_replan_min_interval = 1  # seconds a schedule is reused even when orders change
+
+    # /search over sandwich names, review comments and order descriptions.
+    # A query word of at least search_min_prefix characters also matches
+    # longer words starting with it, up to search_max_expansions of them.
+    search_min_prefix = 2
+    search_max_expansions = 50
+
+    # Apply pending Alembic migrations at startup instead of refusing to start
+    db_auto_migrate = False
+
+    # Startup pipeline. A worker answers /health/ready only after checking the
+    # schema, filling the connection pool and running every hot read once, so
+    # its first real request is served warm. Failed phases are retried after
+    # startup_retry_initial seconds, doubling up to startup_retry_max.
+    startup_warm_connections = 5  # capped at db_pool_size
+    startup_warm_reads = True
+    startup_retry_initial = 0.5
+    startup_retry_max = 10
+
+    # Opt-in async database layer. When enabled, GET routes are served by
+    # async handlers on an AsyncSession instead of the sync threadpool.
+    db_async = False
+    db_async_driver = "aiomysql"  # or "asyncmy"
+    db_async_url = None  # full URL override, e.g. "sqlite+aiosqlite:///./local.db"
@@ -1,16 +1,45 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from .config import conf
+from .pool_metrics import InstrumentedQueuePool, instrument
 from urllib.parse import quote_plus
 
 SQLALCHEMY_DATABASE_URL = f"mysql+pymysql://{conf.db_user}:{quote_plus(conf.db_password)}@{conf.db_host}:{conf.db_port}/{conf.db_name}?charset=utf8mb4"
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL
+    SQLALCHEMY_DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    pool_size=conf.db_pool_size,
+    max_overflow=conf.db_max_overflow,
+    pool_timeout=conf.db_pool_timeout,
+    pool_recycle=conf.db_pool_recycle,
+    pool_pre_ping=conf.db_pool_pre_ping,
 )
+instrument(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+async_engine = None
+AsyncSessionLocal = None
+
+if conf.db_async:
+    # Imported lazily so the async drivers are only needed when the mode is enabled
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    ASYNC_SQLALCHEMY_DATABASE_URL = conf.db_async_url or (
+        f"mysql+{conf.db_async_driver}://{conf.db_user}:{quote_plus(conf.db_password)}"
+        f"@{conf.db_host}:{conf.db_port}/{conf.db_name}?charset=utf8mb4"
+    )
+    async_engine = create_async_engine(
+        ASYNC_SQLALCHEMY_DATABASE_URL,
+        pool_size=conf.db_pool_size,
+        max_overflow=conf.db_max_overflow,
+        pool_timeout=conf.db_pool_timeout,
+        pool_recycle=conf.db_pool_recycle,
+        pool_pre_ping=conf.db_pool_pre_ping,
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 def get_db():
     db = SessionLocal()
@@ -18,3 +47,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
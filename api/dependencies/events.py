@@ -0,0 +1,160 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from fastapi.encoders import jsonable_encoder
+from .config import conf
+
+logger = logging.getLogger(__name__)
+
+RESYNC = {"type": "resync"}
+
+
+class Subscription:
+    """Events for one connected client, queued on the event loop that reads them.
+
+    A client too slow to keep up loses the queued events and is sent a single
+    ``resync`` event instead, telling it to reload what it shows.
+    """
+
+    def __init__(self, matches, maxsize: int):
+        self.matches = matches
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def deliver(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout: float):
+        """The next event, or None after ``timeout`` seconds without one."""
+        if self.overflowed:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.overflowed = False
+            return RESYNC
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LocalBroker:
+    """Fans events out to the subscribers connected to this process.
+
+    ``publish`` is called from sync routes running in the threadpool, so each
+    event is handed to its subscriber's event loop with call_soon_threadsafe.
+    """
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def listening(self) -> bool:
+        """Whether a published event can reach anyone; lets publishers skip building it."""
+        return bool(self._subscribers)
+
+    def subscribe(self, matches=lambda event: True) -> Subscription:
+        subscription = Subscription(matches, conf.events_queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event):
+        self._fan_out(jsonable_encoder(event))
+
+    def _fan_out(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            if not subscription.matches(event):
+                continue
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # Its event loop has closed without unsubscribing
+                self.unsubscribe(subscription)
+
+
+class RedisBroker(LocalBroker):
+    """Relays events through a Redis channel so subscribers on every worker receive them.
+
+    Each worker publishes to the channel and runs one listener thread that
+    passes what it hears to its local subscribers.
+    """
+
+    def __init__(self, url: str, channel: str):
+        super().__init__()
+        # Imported lazily so redis is only needed when this backend is enabled
+        import redis
+        self.redis = redis
+        self.client = redis.Redis.from_url(url)
+        self.channel = channel
+        self._listener = None
+
+    def listening(self) -> bool:
+        # Subscribers on other workers are invisible from here
+        return True
+
+    def subscribe(self, matches=lambda event: True) -> Subscription:
+        subscription = super().subscribe(matches)
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name="order-events", daemon=True)
+                self._listener.start()
+        return subscription
+
+    def publish(self, event):
+        event = jsonable_encoder(event)
+        try:
+            self.client.publish(self.channel, json.dumps(event))
+        except self.redis.RedisError as e:
+            # The write has been committed; reach at least this worker's clients
+            logger.warning("Could not publish order event to Redis: %s", e)
+            self._fan_out(event)
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    self._fan_out(json.loads(message["data"]))
+            except self.redis.RedisError as e:
+                logger.warning("Order event listener lost Redis, retrying: %s", e)
+                time.sleep(1)
+
+
+def sse_frame(event) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def sse(broker: LocalBroker, matches, heartbeat: float):
+    """Server-Sent Events for the matching events, with a comment line every ``heartbeat`` idle seconds.
+
+    Starlette cancels the generator when the client disconnects, which is what
+    removes the subscription.
+    """
+    subscription = broker.subscribe(matches)
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            event = await subscription.get(heartbeat)
+            # Heartbeats keep proxies from closing an idle stream
+            yield ": ping\n\n" if event is None else sse_frame(event)
+    finally:
+        broker.unsubscribe(subscription)
+
+
+if conf.events_backend == "redis":
+    broker = RedisBroker(conf.events_redis_url, conf.events_channel)
+else:
+    broker = LocalBroker()
@@ -0,0 +1,95 @@
+import os
+import time
+from . import query_stats
+from .config import conf
+
+if conf.metrics_multiproc_dir:
+    # prometheus_client picks its storage backend at import time
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", conf.metrics_multiproc_dir)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+# Requests that match no route share one label so scanners cannot blow up the series count
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time from receiving a request to sending the last body chunk",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+REQUESTS = Counter("http_requests", "Requests handled, by response status", ["method", "route", "status"])
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests currently being handled", ["method"], multiprocess_mode="livesum",
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Response body size", ["method", "route"], buckets=SIZE_BUCKETS,
+)
+DB_TIME = Histogram(
+    "http_request_db_seconds", "Time spent executing SQL while handling a request",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+STARTUP_PHASE = Gauge(
+    "app_startup_phase_seconds", "Time the last worker start spent in each startup phase", ["phase"],
+    multiprocess_mode="max",
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status, size and DB time per route template.
+
+    DB time comes from the QueryStats installed by QueryStatsMiddleware, which
+    must wrap this one.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method = scope["method"]
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        IN_FLIGHT.labels(method).inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.labels(method).dec()
+            route = scope.get("route")
+            route = getattr(route, "path", UNMATCHED_ROUTE)
+            REQUEST_LATENCY.labels(method, route).observe(elapsed)
+            REQUESTS.labels(method, route, str(status)).inc()
+            RESPONSE_SIZE.labels(method, route).observe(size)
+            stats = query_stats.current()
+            DB_TIME.labels(method, route).observe(stats.seconds if stats else 0.0)
+
+
+def render():
+    """Exposition text for every worker when running multiprocess, else for this process."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid=None):
+    """Drop this worker's live gauges from the shared directory when it exits."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid or os.getpid())
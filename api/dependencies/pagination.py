@@ -0,0 +1,120 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import and_, or_
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+class PageParams:
+    """Query parameters shared by every list endpoint.
+
+    ``sort`` names a column, prefixed with ``-`` for descending order.
+    ``cursor`` is the opaque ``next_cursor`` returned by the previous page.
+    """
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+        cursor: Optional[str] = None,
+        sort: str = "id",
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.sort = sort
+
+
+def encode_cursor(sort: str, value, last_id: int) -> str:
+    payload = json.dumps([sort, value, last_id], default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str, sort: str, column):
+    try:
+        cursor_sort, value, last_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    if cursor_sort != sort:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor does not match sort")
+
+    if column is None:
+        # Not a column sort; the caller checks the value
+        return value, last_id
+    python_type = column.type.python_type
+    if python_type is datetime:
+        value = datetime.fromisoformat(value)
+    elif python_type is Decimal:
+        value = Decimal(value)
+    return value, last_id
+
+
+def _sort_key(params: PageParams, sort_keys):
+    descending = params.sort.startswith("-")
+    key = params.sort.lstrip("-")
+    if key not in sort_keys:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot sort by '{key}', expected one of: {', '.join(sort_keys)}"
+        )
+    return key, descending
+
+
+def keyset(query, model, params: PageParams, sort_keys=("id",)):
+    """Apply the cursor filter, ordering and ``limit + 1`` to a Query or a select()."""
+    key, descending = _sort_key(params, sort_keys)
+    pk = model.id
+    column = getattr(model, key)
+
+    if params.cursor:
+        value, last_id = decode_cursor(params.cursor, params.sort, column)
+        if key == "id":
+            query = query.filter(pk < last_id if descending else pk > last_id)
+        elif descending:
+            query = query.filter(or_(column < value, and_(column == value, pk < last_id)))
+        else:
+            query = query.filter(or_(column > value, and_(column == value, pk > last_id)))
+
+    if key == "id":
+        ordering = [pk.desc() if descending else pk.asc()]
+    elif descending:
+        ordering = [column.desc(), pk.desc()]
+    else:
+        ordering = [column.asc(), pk.asc()]
+
+    return query.order_by(*ordering).limit(params.limit + 1)
+
+
+def next_page(rows, params: PageParams):
+    """Trim the look-ahead row fetched by keyset() and build the cursor for the next page."""
+    rows = list(rows)
+    next_cursor = None
+    if len(rows) > params.limit:
+        rows = rows[:params.limit]
+        last = rows[-1]
+        key = params.sort.lstrip("-")
+        next_cursor = encode_cursor(params.sort, getattr(last, key), last.id)
+    return rows, next_cursor
+
+
+def paginate(query, model, params: PageParams, sort_keys=("id",)):
+    """Apply keyset pagination on ``(sort column, id)`` and return ``(rows, next_cursor)``."""
+    rows = keyset(query, model, params, sort_keys).all()
+    return next_page(rows, params)
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+
+def filter_date_range(query, column, start_date: Optional[datetime], end_date: Optional[datetime]):
+    if start_date:
+        query = query.filter(column >= start_date)
+    if end_date:
+        query = query.filter(column < end_date)
+    return query
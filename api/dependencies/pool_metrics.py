@@ -0,0 +1,103 @@
+import bisect
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds, in seconds, of the checkout wait-time histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Thread-safe fixed-bucket histogram (cumulative counts, Prometheus style)."""
+
+    def __init__(self, buckets=WAIT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self):
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+        return {"buckets": buckets, "count": cumulative, "sum": total}
+
+
+class PoolStats:
+    def __init__(self):
+        self.wait_time = Histogram()
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waits for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self):
+        new_pool = super().recreate()
+        new_pool.stats = self.stats
+        return new_pool
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            self.stats.increment("timeouts")
+            raise
+        finally:
+            self.stats.wait_time.observe(time.perf_counter() - start)
+
+
+def instrument(engine):
+    """Count new DBAPI connections and invalidations on an engine built with InstrumentedQueuePool."""
+    stats = engine.pool.stats
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        stats.increment("connects")
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        stats.increment("invalidations")
+
+    @event.listens_for(engine, "soft_invalidate")
+    def on_soft_invalidate(dbapi_connection, connection_record, exception):
+        stats.increment("invalidations")
+
+
+def snapshot(pool):
+    stats = pool.stats
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "connects": stats.connects,
+        "invalidations": stats.invalidations,
+        "timeouts": stats.timeouts,
+        "wait_time": stats.wait_time.snapshot(),
+    }
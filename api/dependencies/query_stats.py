@@ -0,0 +1,122 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .config import conf
+
+logger = logging.getLogger(__name__)
+
+# "IN (?, ?, ?)" and multi-row "VALUES (...), (...)" differ only in how many rows they carry
+_PLACEHOLDER_RUN = re.compile(r"(\?|%s|%\(\w+\)s|:\w+)(\s*,\s*(\?|%s|%\(\w+\)s|:\w+))*")
+_VALUES_RUN = re.compile(r"(VALUES\s*\([^()]*\))(\s*,\s*\([^()]*\))+", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+_current = ContextVar("query_stats", default=None)
+_recorders = []
+
+
+def shape(statement: str) -> str:
+    """Normalize a statement so queries differing only in bound values or list lengths compare equal."""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _VALUES_RUN.sub(r"\1", statement)
+    return _PLACEHOLDER_RUN.sub("?", statement)
+
+
+class QueryStats:
+    """SQL executed while handling one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+
+    @property
+    def duplicates(self):
+        """Statements that repeated an earlier shape; N+1 loads show up here."""
+        return sum(count - 1 for count in self.shapes.values())
+
+    def repeated(self, threshold):
+        return [(statement, count) for statement, count in self.shapes.most_common() if count >= threshold]
+
+
+def current():
+    return _current.get()
+
+
+@contextmanager
+def track():
+    """Collect statistics for the SQL run inside the block (and in threads started from its context)."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def record():
+    """Collect ``(method, route, QueryStats)`` for every request served inside the block; used by the tests."""
+    requests = []
+    _recorders.append(requests)
+    try:
+        yield requests
+    finally:
+        _recorders.remove(requests)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = conn.info.get("query_started")
+    if stats is None or not started:
+        return
+    stats.seconds += time.perf_counter() - started.pop()
+    stats.count += 1
+    stats.shapes[shape(statement)] += 1
+
+
+class QueryStatsMiddleware:
+    """Tracks the SQL run by each request.
+
+    With ``conf.debug`` on, responses carry ``X-Query-Count``, ``X-Query-Time-Ms``
+    and ``X-Query-Duplicates``, and statements repeated ``conf.n_plus_one_threshold``
+    times or more in one request are logged as likely N+1 loads.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        with track() as stats:
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start" and conf.debug:
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [
+                        (b"x-query-count", str(stats.count).encode()),
+                        (b"x-query-time-ms", f"{stats.seconds * 1000:.2f}".encode()),
+                        (b"x-query-duplicates", str(stats.duplicates).encode()),
+                    ]
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+        route = getattr(scope.get("route"), "path", None)
+        for requests in _recorders:
+            requests.append((scope["method"], route, stats))
+        if conf.debug:
+            for statement, count in stats.repeated(conf.n_plus_one_threshold):
+                logger.warning("Possible N+1 on %s %s: %d x %s", scope["method"], route, count, statement)
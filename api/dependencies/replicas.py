@@ -0,0 +1,115 @@
+import itertools
+import logging
+import threading
+import time
+from fastapi import Depends
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+from .cache import versions
+from .config import conf
+from .database import get_db
+
+logger = logging.getLogger(__name__)
+
+
+def replication_lag(connection):
+    """Seconds the replica is behind its source, or None when replication is broken."""
+    if connection.dialect.name != "mysql":
+        # Nothing to ask (SQLite stand-ins in tests); reachable counts as caught up
+        connection.execute(text("SELECT 1"))
+        return 0
+    try:
+        row = connection.execute(text("SHOW REPLICA STATUS")).mappings().first()
+    except SQLAlchemyError:
+        # MySQL before 8.0.22 only knows the old names
+        connection.rollback()
+        row = connection.execute(text("SHOW SLAVE STATUS")).mappings().first()
+    if row is None:
+        return 0  # not configured as a replica: it is a copy that cannot lag
+    return row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+
+
+class Replica:
+    def __init__(self, url, lag_probe=replication_lag):
+        self.url = url
+        self.engine = create_engine(
+            url,
+            pool_size=conf.db_pool_size,
+            max_overflow=conf.db_max_overflow,
+            pool_timeout=conf.db_pool_timeout,
+            pool_recycle=conf.db_pool_recycle,
+            pool_pre_ping=conf.db_pool_pre_ping,
+        )
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.lag_probe = lag_probe
+        self.lag = None
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        """Whether this replica is reachable and within the allowed lag; probed at most once per interval."""
+        now = time.monotonic()
+        if now - self._checked_at >= conf.db_replica_check_interval:
+            with self._lock:
+                if now - self._checked_at >= conf.db_replica_check_interval:
+                    try:
+                        with self.engine.connect() as connection:
+                            lag = self.lag_probe(connection)
+                        if lag is None and self.lag is not None:
+                            logger.warning("Replica %s reports no replication lag (replication stopped?); "
+                                           "reads go elsewhere until it does", self.engine.url)
+                        self.lag = lag
+                    except SQLAlchemyError as e:
+                        logger.warning("Replica %s is unreachable: %s", self.engine.url, e)
+                        self.lag = None
+                    self._checked_at = now
+        return self.lag is not None and self.lag <= conf.db_replica_max_lag
+
+
+class ReplicaSet:
+    """Round-robin choice among the replicas that are up and caught up."""
+
+    def __init__(self, replicas):
+        self.replicas = list(replicas)
+        self._next = itertools.cycle(range(len(self.replicas))) if self.replicas else None
+        self._lock = threading.Lock()
+
+    def choose(self, tables):
+        """A replica to serve a read of ``tables``, or None to use the primary."""
+        if not self.replicas:
+            return None
+        now = time.time()
+        for table in tables:
+            written = versions.last_modified(table)
+            if written is not None and now - written < conf.db_replica_max_lag:
+                # Recently written: a replica might not have it yet
+                return None
+        for _ in range(len(self.replicas)):
+            with self._lock:
+                replica = self.replicas[next(self._next)]
+            if replica.available():
+                return replica
+        return None
+
+
+replica_set = ReplicaSet(Replica(url) for url in conf.db_replica_urls)
+
+
+def read_db(*tables):
+    """Session dependency for read-only routes over ``tables``: a replica when one is safe, else the primary.
+
+    The primary session from get_db is created either way, but a Session only
+    takes a connection on first use, so an unused one costs nothing.
+    """
+    def get_read_db(db: Session = Depends(get_db)):
+        replica = replica_set.choose(tables)
+        if replica is None:
+            yield db
+            return
+        session = replica.SessionLocal()
+        try:
+            yield session
+        finally:
+            session.close()
+    return get_read_db
@@ -0,0 +1,80 @@
+import typing
+from decimal import Decimal
+from functools import lru_cache
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from .config import conf
+
+
+@lru_cache(maxsize=None)
+def adapter(schema):
+    """Precompiled validator/serializer for ``list[schema]``, the same work FastAPI's response_model does."""
+    return TypeAdapter(list[schema])
+
+
+def _nested(annotation):
+    """``(schema, is_list)`` when a field holds a nested model (optionally inside Optional/list), else None."""
+    args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+    if typing.get_origin(annotation) is list and args:
+        nested = _nested(args[0])
+        return (nested[0], True) if nested else None
+    if typing.get_origin(annotation) is typing.Union and len(args) == 1:
+        return _nested(args[0])
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None
+
+
+@lru_cache(maxsize=None)
+def plan(schema):
+    """Field names of ``schema`` paired with the plan of any nested schema, computed once per schema."""
+    fields = []
+    for name, field in schema.model_fields.items():
+        nested = _nested(field.annotation)
+        default = None if field.is_required() else field.get_default(call_default_factory=True)
+        fields.append((name, default,
+                       (plan(nested[0]), nested[1]) if nested else None))
+    return tuple(fields)
+
+
+def to_dict(row, fields):
+    """Read the schema's fields straight off an ORM row, skipping Pydantic validation."""
+    result = {}
+    # Loaded ORM attributes live in __dict__; reading it directly skips the descriptor
+    loaded = row.__dict__
+    for name, default, nested in fields:
+        value = loaded[name] if name in loaded else getattr(row, name, default)
+        if nested is not None and value is not None:
+            nested_fields, many = nested
+            value = [to_dict(item, nested_fields) for item in value] if many else to_dict(value, nested_fields)
+        result[name] = value
+    return result
+
+
+def _default(value):
+    # Numeric columns come back as Decimal; the schemas declare them as float
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(schema, rows):
+    """JSON bytes for a list of ORM rows (or dicts already shaped like ``schema``)."""
+    # Imported here so orjson is only needed when conf.fast_json is on
+    import orjson
+    fields = plan(schema)
+    return orjson.dumps([row if isinstance(row, dict) else to_dict(row, fields) for row in rows], default=_default)
+
+
+def respond(schema, rows, response: Response):
+    """Serialize ``rows`` with orjson and carry over headers set on the injected ``response`` (cursor, ETag)."""
+    fast = Response(content=dumps(schema, rows), media_type="application/json")
+    fast.headers.raw.extend(response.headers.raw)
+    return fast
+
+
+def list_response(schema, rows, response: Response):
+    """What a list route returns: the rows for FastAPI's response_model path, or a prebuilt orjson response."""
+    if conf.fast_json:
+        return respond(schema, rows, response)
+    return rows
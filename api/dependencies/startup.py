@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import time
+from .config import conf
+
+logger = logging.getLogger(__name__)
+
+
+def warm_pool(engine, count):
+    """Open ``count`` connections at once and hand them back, so the pool starts full."""
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+class Startup:
+    """Run ``(name, function)`` phases once, in order, and record how long each took.
+
+    The phases run in a worker thread after the app has started, so
+    /health/live answers at once while /health/ready waits for them. A phase
+    that fails (the database is still coming up, a migration has not been
+    applied yet) is retried with backoff instead of the worker starting
+    half-initialized.
+    """
+
+    def __init__(self, phases):
+        self.phases = phases
+        self.timings = {}
+        self.ready = False
+        self.error = None
+        self.elapsed = None
+        self._task = None
+
+    def start(self):
+        # The loop keeps only a weak reference to tasks
+        self._task = asyncio.get_running_loop().create_task(self.run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def run(self):
+        started = time.perf_counter()
+        for name, phase in self.phases:
+            delay = conf.startup_retry_initial
+            while True:
+                phase_started = time.perf_counter()
+                try:
+                    await asyncio.to_thread(phase)
+                    break
+                except Exception as e:
+                    self.error = f"{name}: {e}"
+                    logger.error("Startup phase %s failed, retrying in %ss: %s", name, delay, e)
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, conf.startup_retry_max)
+            self.timings[name] = time.perf_counter() - phase_started
+            if conf.metrics_enabled:
+                from . import metrics
+                metrics.STARTUP_PHASE.labels(name).set(self.timings[name])
+        self.elapsed = time.perf_counter() - started
+        self.error = None
+        self.ready = True
+        logger.info("Ready after %.0f ms: %s", self.elapsed * 1000,
+                    ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.timings.items()))
+
+    def report(self):
+        return {
+            "ready": self.ready,
+            "error": self.error,
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.timings.items()},
+            "total_ms": round(self.elapsed * 1000, 1) if self.elapsed is not None else None,
+        }
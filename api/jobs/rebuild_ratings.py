@@ -0,0 +1,36 @@
+"""Recompute the review rating summaries and repair any that drifted.
+
+    python -m api.jobs.rebuild_ratings
+    python -m api.jobs.rebuild_ratings --db-url sqlite:///./local.db
+
+Reviews written through the bulk routes, or orders whose sandwiches changed
+after they were reviewed, can leave the summaries behind. Schedule this
+nightly, or run it after loading data outside the API.
+"""
+import argparse
+import json
+import sys
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from ..controllers import ratings
+from ..dependencies.database import SQLALCHEMY_DATABASE_URL
+from ..models import model_loader  # noqa: F401 - registers every model on Base.metadata
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db-url", default=SQLALCHEMY_DATABASE_URL)
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.db_url)
+    try:
+        with Session(engine) as db:
+            result = ratings.rebuild(db)
+    finally:
+        engine.dispose()
+    print(json.dumps(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,12 @@
 import uvicorn
 from fastapi import Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import index as indexRoute
+# Models first: controllers build eager-load options at import, which needs every mapper registered
 from .models import model_loader
+from .routers import index as indexRoute
+from .controllers import health
 from .dependencies.config import conf
-import logging
-
-logger = logging.getLogger(__name__)
+from .dependencies import query_stats
 
 app = FastAPI()
 
@@ -17,20 +17,34 @@ app.add_middleware(
     allow_credentials=False,  # Set to False when using wildcard
     allow_methods=["*"],  # Allow all methods
     allow_headers=["*"],  # Allow all headers
+    # Let the frontends read the pagination cursor and the debug query headers
+    expose_headers=["X-Next-Cursor", "X-Query-Count", "X-Query-Time-Ms", "X-Query-Duplicates"],
 )
 
+if conf.metrics_enabled:
+    from .dependencies import metrics
+    app.add_middleware(metrics.MetricsMiddleware)
+
+# Outermost, so the metrics middleware can read the per-request SQL time
+app.add_middleware(query_stats.QueryStatsMiddleware)
+
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database tables on startup."""
-    try:
-        model_loader.index()
-        logger.info("Database tables initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize database tables: {e}")
-        logger.error("Please check your database connection settings in api/dependencies/config.py")
-        # Don't raise - allow app to start even if DB isn't ready
-        # This is useful for development when DB might not be running
+    """Start the startup pipeline: schema check and warm-up in the background.
+
+    The app answers /health/live straight away and /health/ready once the
+    pipeline is through; a database that is not reachable yet is retried
+    (and logged) rather than ignored.
+    """
+    health.startup.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    health.startup.stop()
+    if conf.metrics_enabled:
+        metrics.mark_process_dead()
 
 
 indexRoute.load_routes(app)
@@ -0,0 +1,59 @@
+from logging.config import fileConfig
+
+from sqlalchemy import create_engine, pool
+
+from alembic import context
+
+from api.dependencies.database import Base, SQLALCHEMY_DATABASE_URL
+from api.models import model_loader  # noqa: F401 - registers every model on Base.metadata
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def database_url():
+    # `alembic -x url=sqlite:///local.db upgrade head` targets another database
+    return context.get_x_argument(as_dictionary=True).get("url", SQLALCHEMY_DATABASE_URL)
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL to stdout instead of running it (`alembic upgrade head --sql`)."""
+    context.configure(
+        url=database_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations on a live connection.
+
+    The app's startup check and the tests pass their own connection through
+    ``config.attributes["connection"]``; the CLI opens one from the configured URL.
+    """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    connectable = create_engine(database_url(), poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,156 @@
+"""Baseline schema: the tables create_all() used to build at startup
+
+The date columns keep the old models' server default, str(datetime.now())
+evaluated when the models were imported, so a database stamped at 0001 and
+one built by it match; 0004 replaces it with CURRENT_TIMESTAMP.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 18:47:04.405344
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# create_all() rendered the timestamp of the moment the models were imported
+FROZEN_NOW = str(datetime.now())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('promos',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('code', sa.String(length=50), nullable=False),
+    sa.Column('description', sa.String(length=200), nullable=True),
+    sa.Column('discount_type', sa.String(length=20), nullable=False),
+    sa.Column('value', sa.DECIMAL(precision=5, scale=2), nullable=False),
+    sa.Column('start_date', sa.DATETIME(), nullable=True),
+    sa.Column('end_date', sa.DATETIME(), nullable=True),
+    sa.Column('is_active', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('code')
+    )
+    op.create_index(op.f('ix_promos_id'), 'promos', ['id'], unique=False)
+    op.create_table('resources',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('item', sa.String(length=100), nullable=False),
+    sa.Column('amount', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('item')
+    )
+    op.create_index(op.f('ix_resources_amount'), 'resources', ['amount'], unique=False)
+    op.create_index(op.f('ix_resources_id'), 'resources', ['id'], unique=False)
+    op.create_table('sandwiches',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('sandwich_name', sa.String(length=100), nullable=True),
+    sa.Column('price', sa.DECIMAL(precision=4, scale=2), server_default='0.0', nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('sandwich_name')
+    )
+    op.create_index(op.f('ix_sandwiches_id'), 'sandwiches', ['id'], unique=False)
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('phone_number', sa.String(length=20), nullable=True),
+    sa.Column('address', sa.String(length=255), nullable=True),
+    sa.Column('email', sa.String(length=100), nullable=False),
+    sa.Column('password', sa.String(length=100), nullable=False),
+    sa.Column('user_role', sa.String(length=50), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_table('orders',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('customer_name', sa.String(length=500), nullable=True),
+    sa.Column('description', sa.String(length=300), nullable=True),
+    sa.Column('order_date', sa.DATETIME(), server_default=FROZEN_NOW, nullable=False),
+    sa.Column('tracking_number', sa.String(length=50), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_orders_id'), 'orders', ['id'], unique=False)
+    op.create_table('recipes',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('sandwich_id', sa.Integer(), nullable=True),
+    sa.Column('resource_id', sa.Integer(), nullable=True),
+    sa.Column('amount', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['resource_id'], ['resources.id'], ),
+    sa.ForeignKeyConstraint(['sandwich_id'], ['sandwiches.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_recipes_amount'), 'recipes', ['amount'], unique=False)
+    op.create_index(op.f('ix_recipes_id'), 'recipes', ['id'], unique=False)
+    op.create_table('order_details',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=True),
+    sa.Column('sandwich_id', sa.Integer(), nullable=True),
+    sa.Column('amount', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+    sa.ForeignKeyConstraint(['sandwich_id'], ['sandwiches.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_order_details_amount'), 'order_details', ['amount'], unique=False)
+    op.create_index(op.f('ix_order_details_id'), 'order_details', ['id'], unique=False)
+    op.create_table('payments',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.DECIMAL(precision=10, scale=2), nullable=False),
+    sa.Column('payment_method', sa.String(length=50), nullable=True),
+    sa.Column('transaction_status', sa.String(length=50), nullable=True),
+    sa.Column('payment_date', sa.DATETIME(), server_default=FROZEN_NOW, nullable=False),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_payments_id'), 'payments', ['id'], unique=False)
+    op.create_table('reviews',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=True),
+    sa.Column('rating', sa.Integer(), nullable=False),
+    sa.Column('comment', sa.String(length=500), nullable=True),
+    sa.Column('review_date', sa.DATETIME(), server_default=FROZEN_NOW, nullable=False),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_reviews_id'), 'reviews', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_reviews_id'), table_name='reviews')
+    op.drop_table('reviews')
+    op.drop_index(op.f('ix_payments_id'), table_name='payments')
+    op.drop_table('payments')
+    op.drop_index(op.f('ix_order_details_id'), table_name='order_details')
+    op.drop_index(op.f('ix_order_details_amount'), table_name='order_details')
+    op.drop_table('order_details')
+    op.drop_index(op.f('ix_recipes_id'), table_name='recipes')
+    op.drop_index(op.f('ix_recipes_amount'), table_name='recipes')
+    op.drop_table('recipes')
+    op.drop_index(op.f('ix_orders_id'), table_name='orders')
+    op.drop_table('orders')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_sandwiches_id'), table_name='sandwiches')
+    op.drop_table('sandwiches')
+    op.drop_index(op.f('ix_resources_id'), table_name='resources')
+    op.drop_index(op.f('ix_resources_amount'), table_name='resources')
+    op.drop_table('resources')
+    op.drop_index(op.f('ix_promos_id'), table_name='promos')
+    op.drop_table('promos')
@@ -0,0 +1,48 @@
+"""Hot path indexes for list filters, date ranges and the revenue/recipe joins
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 18:47:19.148907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_order_details_order_id_sandwich_id_amount', 'order_details', ['order_id', 'sandwich_id', 'amount'], unique=False)
+    op.create_index(op.f('ix_orders_order_date'), 'orders', ['order_date'], unique=False)
+    op.create_index('ix_orders_status_order_date', 'orders', ['status', 'order_date'], unique=False)
+    op.create_index(op.f('ix_orders_tracking_number'), 'orders', ['tracking_number'], unique=False)
+    op.create_index('ix_orders_user_id_order_date', 'orders', ['user_id', 'order_date'], unique=False)
+    op.create_index(op.f('ix_payments_order_id'), 'payments', ['order_id'], unique=False)
+    op.create_index(op.f('ix_payments_payment_date'), 'payments', ['payment_date'], unique=False)
+    op.create_index('ix_promos_is_active_start_date_end_date', 'promos', ['is_active', 'start_date', 'end_date'], unique=False)
+    op.create_index('ix_recipes_sandwich_id_resource_id_amount', 'recipes', ['sandwich_id', 'resource_id', 'amount'], unique=False)
+    op.create_index(op.f('ix_reviews_order_id'), 'reviews', ['order_id'], unique=False)
+    op.create_index(op.f('ix_reviews_review_date'), 'reviews', ['review_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_reviews_review_date'), table_name='reviews')
+    op.drop_index(op.f('ix_reviews_order_id'), table_name='reviews')
+    op.drop_index('ix_recipes_sandwich_id_resource_id_amount', table_name='recipes')
+    op.drop_index('ix_promos_is_active_start_date_end_date', table_name='promos')
+    op.drop_index(op.f('ix_payments_payment_date'), table_name='payments')
+    op.drop_index(op.f('ix_payments_order_id'), table_name='payments')
+    op.drop_index('ix_orders_user_id_order_date', table_name='orders')
+    op.drop_index(op.f('ix_orders_tracking_number'), table_name='orders')
+    op.drop_index('ix_orders_status_order_date', table_name='orders')
+    op.drop_index(op.f('ix_orders_order_date'), table_name='orders')
+    op.drop_index('ix_order_details_order_id_sandwich_id_amount', table_name='order_details')
@@ -0,0 +1,54 @@
+"""Rating summaries per sandwich, per user and overall, backfilled from reviews
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 19:40:12.381204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTS = (
+    "COUNT(*), SUM(r.rating), "
+    + ", ".join(f"SUM(CASE WHEN r.rating = {stars} THEN 1 ELSE 0 END)" for stars in range(1, 6))
+)
+COLUMNS = "scope, subject_id, count, total, stars_1, stars_2, stars_3, stars_4, stars_5"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('rating_summaries',
+    sa.Column('scope', sa.String(length=20), nullable=False),
+    sa.Column('subject_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('stars_1', sa.Integer(), nullable=False),
+    sa.Column('stars_2', sa.Integer(), nullable=False),
+    sa.Column('stars_3', sa.Integer(), nullable=False),
+    sa.Column('stars_4', sa.Integer(), nullable=False),
+    sa.Column('stars_5', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('scope', 'subject_id')
+    )
+    op.execute(f"INSERT INTO rating_summaries ({COLUMNS}) "
+               f"SELECT 'global', 0, {COUNTS} FROM reviews r HAVING COUNT(*) > 0")
+    op.execute(f"INSERT INTO rating_summaries ({COLUMNS}) "
+               f"SELECT 'user', r.user_id, {COUNTS} FROM reviews r GROUP BY r.user_id")
+    op.execute(f"INSERT INTO rating_summaries ({COLUMNS}) "
+               f"SELECT 'sandwich', d.sandwich_id, {COUNTS} FROM reviews r "
+               f"JOIN (SELECT DISTINCT order_id, sandwich_id FROM order_details WHERE sandwich_id IS NOT NULL) d "
+               f"ON d.order_id = r.order_id "
+               f"GROUP BY d.sandwich_id")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('rating_summaries')
@@ -0,0 +1,39 @@
+"""Default order, payment and review dates to CURRENT_TIMESTAMP
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 21:02:37.518406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DATE_COLUMNS = (("orders", "order_date"), ("payments", "payment_date"), ("reviews", "review_date"))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Until now the default was a timestamp frozen when the models were
+    # imported, so rows inserted without a date all got the same one
+    for table, column in DATE_COLUMNS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, existing_type=sa.DATETIME(), existing_nullable=False,
+                                  server_default=sa.text('CURRENT_TIMESTAMP'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The frozen timestamp cannot be recovered; leave the columns without a default
+    for table, column in DATE_COLUMNS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, existing_type=sa.DATETIME(), existing_nullable=False,
+                                  server_default=None)
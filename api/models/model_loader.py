@@ -1,9 +1,40 @@
+import os
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
 from . import orders, order_details, recipes, sandwiches, resources
-from . import user, payment, review, promo
+from . import user, payment, review, promo, rating_summary
+from ..dependencies.config import conf
 from ..dependencies.database import engine, Base
 
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic.ini")
+
+
+def alembic_config(connection=None):
+    config = Config(ALEMBIC_INI)
+    config.attributes["configure_logger"] = False
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
 
 def index():
-    # Import all models to register them with Base.metadata
-    # All models use the same Base instance from database.py
-    Base.metadata.create_all(engine)
+    # Importing the models above registers them with Base.metadata, which the
+    # migration environment compares against. The schema itself is owned by
+    # the Alembic revisions in api/migrations; startup only checks it is current.
+    config = alembic_config()
+    head = ScriptDirectory.from_config(config).get_current_head()
+    with engine.connect() as connection:
+        current = MigrationContext.configure(connection).get_current_revision()
+    if current == head:
+        return
+    if conf.db_auto_migrate:
+        with engine.begin() as connection:
+            command.upgrade(alembic_config(connection), "head")
+        return
+    raise RuntimeError(
+        f"Database schema is at revision {current or 'none'}, expected {head}. "
+        "Run 'alembic upgrade head' from the repository root "
+        "(use 'alembic stamp 0001' first on a database created by an older release)."
+    )
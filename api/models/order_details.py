@@ -1,10 +1,14 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, DECIMAL, DATETIME
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, DECIMAL, DATETIME
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..dependencies.database import Base
 
 class OrderDetail(Base):
     __tablename__ = "order_details"
+    __table_args__ = (
+        # Covers order lookups and the revenue join without touching the table
+        Index("ix_order_details_order_id_sandwich_id_amount", "order_id", "sandwich_id", "amount"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     order_id = Column(Integer, ForeignKey("orders.id"))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, DECIMAL, DATETIME
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, DECIMAL, DATETIME, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..dependencies.database import Base
@@ -6,6 +6,11 @@ from ..dependencies.database import Base
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # Leading user_id/status also serve plain lookups on those columns
+        Index("ix_orders_user_id_order_date", "user_id", "order_date"),
+        Index("ix_orders_status_order_date", "status", "order_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
 
@@ -15,9 +20,9 @@ class Order(Base):
 
     description = Column(String(300))
 
-    order_date = Column(DATETIME, nullable=False, server_default=str(datetime.now()))
+    order_date = Column(DATETIME, nullable=False, index=True, server_default=func.now())
 
-    tracking_number = Column(String(50))
+    tracking_number = Column(String(50), index=True)
     status = Column(String(50), default="Placed")
 
     order_details = relationship("OrderDetail", back_populates="orders")
@@ -1,10 +1,13 @@
-from sqlalchemy import Column, Integer, String, DECIMAL, DATETIME
+from sqlalchemy import Column, Index, Integer, String, DECIMAL, DATETIME
 from datetime import datetime
 from ..dependencies.database import Base
 
 
 class Promo(Base):
     __tablename__ = "promos"
+    __table_args__ = (
+        Index("ix_promos_is_active_start_date_end_date", "is_active", "start_date", "end_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     code = Column(String(50), unique=True, nullable=False)
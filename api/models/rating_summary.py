@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, PrimaryKeyConstraint
+from ..dependencies.database import Base
+
+
+class RatingSummary(Base):
+    """Running review totals per sandwich, per user and overall (scope "global", subject_id 0).
+
+    Kept up to date by the reviews controller; a review counts once for every
+    distinct sandwich on its order.
+    """
+    __tablename__ = "rating_summaries"
+    __table_args__ = (
+        PrimaryKeyConstraint("scope", "subject_id"),
+    )
+
+    scope = Column(String(20), nullable=False)  # "global", "sandwich" or "user"
+    subject_id = Column(Integer, nullable=False, autoincrement=False)
+    count = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=False, default=0)  # sum of ratings
+    stars_1 = Column(Integer, nullable=False, default=0)
+    stars_2 = Column(Integer, nullable=False, default=0)
+    stars_3 = Column(Integer, nullable=False, default=0)
+    stars_4 = Column(Integer, nullable=False, default=0)
+    stars_5 = Column(Integer, nullable=False, default=0)
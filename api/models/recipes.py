@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, DECIMAL, DATETIME
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, DECIMAL, DATETIME
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..dependencies.database import Base
@@ -6,6 +6,9 @@ from ..dependencies.database import Base
 
 class Recipe(Base):
     __tablename__ = "recipes"
+    __table_args__ = (
+        Index("ix_recipes_sandwich_id_resource_id_amount", "sandwich_id", "resource_id", "amount"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     sandwich_id = Column(Integer, ForeignKey("sandwiches.id"))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, DATETIME
+from sqlalchemy import Column, ForeignKey, Integer, String, DATETIME, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..dependencies.database import Base
@@ -11,11 +11,11 @@ class Review(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     # You can link a review to an order OR a specific sandwich/menu_item
-    order_id = Column(Integer, ForeignKey("orders.id"), nullable=True)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=True, index=True)
 
     rating = Column(Integer, nullable=False)  # e.g., 1 to 5
     comment = Column(String(500))
-    review_date = Column(DATETIME, nullable=False, server_default=str(datetime.now()))
+    review_date = Column(DATETIME, nullable=False, index=True, server_default=func.now())
 
     # Relationships
     user = relationship("User", back_populates="reviews")
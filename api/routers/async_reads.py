@@ -0,0 +1,136 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from ..controllers import async_reads as controller
+from ..models import orders, order_details, payment, promo, recipes, resources, user, review
+from ..schemas import orders as order_schema
+from ..schemas import order_details as order_detail_schema
+from ..schemas import payment_schema, promo_schema, review_schema, user_schema
+from ..schemas import recipes as recipe_schema
+from ..schemas import resources as resource_schema
+from ..dependencies.database import get_async_db
+from ..dependencies.conditional import conditional
+from ..dependencies.pagination import PageParams, set_next_cursor
+from ..dependencies import serialization
+
+# Async GET handlers for every resource. load_routes() registers these ahead of
+# the sync routers when conf.db_async is set, so they take over the read paths
+# while writes stay on the sync controllers. /sandwiches is left to the sync
+# router: its reads come from the menu cache and the in-memory availability
+# matrix, and its ETag covers the recipes and resources tables as well.
+
+
+def no_filters():
+    return {}
+
+
+def order_filters(
+    order_status: Optional[str] = Query(None, alias="status"),
+    user_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+):
+    return {"status": order_status, "user_id": user_id, "start_date": start_date, "end_date": end_date}
+
+
+def order_detail_filters(order_id: Optional[int] = None, sandwich_id: Optional[int] = None):
+    return {"order_id": order_id, "sandwich_id": sandwich_id}
+
+
+def payment_filters(
+    order_id: Optional[int] = None,
+    transaction_status: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+):
+    return {"order_id": order_id, "transaction_status": transaction_status,
+            "start_date": start_date, "end_date": end_date}
+
+
+def promo_filters(is_active: Optional[int] = None):
+    return {"is_active": is_active}
+
+
+def recipe_filters(sandwich_id: Optional[int] = None, resource_id: Optional[int] = None):
+    return {"sandwich_id": sandwich_id, "resource_id": resource_id}
+
+
+def review_filters(
+    user_id: Optional[int] = None,
+    order_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+):
+    return {"user_id": user_id, "order_id": order_id, "start_date": start_date, "end_date": end_date}
+
+
+def user_filters(user_role: Optional[str] = None):
+    return {"user_role": user_role}
+
+
+def build_router(prefix, tags, model, schema, tables, sort_keys=("id",), filters=no_filters, options=(),
+                 date_column=None):
+    router = APIRouter(tags=tags, prefix=prefix)
+    conditional_read = conditional(*tables)
+
+    @router.get("/", response_model=list[schema], dependencies=[Depends(conditional_read)])
+    async def read_all(
+        response: Response,
+        params: PageParams = Depends(),
+        filter_values: dict = Depends(filters),
+        db: AsyncSession = Depends(get_async_db)
+    ):
+        items, next_cursor = await controller.read_all(
+            db, model, params, sort_keys=sort_keys, options=options, date_column=date_column, **filter_values
+        )
+        set_next_cursor(response, next_cursor)
+        return serialization.list_response(schema, items, response)
+
+    # ":int" so static paths of the sync routers (/orders/export, /orders/stream) still fall through
+    @router.get("/{item_id:int}", response_model=schema, dependencies=[Depends(conditional_read)])
+    async def read_one(item_id: int, db: AsyncSession = Depends(get_async_db)):
+        return await controller.read_one(db, model, item_id, options=options)
+
+    return router
+
+
+routers = [
+    build_router(
+        "/orders", ['Orders'], orders.Order, order_schema.Order, ("orders", "order_details", "sandwiches"),
+        sort_keys=("id", "order_date"), filters=order_filters, date_column=orders.Order.order_date,
+        options=[selectinload(orders.Order.order_details).selectinload(order_details.OrderDetail.sandwich)],
+    ),
+    build_router(
+        "/orderdetails", ['Order Details'], order_details.OrderDetail, order_detail_schema.OrderDetail,
+        ("order_details", "sandwiches"),
+        sort_keys=("id", "amount"), filters=order_detail_filters,
+        options=[selectinload(order_details.OrderDetail.sandwich)],
+    ),
+    build_router(
+        "/payment", ['Payment'], payment.Payment, payment_schema.Payment, ("payments",),
+        sort_keys=("id", "payment_date", "amount"), filters=payment_filters, date_column=payment.Payment.payment_date,
+    ),
+    build_router(
+        "/promos", ['Promos'], promo.Promo, promo_schema.Promo, ("promos",),
+        sort_keys=("id", "code"), filters=promo_filters,
+    ),
+    build_router(
+        "/recipes", ['Recipes'], recipes.Recipe, recipe_schema.Recipe, ("recipes", "sandwiches", "resources"),
+        filters=recipe_filters,
+        options=[selectinload(recipes.Recipe.sandwich), selectinload(recipes.Recipe.resource)],
+    ),
+    build_router(
+        "/resources", ['Resources'], resources.Resource, resource_schema.Resource, ("resources",),
+        sort_keys=("id", "item", "amount"),
+    ),
+    build_router(
+        "/users", ['Users'], user.User, user_schema.User, ("users",),
+        sort_keys=("id", "name", "email"), filters=user_filters,
+    ),
+    build_router(
+        "/reviews", ['Reviews'], review.Review, review_schema.Review, ("reviews",),
+        sort_keys=("id", "review_date", "rating"), filters=review_filters, date_column=review.Review.review_date,
+    ),
+]
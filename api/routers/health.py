@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from ..controllers import health as controller
+from ..schemas import health_schema as schema
+from ..dependencies.database import get_db
+
+router = APIRouter(
+    tags=['Health'],
+    prefix="/health"
+)
+
+
+@router.get("/live", response_model=schema.Live)
+def live():
+    return controller.live()
+
+
+@router.get("/ready", response_model=schema.Ready)
+def ready(db: Session = Depends(get_db)):
+    return controller.ready(db)
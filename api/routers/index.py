@@ -1,7 +1,14 @@
-from . import orders, order_details, payment, promo, recipes, resources, sandwiches, users, reviews
+from . import orders, order_details, payment, promo, recipes, resources, sandwiches, users, reviews, stats, pool, kitchen, ratings, search, health
+from ..dependencies.config import conf
 
 
 def load_routes(app):
+    if conf.db_async:
+        # Registered first so the async GET handlers shadow the sync ones
+        from . import async_reads
+        for router in async_reads.routers:
+            app.include_router(router)
+
     app.include_router(orders.router)
     app.include_router(order_details.router)
     app.include_router(payment.router)
@@ -11,3 +18,13 @@ def load_routes(app):
     app.include_router(sandwiches.router)
     app.include_router(users.router)
     app.include_router(reviews.router)
+    app.include_router(stats.router)
+    app.include_router(pool.router)
+    app.include_router(kitchen.router)
+    app.include_router(ratings.router)
+    app.include_router(search.router)
+    app.include_router(health.router)
+
+    if conf.metrics_enabled:
+        from . import metrics
+        app.include_router(metrics.router)
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from ..controllers import kitchen as controller
+from ..schemas import kitchen_schema as schema
+from ..dependencies.database import get_db
+
+router = APIRouter(
+    tags=['Kitchen'],
+    prefix="/kitchen"
+)
+
+
+@router.get("/", response_model=schema.KitchenQueue)
+def read_queue(limit: int = Query(50, ge=1, le=1000), db: Session = Depends(get_db)):
+    return controller.read_queue(db, limit=limit)
+
+
+@router.get("/orders/{order_id}", response_model=schema.OrderEta)
+def read_eta(order_id: int, db: Session = Depends(get_db)):
+    return controller.read_eta(db, order_id=order_id)
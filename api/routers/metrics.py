@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Response
+from ..controllers import metrics as controller
+
+router = APIRouter(
+    tags=['Metrics'],
+    prefix="/metrics"
+)
+
+
+@router.get("", include_in_schema=False)
+def read():
+    content, media_type = controller.read()
+    return Response(content=content, media_type=media_type)
@@ -1,27 +1,59 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, FastAPI, status, Response
 from sqlalchemy.orm import Session
 from ..controllers import order_details as controller
 from ..schemas import order_details as schema
+from ..schemas import bulk_schema
 from ..dependencies.database import engine, get_db
+from ..dependencies.conditional import conditional
+from ..dependencies.replicas import read_db
+from ..dependencies.pagination import PageParams, set_next_cursor
+from ..dependencies import serialization
 
 router = APIRouter(
     tags=['Order Details'],
     prefix="/orderdetails"
 )
 
+conditional_read = conditional("order_details", "sandwiches")
+read_session = read_db("order_details", "sandwiches")
+
 
 @router.post("/", response_model=schema.OrderDetail)
 def create(request: schema.OrderDetailCreate, db: Session = Depends(get_db)):
     return controller.create(db=db, request=request)
 
 
-@router.get("/", response_model=list[schema.OrderDetail])
-def read_all(db: Session = Depends(get_db)):
-    return controller.read_all(db)
+@router.get("/", response_model=list[schema.OrderDetail], dependencies=[Depends(conditional_read)])
+def read_all(
+    response: Response,
+    params: PageParams = Depends(),
+    order_id: Optional[int] = None,
+    sandwich_id: Optional[int] = None,
+    db: Session = Depends(read_session)
+):
+    items, next_cursor = controller.read_all(db, params, order_id=order_id, sandwich_id=sandwich_id)
+    set_next_cursor(response, next_cursor)
+    return serialization.list_response(schema.OrderDetail, items, response)
+
+
+@router.post("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_create(request: list[schema.OrderDetailCreate], db: Session = Depends(get_db)):
+    return controller.bulk_create(db=db, requests=request)
+
+
+@router.put("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_update(request: list[schema.OrderDetailBulkUpdate], db: Session = Depends(get_db)):
+    return controller.bulk_update(db=db, requests=request)
+
+
+@router.delete("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_delete(request: bulk_schema.BulkDelete, db: Session = Depends(get_db)):
+    return controller.bulk_delete(db=db, ids=request.ids)
 
 
-@router.get("/{item_id}", response_model=schema.OrderDetail)
-def read_one(item_id: int, db: Session = Depends(get_db)):
+@router.get("/{item_id}", response_model=schema.OrderDetail, dependencies=[Depends(conditional_read)])
+def read_one(item_id: int, db: Session = Depends(read_session)):
     return controller.read_one(db, item_id=item_id)
 
 
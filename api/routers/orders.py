@@ -1,27 +1,84 @@
-from fastapi import APIRouter, Depends, FastAPI, status, Response
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, FastAPI, Query, status, Response
 from sqlalchemy.orm import Session
 from ..controllers import orders as controller
 from ..schemas import orders as schema
+from ..schemas import bulk_schema
 from ..dependencies.database import engine, get_db
+from ..dependencies.conditional import conditional
+from ..dependencies.replicas import read_db
+from ..dependencies.pagination import PageParams, set_next_cursor
+from ..dependencies import serialization
 
 router = APIRouter(
     tags=['Orders'],
     prefix="/orders"
 )
 
+conditional_read = conditional("orders", "order_details", "sandwiches")
+read_session = read_db("orders", "order_details", "sandwiches")
+
 
 @router.post("/", response_model=schema.Order)
 def create(request: schema.OrderCreate, db: Session = Depends(get_db)):
     return controller.create(db=db, request=request)
 
 
-@router.get("/", response_model=list[schema.Order])
-def read_all(db: Session = Depends(get_db)):
-    return controller.read_all(db)
+@router.post("/checkout", response_model=schema.Order)
+def checkout(request: schema.OrderCheckout, db: Session = Depends(get_db)):
+    return controller.checkout(db=db, request=request)
+
+
+@router.get("/", response_model=list[schema.Order], dependencies=[Depends(conditional_read)])
+def read_all(
+    response: Response,
+    params: PageParams = Depends(),
+    order_status: Optional[str] = Query(None, alias="status"),
+    user_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: Session = Depends(read_session)
+):
+    items, next_cursor = controller.read_all(
+        db, params, order_status=order_status, user_id=user_id, start_date=start_date, end_date=end_date
+    )
+    set_next_cursor(response, next_cursor)
+    return serialization.list_response(schema.Order, items, response)
+
+
+@router.get("/stream")
+async def stream(user_id: Optional[int] = None, order_id: Optional[int] = None):
+    return controller.stream(user_id=user_id, order_id=order_id)
+
+
+@router.get("/export")
+def export(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: Session = Depends(read_session)
+):
+    return controller.export(db, export_format=export_format, start_date=start_date, end_date=end_date)
+
+
+@router.post("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_create(request: list[schema.OrderCreate], db: Session = Depends(get_db)):
+    return controller.bulk_create(db=db, requests=request)
+
+
+@router.put("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_update(request: list[schema.OrderBulkUpdate], db: Session = Depends(get_db)):
+    return controller.bulk_update(db=db, requests=request)
+
+
+@router.delete("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_delete(request: bulk_schema.BulkDelete, db: Session = Depends(get_db)):
+    return controller.bulk_delete(db=db, ids=request.ids)
 
 
-@router.get("/{item_id}", response_model=schema.Order)
-def read_one(item_id: int, db: Session = Depends(get_db)):
+@router.get("/{item_id}", response_model=schema.Order, dependencies=[Depends(conditional_read)])
+def read_one(item_id: int, db: Session = Depends(read_session)):
     return controller.read_one(db, item_id=item_id)
 
 
@@ -1,27 +1,75 @@
-from fastapi import APIRouter, Depends, FastAPI, status, Response
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, FastAPI, Query, status, Response
 from sqlalchemy.orm import Session
 from ..controllers import payment as controller
 from ..schemas import payment_schema as schema
+from ..schemas import bulk_schema
 from ..dependencies.database import engine, get_db
+from ..dependencies.conditional import conditional
+from ..dependencies.replicas import read_db
+from ..dependencies.pagination import PageParams, set_next_cursor
+from ..dependencies import serialization
 
 router = APIRouter(
     tags=['Payment'],
     prefix="/payment"
 )
 
+conditional_read = conditional("payments")
+read_session = read_db("payments")
+
 
 @router.post("/", response_model=schema.Payment)
 def create(request: schema.PaymentCreate, db: Session = Depends(get_db)):
     return controller.create(db=db, request=request)
 
 
-@router.get("/", response_model=list[schema.Payment])
-def read_all(db: Session = Depends(get_db)):
-    return controller.read_all(db)
+@router.get("/", response_model=list[schema.Payment], dependencies=[Depends(conditional_read)])
+def read_all(
+    response: Response,
+    params: PageParams = Depends(),
+    order_id: Optional[int] = None,
+    transaction_status: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: Session = Depends(read_session)
+):
+    items, next_cursor = controller.read_all(
+        db, params, order_id=order_id, transaction_status=transaction_status,
+        start_date=start_date, end_date=end_date
+    )
+    set_next_cursor(response, next_cursor)
+    return serialization.list_response(schema.Payment, items, response)
+
+
+@router.get("/export")
+def export(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: Session = Depends(read_session)
+):
+    return controller.export(db, export_format=export_format, start_date=start_date, end_date=end_date)
+
+
+@router.post("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_create(request: list[schema.PaymentCreate], db: Session = Depends(get_db)):
+    return controller.bulk_create(db=db, requests=request)
+
+
+@router.put("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_update(request: list[schema.PaymentBulkUpdate], db: Session = Depends(get_db)):
+    return controller.bulk_update(db=db, requests=request)
+
+
+@router.delete("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_delete(request: bulk_schema.BulkDelete, db: Session = Depends(get_db)):
+    return controller.bulk_delete(db=db, ids=request.ids)
 
 
-@router.get("/{item_id}", response_model=schema.Payment)
-def read_one(item_id: int, db: Session = Depends(get_db)):
+@router.get("/{item_id}", response_model=schema.Payment, dependencies=[Depends(conditional_read)])
+def read_one(item_id: int, db: Session = Depends(read_session)):
     return controller.read_one(db, item_id=item_id)
 
 
@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from ..controllers import pool as controller
+from ..schemas import pool_schema as schema
+
+router = APIRouter(
+    tags=['Pool'],
+    prefix="/pool"
+)
+
+
+@router.get("/", response_model=schema.PoolStats)
+def read():
+    return controller.read()
@@ -1,27 +1,68 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, FastAPI, status, Response
 from sqlalchemy.orm import Session
 from ..controllers import promo as controller
 from ..schemas import promo_schema as schema
+from ..schemas import bulk_schema
 from ..dependencies.database import engine, get_db
+from ..dependencies.conditional import conditional
+from ..dependencies.replicas import read_db
+from ..dependencies.pagination import PageParams, set_next_cursor
+from ..dependencies import serialization
 
 router = APIRouter(
     tags=['Promos'],
     prefix="/promos"
 )
 
+conditional_read = conditional("promos")
+read_session = read_db("promos")
+
 
 @router.post("/", response_model=schema.Promo)
 def create(request: schema.PromoCreate, db: Session = Depends(get_db)):
     return controller.create(db=db, request=request)
 
 
-@router.get("/", response_model=list[schema.Promo])
-def read_all(db: Session = Depends(get_db)):
-    return controller.read_all(db)
+@router.get("/", response_model=list[schema.Promo], dependencies=[Depends(conditional_read)])
+def read_all(
+    response: Response,
+    params: PageParams = Depends(),
+    is_active: Optional[int] = None,
+    db: Session = Depends(read_session)
+):
+    items, next_cursor = controller.read_all(db, params, is_active=is_active)
+    set_next_cursor(response, next_cursor)
+    return serialization.list_response(schema.Promo, items, response)
+
+
+@router.post("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_create(request: list[schema.PromoCreate], db: Session = Depends(get_db)):
+    return controller.bulk_create(db=db, requests=request)
+
+
+@router.put("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_update(request: list[schema.PromoBulkUpdate], db: Session = Depends(get_db)):
+    return controller.bulk_update(db=db, requests=request)
+
+
+@router.delete("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_delete(request: bulk_schema.BulkDelete, db: Session = Depends(get_db)):
+    return controller.bulk_delete(db=db, ids=request.ids)
+
+
+@router.post("/validate", response_model=schema.PromoValidation)
+def validate(request: schema.PromoValidate, db: Session = Depends(get_db)):
+    return controller.validate(db=db, request=request)
+
+
+@router.post("/quote", response_model=schema.PromoQuote)
+def quote(request: schema.PromoQuoteRequest, db: Session = Depends(get_db)):
+    return controller.quote(db=db, request=request)
 
 
-@router.get("/{item_id}", response_model=schema.Promo)
-def read_one(item_id: int, db: Session = Depends(get_db)):
+@router.get("/{item_id}", response_model=schema.Promo, dependencies=[Depends(conditional_read)])
+def read_one(item_id: int, db: Session = Depends(read_session)):
     return controller.read_one(db, item_id=item_id)
 
 
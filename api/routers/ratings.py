@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from ..controllers import ratings as controller
+from ..schemas import rating_schema as schema
+from ..dependencies import auth
+from ..dependencies.database import get_db
+from ..dependencies.conditional import conditional
+from ..dependencies.replicas import read_db
+
+router = APIRouter(
+    tags=['Ratings'],
+    prefix="/ratings"
+)
+
+conditional_read = conditional("rating_summaries")
+read_session = read_db("rating_summaries")
+
+
+@router.get("/", response_model=schema.RatingSummary, dependencies=[Depends(conditional_read)])
+def read_overall(db: Session = Depends(read_session)):
+    return controller.read_one(db, "global", 0)
+
+
+@router.get("/sandwiches", response_model=list[schema.RatingSummary], dependencies=[Depends(conditional_read)])
+def read_sandwiches(db: Session = Depends(read_session)):
+    return controller.read_all(db, "sandwich")
+
+
+@router.get("/sandwiches/{sandwich_id}", response_model=schema.RatingSummary,
+            dependencies=[Depends(conditional_read)])
+def read_sandwich(sandwich_id: int, db: Session = Depends(read_session)):
+    return controller.read_one(db, "sandwich", sandwich_id)
+
+
+@router.get("/users/{user_id}", response_model=schema.RatingSummary, dependencies=[Depends(conditional_read)])
+def read_user(user_id: int, db: Session = Depends(read_session)):
+    return controller.read_one(db, "user", user_id)
+
+
+@router.post("/rebuild", response_model=schema.RebuildResult, dependencies=[Depends(auth.require_role("Admin"))])
+def rebuild(db: Session = Depends(get_db)):
+    return controller.rebuild(db)
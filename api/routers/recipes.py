@@ -1,27 +1,59 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, FastAPI, status, Response
 from sqlalchemy.orm import Session
 from ..controllers import recipes as controller
 from ..schemas import recipes as schema
+from ..schemas import bulk_schema
 from ..dependencies.database import engine, get_db
+from ..dependencies.conditional import conditional
+from ..dependencies.replicas import read_db
+from ..dependencies.pagination import PageParams, set_next_cursor
+from ..dependencies import serialization
 
 router = APIRouter(
     tags=['Recipes'],
     prefix="/recipes"
 )
 
+conditional_read = conditional("recipes", "sandwiches", "resources")
+read_session = read_db("recipes", "sandwiches", "resources")
+
 
 @router.post("/", response_model=schema.Recipe)
 def create(request: schema.RecipeCreate, db: Session = Depends(get_db)):
     return controller.create(db=db, request=request)
 
 
-@router.get("/", response_model=list[schema.Recipe])
-def read_all(db: Session = Depends(get_db)):
-    return controller.read_all(db)
+@router.get("/", response_model=list[schema.Recipe], dependencies=[Depends(conditional_read)])
+def read_all(
+    response: Response,
+    params: PageParams = Depends(),
+    sandwich_id: Optional[int] = None,
+    resource_id: Optional[int] = None,
+    db: Session = Depends(read_session)
+):
+    items, next_cursor = controller.read_all(db, params, sandwich_id=sandwich_id, resource_id=resource_id)
+    set_next_cursor(response, next_cursor)
+    return serialization.list_response(schema.Recipe, items, response)
+
+
+@router.post("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_create(request: list[schema.RecipeCreate], db: Session = Depends(get_db)):
+    return controller.bulk_create(db=db, requests=request)
+
+
+@router.put("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_update(request: list[schema.RecipeBulkUpdate], db: Session = Depends(get_db)):
+    return controller.bulk_update(db=db, requests=request)
+
+
+@router.delete("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_delete(request: bulk_schema.BulkDelete, db: Session = Depends(get_db)):
+    return controller.bulk_delete(db=db, ids=request.ids)
 
 
-@router.get("/{item_id}", response_model=schema.Recipe)
-def read_one(item_id: int, db: Session = Depends(get_db)):
+@router.get("/{item_id}", response_model=schema.Recipe, dependencies=[Depends(conditional_read)])
+def read_one(item_id: int, db: Session = Depends(read_session)):
     return controller.read_one(db, item_id=item_id)
 
 
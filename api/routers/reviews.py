@@ -1,20 +1,54 @@
+from datetime import datetime
+from typing import Optional
 from fastapi import APIRouter, Depends, FastAPI, status, Response
 from sqlalchemy.orm import Session
 from ..controllers import reviews as controller
 from ..schemas import review_schema as schema
+from ..schemas import bulk_schema
 from ..dependencies.database import engine, get_db
+from ..dependencies.conditional import conditional
+from ..dependencies.replicas import read_db
+from ..dependencies.pagination import PageParams, set_next_cursor
+from ..dependencies import serialization
 
 router = APIRouter(
     tags = ['Reviews'],
     prefix = '/reviews'
 )
 
-@router.get("/", response_model=list[schema.Review])
-def read_all(db: Session = Depends(get_db)):
-    return controller.read_all(db)
+conditional_read = conditional("reviews")
+read_session = read_db("reviews")
 
-@router.get("/{item_id}", response_model=schema.Review)
-def read_one(item_id, db: Session = Depends(get_db)):
+@router.get("/", response_model=list[schema.Review], dependencies=[Depends(conditional_read)])
+def read_all(
+    response: Response,
+    params: PageParams = Depends(),
+    user_id: Optional[int] = None,
+    order_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: Session = Depends(read_session)
+):
+    items, next_cursor = controller.read_all(
+        db, params, user_id=user_id, order_id=order_id, start_date=start_date, end_date=end_date
+    )
+    set_next_cursor(response, next_cursor)
+    return serialization.list_response(schema.Review, items, response)
+
+@router.post("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_create(request: list[schema.ReviewCreate], db: Session = Depends(get_db)):
+    return controller.bulk_create(db=db, requests=request)
+
+@router.put("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_update(request: list[schema.ReviewBulkUpdate], db: Session = Depends(get_db)):
+    return controller.bulk_update(db=db, requests=request)
+
+@router.delete("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_delete(request: bulk_schema.BulkDelete, db: Session = Depends(get_db)):
+    return controller.bulk_delete(db=db, ids=request.ids)
+
+@router.get("/{item_id}", response_model=schema.Review, dependencies=[Depends(conditional_read)])
+def read_one(item_id, db: Session = Depends(read_session)):
     return controller.read_one(db, item_id=item_id)
 
 @router.post("/", response_model=schema.Review)
@@ -2,26 +2,58 @@ from fastapi import APIRouter, Depends, FastAPI, status, Response
 from sqlalchemy.orm import Session
 from ..controllers import sandwiches as controller
 from ..schemas import sandwiches as schema
+from ..schemas import bulk_schema
 from ..dependencies.database import engine, get_db
+from ..dependencies.conditional import conditional
+from ..dependencies.replicas import read_db
+from ..dependencies.pagination import PageParams, set_next_cursor
+from ..dependencies import serialization
 
 router = APIRouter(
     tags=['Sandwiches'],
     prefix="/sandwiches"
 )
 
+# Responses carry availability, which moves with recipes and stock, and the review summary
+conditional_read = conditional("sandwiches", "recipes", "resources", "rating_summaries")
+read_session = read_db("sandwiches", "recipes", "resources", "rating_summaries")
+
 
 @router.post("/", response_model=schema.Sandwich)
 def create(request: schema.SandwichCreate, db: Session = Depends(get_db)):
     return controller.create(db=db, request=request)
 
 
-@router.get("/", response_model=list[schema.Sandwich])
-def read_all(db: Session = Depends(get_db)):
-    return controller.read_all(db)
+@router.get("/", response_model=list[schema.Sandwich], dependencies=[Depends(conditional_read)])
+def read_all(response: Response, params: PageParams = Depends(), db: Session = Depends(read_session)):
+    items, next_cursor = controller.read_all(db, params)
+    set_next_cursor(response, next_cursor)
+    return serialization.list_response(schema.Sandwich, items, response)
+
+
+@router.get("/availability", response_model=list[schema.SandwichAvailability],
+            dependencies=[Depends(conditional_read)])
+def read_availability(db: Session = Depends(read_session)):
+    return controller.read_availability(db)
+
+
+@router.post("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_create(request: list[schema.SandwichCreate], db: Session = Depends(get_db)):
+    return controller.bulk_create(db=db, requests=request)
+
+
+@router.put("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_update(request: list[schema.SandwichBulkUpdate], db: Session = Depends(get_db)):
+    return controller.bulk_update(db=db, requests=request)
+
+
+@router.delete("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_delete(request: bulk_schema.BulkDelete, db: Session = Depends(get_db)):
+    return controller.bulk_delete(db=db, ids=request.ids)
 
 
-@router.get("/{item_id}", response_model=schema.Sandwich)
-def read_one(item_id: int, db: Session = Depends(get_db)):
+@router.get("/{item_id}", response_model=schema.Sandwich, dependencies=[Depends(conditional_read)])
+def read_one(item_id: int, db: Session = Depends(read_session)):
     return controller.read_one(db, item_id=item_id)
 
 
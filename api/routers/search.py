@@ -0,0 +1,30 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.orm import Session
+from ..controllers import search as controller
+from ..schemas import search_schema as schema
+from ..dependencies.conditional import conditional
+from ..dependencies.replicas import read_db
+from ..dependencies.pagination import set_next_cursor
+
+router = APIRouter(
+    tags=['Search'],
+    prefix="/search"
+)
+
+conditional_read = conditional("sandwiches", "reviews", "orders")
+read_session = read_db("sandwiches", "reviews", "orders")
+
+
+@router.get("/", response_model=list[schema.SearchHit], dependencies=[Depends(conditional_read)])
+def read(
+    response: Response,
+    q: str = Query(min_length=1, max_length=200),
+    kind: Optional[Literal["sandwich", "review", "order"]] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(read_session)
+):
+    hits, next_cursor = controller.read(db, q, kind=kind, limit=limit, cursor=cursor)
+    set_next_cursor(response, next_cursor)
+    return hits
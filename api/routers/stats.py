@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from ..controllers import stats as controller
+from ..schemas import stats_schema as schema
+from ..dependencies.conditional import conditional
+from ..dependencies.replicas import read_db
+
+router = APIRouter(
+    tags=['Stats'],
+    prefix="/stats"
+)
+
+conditional_read = conditional("orders", "order_details", "sandwiches", "reviews", "rating_summaries")
+read_session = read_db("orders", "order_details", "sandwiches", "reviews", "rating_summaries")
+
+
+@router.get("/", response_model=schema.Stats, dependencies=[Depends(conditional_read)])
+def read(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    bucket: Optional[Literal["day", "week", "month"]] = None,
+    db: Session = Depends(read_session)
+):
+    return controller.read(db, start_date=start_date, end_date=end_date, bucket=bucket)
@@ -1,20 +1,56 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, FastAPI, status, Response
 from sqlalchemy.orm import Session
 from ..controllers import user as controller
 from ..schemas import user_schema as schema
+from ..schemas import bulk_schema
 from ..dependencies.database import engine, get_db
+from ..dependencies.conditional import conditional
+from ..dependencies.replicas import read_db
+from ..dependencies.pagination import PageParams, set_next_cursor
+from ..dependencies import auth, serialization
 
 router = APIRouter(
     tags = ['Users'],
     prefix = '/users'
 )
 
-@router.get("/", response_model=list[schema.User])
-def read_all(db: Session = Depends(get_db)):
-    return controller.read_all(db)
+conditional_read = conditional("users")
+read_session = read_db("users")
 
-@router.get("/{item_id}", response_model=schema.User)
-def read_one(item_id, db: Session = Depends(get_db)):
+@router.get("/", response_model=list[schema.User], dependencies=[Depends(conditional_read)])
+def read_all(
+    response: Response,
+    params: PageParams = Depends(),
+    user_role: Optional[str] = None,
+    db: Session = Depends(read_session)
+):
+    items, next_cursor = controller.read_all(db, params, user_role=user_role)
+    set_next_cursor(response, next_cursor)
+    return serialization.list_response(schema.User, items, response)
+
+@router.post("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_create(request: list[schema.UserCreate], db: Session = Depends(get_db)):
+    return controller.bulk_create(db=db, requests=request)
+
+@router.put("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_update(request: list[schema.UserBulkUpdate], db: Session = Depends(get_db)):
+    return controller.bulk_update(db=db, requests=request)
+
+@router.delete("/bulk", response_model=list[bulk_schema.BulkResult])
+def bulk_delete(request: bulk_schema.BulkDelete, db: Session = Depends(get_db)):
+    return controller.bulk_delete(db=db, ids=request.ids)
+
+@router.post("/login", response_model=schema.LoginResponse)
+async def login(request: schema.LoginRequest, db: Session = Depends(get_db)):
+    return await controller.login(db, email=request.email, password=request.password)
+
+@router.get("/me", response_model=schema.CurrentUser)
+async def me(user: dict = Depends(auth.current_user)):
+    return {"id": user["sub"], "email": user["email"], "name": user["name"], "role": user["role"]}
+
+@router.get("/{item_id}", response_model=schema.User, dependencies=[Depends(conditional_read)])
+def read_one(item_id, db: Session = Depends(read_session)):
     return controller.read_one(db, item_id=item_id)
 
 @router.post("/", response_model=schema.User)
@@ -0,0 +1,12 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class BulkDelete(BaseModel):
+    ids: list[int] = Field(min_length=1)
+
+
+class BulkResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    status: str  # 'created', 'updated', 'deleted' or 'not_found'
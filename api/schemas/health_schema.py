@@ -0,0 +1,14 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class Live(BaseModel):
+    status: str
+
+
+class Ready(BaseModel):
+    status: str
+    ready: bool
+    error: Optional[str] = None
+    phases_ms: dict[str, float]
+    total_ms: Optional[float] = None
@@ -0,0 +1,26 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class KitchenBatch(BaseModel):
+    station: int
+    sandwich_id: int
+    amount: int
+    order_ids: list[int]
+    start: datetime
+    finish: datetime
+
+
+class KitchenQueue(BaseModel):
+    planned_at: datetime
+    stations: int
+    open_orders: int
+    pending_batches: int
+    batches: list[KitchenBatch]
+
+
+class OrderEta(BaseModel):
+    order_id: int
+    position: int
+    ready_at: datetime
+    wait_seconds: int
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from .sandwiches import Sandwich
 
 
@@ -18,10 +18,13 @@ class OrderDetailUpdate(BaseModel):
     amount: Optional[int] = None
 
 
+class OrderDetailBulkUpdate(OrderDetailUpdate):
+    id: int
+
+
 class OrderDetail(OrderDetailBase):
     id: int
     order_id: int
     sandwich: Sandwich = None
 
-    class ConfigDict:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
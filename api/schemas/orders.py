@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 from .order_details import OrderDetail
 
 
@@ -15,16 +15,37 @@ class OrderCreate(OrderBase):
     pass
 
 
+class CheckoutItem(BaseModel):
+    sandwich_id: int
+    amount: int = Field(gt=0)
+
+
+class CheckoutPayment(BaseModel):
+    payment_method: str
+
+
+class OrderCheckout(OrderBase):
+    items: list[CheckoutItem] = Field(min_length=1)
+    payment: Optional[CheckoutPayment] = None
+    promo_codes: list[str] = Field(default_factory=list)
+
+
 class OrderUpdate(BaseModel):
     user_id: Optional[int] = None
     description: Optional[str] = None
+    status: Optional[str] = None
+    tracking_number: Optional[str] = None
+
+
+class OrderBulkUpdate(OrderUpdate):
+    id: int
 
 
 class Order(OrderBase):
     id: int
     order_date: Optional[datetime] = None
     status: Optional[str] = "Placed"
+    tracking_number: Optional[str] = None
     order_details: list[OrderDetail] = None
 
-    class ConfigDict:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -1,5 +1,5 @@
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 
 
@@ -19,10 +19,13 @@ class PaymentUpdate(BaseModel):
     transaction_status: Optional[str] = None
 
 
+class PaymentBulkUpdate(PaymentUpdate):
+    id: int
+
+
 class Payment(PaymentBase):
     id: int
     order_id: int
     payment_date: Optional[datetime] = None
 
-    class ConfigDict:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
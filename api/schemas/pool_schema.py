@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+
+class WaitTimeHistogram(BaseModel):
+    buckets: dict[str, int]
+    count: int
+    sum: float
+
+
+class PoolStats(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    connects: int
+    invalidations: int
+    timeouts: int
+    wait_time: WaitTimeHistogram
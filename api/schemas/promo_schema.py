@@ -1,6 +1,7 @@
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
+from .orders import CheckoutItem
 
 
 class PromoBase(BaseModel):
@@ -26,9 +27,52 @@ class PromoUpdate(BaseModel):
     is_active: Optional[int] = None
 
 
+class PromoBulkUpdate(PromoUpdate):
+    id: int
+
+
 class Promo(PromoBase):
     id: int
     is_active: int
 
-    class ConfigDict:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class PromoValidate(BaseModel):
+    code: str
+    subtotal: Optional[float] = Field(None, ge=0)
+
+
+class PromoValidation(BaseModel):
+    code: str
+    valid: bool
+    reason: Optional[str] = None
+    discount_type: Optional[str] = None
+    value: Optional[float] = None
+    discount: Optional[float] = None
+    total: Optional[float] = None
+
+
+class PromoQuoteRequest(BaseModel):
+    codes: list[str] = Field(default_factory=list)
+    items: list[CheckoutItem] = Field(min_length=1)
+
+
+class AppliedPromo(BaseModel):
+    promo_id: int
+    code: str
+    discount_type: str
+    value: float
+    discount: float
+
+
+class RejectedPromo(BaseModel):
+    code: str
+    reason: str
+
+
+class PromoQuote(BaseModel):
+    subtotal: float
+    discount: float
+    total: float
+    applied: list[AppliedPromo]
+    rejected: list[RejectedPromo]
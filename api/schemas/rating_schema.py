@@ -0,0 +1,15 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class RatingSummary(BaseModel):
+    scope: str
+    subject_id: int
+    count: int
+    average: Optional[float] = None
+    histogram: list[int]  # number of 1 to 5 star reviews
+
+
+class RebuildResult(BaseModel):
+    checked: int
+    fixed: int
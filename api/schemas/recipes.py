@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from .resources import Resource
 from .sandwiches import Sandwich
 
@@ -18,10 +18,13 @@ class RecipeUpdate(BaseModel):
     resource_id: Optional[int] = None
     amount: Optional[int] = None
 
+
+class RecipeBulkUpdate(RecipeUpdate):
+    id: int
+
 class Recipe(RecipeBase):
     id: int
     sandwich: Sandwich = None
     resource: Resource = None
 
-    class ConfigDict:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
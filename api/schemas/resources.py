@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class ResourceBase(BaseModel):
@@ -17,8 +17,11 @@ class ResourceUpdate(BaseModel):
     amount: Optional[int] = None
 
 
+class ResourceBulkUpdate(ResourceUpdate):
+    id: int
+
+
 class Resource(ResourceBase):
     id: int
 
-    class ConfigDict:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
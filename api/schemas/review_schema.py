@@ -1,5 +1,5 @@
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ReviewBase(BaseModel):
@@ -8,19 +8,23 @@ class ReviewBase(BaseModel):
 
 
 class ReviewCreate(ReviewBase):
+    rating: int = Field(ge=1, le=5)
     user_id: int
     order_id: int
 
 
 class ReviewUpdate(BaseModel):
-    rating: Optional[int] = None
+    rating: Optional[int] = Field(None, ge=1, le=5)
     comment: Optional[str] = None
 
 
+class ReviewBulkUpdate(ReviewUpdate):
+    id: int
+
+
 class Review(ReviewBase):
     id: int
     user_id: int
     order_id: Optional[int] = None
 
-    class ConfigDict:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class SandwichBase(BaseModel):
@@ -17,8 +17,22 @@ class SandwichUpdate(BaseModel):
     price: Optional[float] = None
 
 
+class SandwichBulkUpdate(SandwichUpdate):
+    id: int
+
+
 class Sandwich(SandwichBase):
     id: int
+    # False when the stock cannot make even one; None where not computed
+    available: Optional[bool] = None
+    # From the review summaries on reads; None where not computed or not yet reviewed
+    rating_count: Optional[int] = None
+    average_rating: Optional[float] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
 
-    class ConfigDict:
-        from_attributes = True
\ No newline at end of file
+class SandwichAvailability(BaseModel):
+    sandwich_id: int
+    available: bool
+    max_quantity: Optional[int] = None  # None: no recipe, so not limited by stock
@@ -0,0 +1,9 @@
+from typing import Literal
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    kind: Literal["sandwich", "review", "order"]
+    id: int
+    score: float
+    text: str
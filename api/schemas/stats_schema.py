@@ -0,0 +1,18 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class StatsBucket(BaseModel):
+    period: str
+    total_orders: int = 0
+    total_revenue: float = 0.0
+    total_reviews: int = 0
+    average_rating: Optional[float] = None
+
+
+class Stats(BaseModel):
+    total_orders: int
+    total_revenue: float
+    total_reviews: int
+    average_rating: Optional[float] = None
+    buckets: Optional[list[StatsBucket]] = None
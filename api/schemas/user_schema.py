@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 
 
 class UserBase(BaseModel):
@@ -23,11 +23,14 @@ class UserUpdate(BaseModel):
     role: Optional[str] = None
 
 
+class UserBulkUpdate(UserUpdate):
+    id: int
+
+
 class User(UserBase):
     id: int
 
-    class ConfigDict:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class LoginRequest(BaseModel):
@@ -36,4 +39,12 @@ class LoginRequest(BaseModel):
 
 
 class LoginResponse(User):
-    token: str
\ No newline at end of file
+    token: str
+    token_type: str = "bearer"
+
+
+class CurrentUser(BaseModel):
+    id: int
+    email: str
+    name: str
+    role: Optional[str] = None
\ No newline at end of file
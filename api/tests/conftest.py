@@ -0,0 +1,129 @@
+import pytest
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from ..controllers.availability import engine as availability
+from ..controllers.discounts import promo_index
+from ..controllers.kitchen import kitchen
+from ..controllers.search import index as search_index
+from ..dependencies import query_stats
+from ..dependencies.cache import menu_cache
+from ..dependencies.config import conf
+from ..dependencies.database import Base, get_db
+from ..models import model_loader  # noqa: F401 - registers every model on Base.metadata
+from ..main import app
+
+# Most SQL statements each read route may run. A test whose requests go over
+# fails, which is how N+1 loads in a serializer get caught.
+QUERY_BUDGETS = {
+    "GET /orders/": 2,
+    "GET /orders/{item_id}": 1,
+    "GET /orderdetails/": 1,
+    "GET /orderdetails/{item_id}": 1,
+    "GET /payment/": 1,
+    "GET /payment/{item_id}": 1,
+    "GET /promos/": 1,
+    "GET /promos/{item_id}": 1,
+    "GET /recipes/": 1,
+    "GET /recipes/{item_id}": 1,
+    "GET /resources/": 1,
+    "GET /resources/{item_id}": 1,
+    # One more when the availability matrix has to be reloaded
+    "GET /sandwiches/": 2,
+    "GET /sandwiches/{item_id}": 2,
+    "GET /sandwiches/availability": 1,
+    "GET /users/": 1,
+    "GET /users/{item_id}": 1,
+    "GET /reviews/": 1,
+    "GET /reviews/{item_id}": 1,
+    "GET /stats/": 6,
+    "GET /kitchen/": 1,
+    "GET /kitchen/orders/{order_id}": 1,
+    "GET /ratings/": 1,
+    "GET /ratings/sandwiches": 1,
+    "GET /ratings/sandwiches/{sandwich_id}": 1,
+    "GET /ratings/users/{user_id}": 1,
+    # One per column the search index has to load
+    "GET /search/": 3,
+    "GET /health/ready": 1,
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_menu_cache():
+    # Each test gets a fresh database, so entries cached by an earlier test are stale
+    menu_cache.clear()
+    promo_index.clear()
+    kitchen.clear()
+    availability.clear()
+    search_index.clear()
+    yield
+    menu_cache.clear()
+    promo_index.clear()
+    kitchen.clear()
+    availability.clear()
+    search_index.clear()
+
+
+@pytest.fixture
+def sqlite_engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(sqlite_engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=sqlite_engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def query_counter(sqlite_engine):
+    """Record every SQL statement sent to the test database."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(sqlite_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(sqlite_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def client(sqlite_engine):
+    TestingSession = sessionmaker(autocommit=False, autoflush=False, bind=sqlite_engine)
+
+    def override_get_db():
+        session = TestingSession()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    with query_stats.record() as requests:
+        yield TestClient(app)
+    app.dependency_overrides.clear()
+
+    problems = []
+    for method, route, stats in requests:
+        budget = QUERY_BUDGETS.get(f"{method} {route}")
+        if budget is not None and stats.count > budget:
+            problems.append(f"{method} {route} ran {stats.count} queries (budget {budget})")
+        if method == "GET":
+            for statement, count in stats.repeated(conf.n_plus_one_threshold):
+                problems.append(f"{method} {route} repeated {count}x: {statement}")
+    if problems:
+        pytest.fail("Query budget exceeded:\n" + "\n".join(problems))
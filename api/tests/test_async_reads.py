@@ -0,0 +1,59 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from ..dependencies.database import Base, get_async_db
+from ..models import model_loader  # noqa: F401 - registers every model on Base.metadata
+from ..models import sandwiches as sandwich_model
+from ..models import resources as resource_model
+from ..models import recipes as recipe_model
+from ..routers import async_reads
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture
+def async_client(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+    AsyncTestingSession = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def seed():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncTestingSession() as db:
+            blt = sandwich_model.Sandwich(sandwich_name="BLT", price=5.5)
+            bacon = resource_model.Resource(item="Bacon", amount=10)
+            db.add_all([blt, bacon])
+            await db.flush()
+            db.add(recipe_model.Recipe(sandwich_id=blt.id, resource_id=bacon.id, amount=2))
+            await db.commit()
+
+    async def override_get_async_db():
+        async with AsyncTestingSession() as db:
+            yield db
+
+    app = FastAPI()
+    for router in async_reads.routers:
+        app.include_router(router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+
+    with TestClient(app) as client:
+        client.portal.call(seed)
+        yield client
+        client.portal.call(engine.dispose)
+
+
+def test_async_read_all_eager_loads_relationships(async_client):
+    response = async_client.get("/recipes/")
+
+    assert response.status_code == 200
+    [recipe] = response.json()
+    assert recipe["sandwich"]["sandwich_name"] == "BLT"
+    assert recipe["resource"]["item"] == "Bacon"
+
+
+def test_async_read_one_and_missing_item(async_client):
+    assert async_client.get("/resources/1").json()["item"] == "Bacon"
+    assert async_client.get("/resources/99").status_code == 404
+    # Served by the sync router, which adds availability
+    assert async_client.get("/sandwiches/1").status_code == 404
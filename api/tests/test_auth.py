@@ -0,0 +1,84 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from ..benchmarks import login as bench
+from ..dependencies import auth
+from ..dependencies.config import conf
+from ..models import user as user_model
+
+
+@pytest.fixture(autouse=True)
+def fast_bcrypt(monkeypatch):
+    monkeypatch.setattr(conf, "auth_bcrypt_rounds", 4)
+
+
+def register(client, email="jane@example.com", password="s3cret!"):
+    return client.post("/users/", json={"name": "Jane", "email": email, "password": password})
+
+
+def test_passwords_are_stored_hashed(client, db):
+    register(client)
+
+    stored = db.query(user_model.User).one().password
+    assert auth.is_hashed(stored)
+    assert "s3cret!" not in stored
+
+
+def test_login_issues_a_token_that_me_accepts(client):
+    register(client)
+
+    response = client.post("/users/login", json={"email": "jane@example.com", "password": "s3cret!"})
+
+    assert response.status_code == 200
+    token = response.json()["token"]
+    me = client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+    assert me.json() == {"id": response.json()["id"], "email": "jane@example.com", "name": "Jane", "role": "Customer"}
+
+
+def test_login_rejects_wrong_password_and_unknown_email(client):
+    register(client)
+
+    assert client.post("/users/login", json={"email": "jane@example.com", "password": "nope"}).status_code == 401
+    assert client.post("/users/login", json={"email": "who@example.com", "password": "s3cret!"}).status_code == 401
+
+
+def test_plaintext_passwords_are_rehashed_on_login(client, db):
+    db.add(user_model.User(name="Old", email="old@example.com", password="legacy"))
+    db.commit()
+
+    assert client.post("/users/login", json={"email": "old@example.com", "password": "legacy"}).status_code == 200
+
+    db.expire_all()
+    assert auth.is_hashed(db.query(user_model.User).one().password)
+    assert client.post("/users/login", json={"email": "old@example.com", "password": "legacy"}).status_code == 200
+
+
+def test_tampered_and_expired_tokens_are_refused(client, monkeypatch):
+    user = user_model.User(id=1, name="Jane", email="jane@example.com", user_role="Customer")
+    token = auth.issue_token(user)
+    payload, signature = token.split(".")
+
+    assert client.get("/users/me", headers={"Authorization": f"Bearer {payload}x.{signature}"}).status_code == 401
+    assert client.get("/users/me").status_code == 401
+    monkeypatch.setattr(conf, "auth_token_ttl", -1)
+    expired = auth.issue_token(user)
+    assert client.get("/users/me", headers={"Authorization": f"Bearer {expired}"}).status_code == 401
+
+
+def test_require_role_checks_the_token_claims():
+    admin = auth.decode_token(auth.issue_token(user_model.User(id=1, name="A", email="a@x.com", user_role="Admin")))
+    customer = auth.decode_token(auth.issue_token(user_model.User(id=2, name="C", email="c@x.com", user_role="Customer")))
+    check = auth.require_role("Admin")
+
+    assert asyncio.run(check(admin)) == admin
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(check(customer))
+    assert excinfo.value.status_code == 403
+
+
+def test_login_benchmark_reports_throughput_and_probe_latency():
+    report = bench.run(users=3, logins=12, concurrency=4)
+
+    assert report["failures"] == 0
+    assert report["login"]["count"] == 12
+    assert report["probe_during_logins"]["count"] >= 1
@@ -0,0 +1,109 @@
+import time
+from ..controllers.availability import engine
+from ..dependencies.cache import versions
+from ..dependencies.config import conf
+from ..models import resources as resource_model
+from ..models import sandwiches as sandwich_model
+from .test_checkout import seed_menu
+
+
+def availability(client):
+    return {row["sandwich_id"]: (row["available"], row["max_quantity"])
+            for row in client.get("/sandwiches/availability").json()}
+
+
+def seed(db, bread=10, bacon=4):
+    user, blt = seed_menu(db, bread=bread, bacon=bacon)
+    plain = sandwich_model.Sandwich(sandwich_name="Plain", price=1.0)
+    db.add(plain)
+    db.commit()
+    return user, blt, plain
+
+
+def test_max_quantity_is_limited_by_the_scarcest_resource(client, db):
+    _, blt, plain = seed(db, bread=10, bacon=3)
+
+    # BLT needs 2 bread and 1 bacon; Plain has no recipe
+    assert availability(client) == {blt.id: (True, 3), plain.id: (True, None)}
+    assert [item["available"] for item in client.get("/sandwiches/").json()] == [True, True]
+
+
+def test_resource_updates_apply_without_reloading(client, db, query_counter):
+    _, blt, _ = seed(db)
+    availability(client)
+    query_counter.clear()
+
+    client.put("/resources/2", json={"amount": 0})
+    query_counter.clear()
+
+    assert availability(client)[blt.id] == (False, 0)
+    assert client.get(f"/sandwiches/{blt.id}").json()["available"] is False
+    assert not any("recipes" in statement for statement in query_counter)
+
+
+def test_writes_in_other_workers_show_up_within_the_ttl(client, db, monkeypatch):
+    _, blt, _ = seed(db, bread=10, bacon=4)
+    assert availability(client)[blt.id] == (True, 4)
+
+    # Another worker's write changes the row but not this worker's versions
+    db.get(resource_model.Resource, 2).amount = 0
+    db.commit()
+    assert availability(client)[blt.id] == (True, 4)
+
+    monkeypatch.setattr(conf, "cache_ttl", 0.01)
+    time.sleep(0.02)
+    assert availability(client)[blt.id] == (False, 0)
+
+
+def test_checkout_consumes_stock(client, db):
+    user, blt, _ = seed(db, bread=10, bacon=4)
+    availability(client)
+
+    client.post("/orders/checkout", json={"customer_name": "Jane", "user_id": user.id,
+                                          "items": [{"sandwich_id": blt.id, "amount": 3}]})
+
+    assert availability(client)[blt.id] == (True, 1)
+
+
+def test_recipe_changes_are_applied(client, db):
+    _, blt, _ = seed(db, bread=10, bacon=4)
+    availability(client)
+
+    client.put("/recipes/1", json={"amount": 5})  # 5 bread per BLT
+    assert availability(client)[blt.id] == (True, 2)
+
+    client.delete("/recipes/2")  # no more bacon
+    client.post("/recipes/", json={"sandwich_id": blt.id, "resource_id": 1, "amount": 1})
+    assert availability(client)[blt.id] == (True, 1)
+
+
+def test_writes_it_did_not_see_trigger_a_reload(client, db):
+    _, blt, _ = seed(db, bread=10, bacon=4)
+    availability(client)
+
+    client.put("/resources/bulk", json=[{"id": 1, "amount": 100}, {"id": 2, "amount": 50}])
+
+    assert availability(client)[blt.id] == (True, 50)
+
+
+def test_etag_changes_with_stock(client, db):
+    seed(db)
+    etag = client.get("/sandwiches/").headers["etag"]
+
+    client.put("/resources/2", json={"amount": 0})
+
+    assert client.get("/sandwiches/", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_a_reload_racing_a_checkout_does_not_deduct_twice(db):
+    _, blt, _ = seed(db, bread=10, bacon=4)
+
+    # The checkout has committed 3 bacon but not yet bumped the version when a read reloads
+    db.get(resource_model.Resource, 2).amount = 1
+    db.commit()
+    assert engine.max_quantity(db, blt.id) == 1
+
+    versions.bump("resources")
+    engine.resources_changed({1: 4, 2: 1})
+
+    assert engine.max_quantity(db, blt.id) == 1
@@ -0,0 +1,49 @@
+from ..benchmarks import kitchen as kitchen_bench
+from ..benchmarks import run as bench
+from ..benchmarks import workload
+
+
+def test_percentile_uses_nearest_rank():
+    values = list(range(1, 101))
+
+    assert bench.percentile(values, 50) == 50
+    assert bench.percentile(values, 95) == 95
+    assert bench.percentile(values, 99) == 99
+    assert bench.percentile([7], 99) == 7
+
+
+def test_plan_is_reproducible_for_a_seed():
+    counts = {"users": 5, "sandwiches": 3, "resources": 4, "orders": 10}
+
+    assert workload.plan(counts, 50, seed_value=1) == workload.plan(counts, 50, seed_value=1)
+    assert workload.plan(counts, 50, seed_value=1) != workload.plan(counts, 50, seed_value=2)
+
+
+def test_compare_flags_p95_regressions():
+    baseline = {"routes": {"GET /sandwiches/": {"p95_ms": 10.0}, "GET /stats/": {"p95_ms": 20.0}}}
+    report = {"routes": {"GET /sandwiches/": {"p95_ms": 13.0}, "GET /stats/": {"p95_ms": 21.0}}}
+
+    [regression] = bench.compare(report, baseline, tolerance=0.2)
+    assert regression["route"] == "GET /sandwiches/"
+
+
+def test_run_reports_every_route_in_the_mix(tmp_path):
+    report = bench.run(
+        f"sqlite:///{tmp_path / 'bench.db'}", requests=60, concurrency=2, warmup=5,
+        volumes={"users": 5, "sandwiches": 4, "resources": 4, "orders": 20},
+    )
+
+    assert report["total"]["count"] == 60
+    assert report["total"]["errors"] == 0
+    assert "POST /orders/checkout" in report["routes"]
+    assert report["config"]["volumes"]["orders"] >= 20
+    for route in report["routes"].values():
+        assert route["p50_ms"] <= route["p95_ms"] <= route["p99_ms"]
+
+
+def test_kitchen_benchmark_plans_and_serves_open_orders():
+    report = kitchen_bench.run_size(200, lookups=40, concurrency=2, repeats=2, write_interval=0.01)
+
+    assert report["orders"] == 200
+    assert report["failures"] == 0
+    assert report["sandwiches_per_batch"] > 1
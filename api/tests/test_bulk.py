@@ -0,0 +1,29 @@
+def test_bulk_create_update_delete_report_per_item(client):
+    created = client.post("/resources/bulk", json=[
+        {"item": "Bread", "amount": 10},
+        {"item": "Bacon", "amount": 5},
+    ])
+    assert created.status_code == 200
+    assert [r["status"] for r in created.json()] == ["created", "created"]
+    bread_id, bacon_id = (r["id"] for r in created.json())
+
+    updated = client.put("/resources/bulk", json=[
+        {"id": bread_id, "amount": 20},
+        {"id": 999, "amount": 1},
+    ])
+    assert [r["status"] for r in updated.json()] == ["updated", "not_found"]
+    assert client.get(f"/resources/{bread_id}").json()["amount"] == 20
+
+    deleted = client.request("DELETE", "/resources/bulk", json={"ids": [bacon_id, 999]})
+    assert [r["status"] for r in deleted.json()] == ["deleted", "not_found"]
+    assert [r["item"] for r in client.get("/resources/").json()] == ["Bread"]
+
+
+def test_bulk_create_is_all_or_nothing(client):
+    response = client.post("/sandwiches/bulk", json=[
+        {"sandwich_name": "BLT", "price": 5.5},
+        {"sandwich_name": "BLT", "price": 6.0},
+    ])
+
+    assert response.status_code == 400
+    assert client.get("/sandwiches/").json() == []
@@ -0,0 +1,70 @@
+from ..dependencies.cache import FileVersionStore, LocalVersionStore, TTLCache, VersionSnapshot
+from ..dependencies.config import conf
+
+
+def test_menu_read_is_served_from_cache_until_a_write(client, mocker):
+    client.post("/sandwiches/", json={"sandwich_name": "BLT", "price": 5.5})
+    assert len(client.get("/sandwiches/").json()) == 1
+
+    from ..controllers import sandwiches as controller
+    loader = mocker.spy(controller, "_read_all")
+    assert len(client.get("/sandwiches/").json()) == 1
+    assert loader.call_count == 0
+
+    client.post("/sandwiches/", json={"sandwich_name": "Club", "price": 7.0})
+    assert len(client.get("/sandwiches/").json()) == 2
+    assert loader.call_count == 1
+
+
+def test_file_versions_invalidate_across_caches(tmp_path):
+    # Two caches stand in for two uvicorn workers sharing one cache directory
+    worker_a = TTLCache(FileVersionStore(str(tmp_path)))
+    worker_b = TTLCache(FileVersionStore(str(tmp_path)))
+
+    assert worker_a.get_or_load(("sandwiches",), "menu", lambda: "v1") == "v1"
+    assert worker_a.get_or_load(("sandwiches",), "menu", lambda: "v2") == "v1"
+
+    worker_b.invalidate("sandwiches")
+    assert worker_a.get_or_load(("sandwiches",), "menu", lambda: "v2") == "v2"
+
+
+def test_lru_evicts_oldest_entry():
+    cache = TTLCache(LocalVersionStore(), maxsize=2)
+
+    cache.get_or_load(("t",), 1, lambda: "one")
+    cache.get_or_load(("t",), 2, lambda: "two")
+    cache.get_or_load(("t",), 1, lambda: "unused")
+    cache.get_or_load(("t",), 3, lambda: "three")
+
+    assert cache.get_or_load(("t",), 1, lambda: "reloaded") == "one"
+    assert cache.get_or_load(("t",), 2, lambda: "reloaded") == "reloaded"
+
+
+def test_snapshot_absorbs_only_the_next_write():
+    versions = LocalVersionStore()
+    snapshot = VersionSnapshot(versions, ("recipes", "resources"))
+    versions.bump("resources")
+    assert not snapshot.absorb("resources")  # nothing loaded yet
+    snapshot.mark(snapshot.current())
+
+    versions.bump("resources")
+    assert snapshot.absorb("resources")
+    assert snapshot.stale() == []
+
+    versions.bump("resources")
+    versions.bump("resources")
+    assert not snapshot.absorb("resources")
+    assert snapshot.stale() == ["resources"]
+
+
+def test_snapshot_expires_only_without_a_shared_store(tmp_path, monkeypatch):
+    local = VersionSnapshot(LocalVersionStore(), ("promos",))
+    shared = VersionSnapshot(FileVersionStore(str(tmp_path)), ("promos",))
+    for snapshot in (local, shared):
+        snapshot.mark(snapshot.current())
+        assert snapshot.stale() == []
+
+    monkeypatch.setattr(conf, "cache_ttl", 0)
+
+    assert local.stale() == ["promos"]
+    assert shared.stale() == []
@@ -0,0 +1,56 @@
+from ..models import recipes as recipe_model
+from ..models import resources as resource_model
+from ..models import sandwiches as sandwich_model
+from ..models import user as user_model
+from ..models import orders as order_model
+from ..models import payment as payment_model
+
+
+def seed_menu(db, bread=10, bacon=4):
+    user = user_model.User(name="Jane", email="jane@example.com", password="secret")
+    blt = sandwich_model.Sandwich(sandwich_name="BLT", price=5.0)
+    bread_stock = resource_model.Resource(item="Bread", amount=bread)
+    bacon_stock = resource_model.Resource(item="Bacon", amount=bacon)
+    db.add_all([user, blt, bread_stock, bacon_stock])
+    db.flush()
+    db.add_all([
+        recipe_model.Recipe(sandwich_id=blt.id, resource_id=bread_stock.id, amount=2),
+        recipe_model.Recipe(sandwich_id=blt.id, resource_id=bacon_stock.id, amount=1),
+    ])
+    db.commit()
+    return user, blt
+
+
+def test_checkout_places_order_and_deducts_stock(client, db):
+    user, blt = seed_menu(db)
+
+    response = client.post("/orders/checkout", json={
+        "customer_name": "Jane",
+        "user_id": user.id,
+        "items": [{"sandwich_id": blt.id, "amount": 2}, {"sandwich_id": blt.id, "amount": 1}],
+        "payment": {"payment_method": "Cash"},
+    })
+
+    assert response.status_code == 200
+    order = response.json()
+    assert [(d["sandwich"]["id"], d["amount"]) for d in order["order_details"]] == [(blt.id, 3)]
+    db.expire_all()
+    assert {r.item: r.amount for r in db.query(resource_model.Resource)} == {"Bread": 4, "Bacon": 1}
+    assert float(db.query(payment_model.Payment).one().amount) == 15.0
+
+
+def test_checkout_rejects_insufficient_stock_without_writing(client, db):
+    user, blt = seed_menu(db, bacon=1)
+
+    response = client.post("/orders/checkout", json={
+        "customer_name": "Jane",
+        "user_id": user.id,
+        "items": [{"sandwich_id": blt.id, "amount": 2}],
+    })
+
+    assert response.status_code == 409
+    [short] = response.json()["detail"]["insufficient_stock"]
+    assert short["item"] == "Bacon"
+    db.expire_all()
+    assert db.query(order_model.Order).count() == 0
+    assert {r.item: r.amount for r in db.query(resource_model.Resource)} == {"Bread": 10, "Bacon": 1}
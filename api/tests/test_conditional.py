@@ -0,0 +1,56 @@
+from email.utils import formatdate
+
+
+def test_etag_round_trip_and_write_invalidation(client, mocker):
+    client.post("/resources/", json={"item": "Bacon", "amount": 10})
+
+    first = client.get("/resources/")
+    etag = first.headers["ETag"]
+
+    from ..controllers import resources as controller
+    read_all = mocker.spy(controller, "read_all")
+    cached = client.get("/resources/", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert read_all.call_count == 0
+
+    client.put("/resources/1", json={"amount": 4})
+    changed = client.get("/resources/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()[0]["amount"] == 4
+
+
+def test_etag_depends_on_query_and_related_tables(client):
+    client.post("/sandwiches/", json={"sandwich_name": "BLT", "price": 5.5})
+    client.post("/resources/", json={"item": "Bacon", "amount": 10})
+
+    recipes_etag = client.get("/recipes/").headers["ETag"]
+    assert client.get("/recipes/", params={"limit": 5}).headers["ETag"] != recipes_etag
+
+    client.put("/sandwiches/1", json={"price": 6.0})
+    assert client.get("/recipes/", headers={"If-None-Match": recipes_etag}).status_code == 200
+
+
+def test_if_modified_since_without_etag(client, mocker):
+    from ..dependencies import conditional
+    mocker.patch.object(conditional.versions, "shared", True)
+    mocker.patch.object(conditional.versions, "last_modified", return_value=1_700_000_000)
+
+    response = client.get("/users/", headers={"If-Modified-Since": formatdate(1_700_000_000, usegmt=True)})
+    assert response.status_code == 304
+
+    response = client.get("/users/", headers={"If-Modified-Since": formatdate(1_600_000_000, usegmt=True)})
+    assert response.status_code == 200
+    assert response.headers["Last-Modified"] == formatdate(1_700_000_000, usegmt=True)
+
+
+def test_local_store_etags_lapse_after_the_cache_ttl(client, mocker):
+    from ..dependencies import conditional
+    clock = mocker.patch.object(conditional.time, "time", return_value=1_700_000_000)
+    etag = client.get("/users/").headers["ETag"]
+    assert "Last-Modified" not in client.get("/users/").headers
+
+    # A write in another worker would not bump this worker's counters
+    clock.return_value += conditional.conf.cache_ttl
+    assert client.get("/users/", headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,65 @@
+from ..models import orders as order_model
+from ..models import payment as payment_model
+from ..models import user as user_model
+
+
+def seed_order(db):
+    user = user_model.User(name="Jane", email="jane@example.com", password="secret")
+    db.add(user)
+    db.flush()
+    order = order_model.Order(user_id=user.id, customer_name="Jane")
+    db.add(order)
+    db.flush()
+    db.add(payment_model.Payment(order_id=order.id, amount=10, payment_method="Cash"))
+    db.commit()
+    return order
+
+
+def test_update_uses_update_returning(client, db, query_counter):
+    seed_order(db)
+    query_counter.clear()
+
+    response = client.put("/payment/1", json={"payment_method": "Card"})
+
+    assert response.status_code == 200
+    assert response.json()["payment_method"] == "Card"
+    assert len(query_counter) == 1
+    assert query_counter[0].startswith("UPDATE payments")
+
+
+def test_update_falls_back_to_one_reselect_without_returning(client, db, query_counter, sqlite_engine, monkeypatch):
+    seed_order(db)
+    monkeypatch.setattr(sqlite_engine.dialect, "update_returning", False)
+    query_counter.clear()
+
+    response = client.put("/payment/1", json={"payment_method": "Card"})
+
+    assert response.json()["payment_method"] == "Card"
+    assert len(query_counter) == 2
+
+
+def test_update_with_relationships_reselects_once(client, db, query_counter):
+    seed_order(db)
+    query_counter.clear()
+
+    response = client.put("/orders/1", json={"description": "No onions"})
+
+    assert response.json()["description"] == "No onions"
+    assert len(query_counter) == 2
+
+
+def test_missing_rows_are_detected_by_rowcount(client, db, query_counter):
+    seed_order(db)
+    query_counter.clear()
+
+    assert client.put("/payment/99", json={"payment_method": "Card"}).status_code == 404
+    assert client.delete("/payment/99").status_code == 404
+    assert len(query_counter) == 2
+
+
+def test_delete_is_a_single_statement(client, db, query_counter):
+    seed_order(db)
+    query_counter.clear()
+
+    assert client.delete("/payment/1").status_code == 204
+    assert len(query_counter) == 1
@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import func, select
+from ..datagen import loader
+from ..datagen.generator import Generator
+from ..models import orders as order_model
+from ..models import order_details as order_detail_model
+from ..models import payment as payment_model
+from ..models import review as review_model
+from ..models import sandwiches as sandwich_model
+
+
+def load(db, **kwargs):
+    generator = Generator(users=20, sandwiches=8, resources=10, orders=300, promos=3, seed_value=3,
+                          start_ids=loader.next_ids(db.connection()), **kwargs)
+    counts = loader.load(db.connection(), generator.batches(batch_size=50))
+    db.commit()
+    return counts
+
+
+def test_generated_rows_are_referentially_consistent(db):
+    counts = load(db)
+
+    assert counts["orders"] == 300
+    assert counts["payments"] == 300
+    assert counts["order_details"] >= 300
+    orphans = (
+        select(func.count()).select_from(order_detail_model.OrderDetail)
+        .outerjoin(order_model.Order, order_model.Order.id == order_detail_model.OrderDetail.order_id)
+        .where(order_model.Order.id.is_(None))
+    )
+    assert db.scalar(orphans) == 0
+    totals = dict(db.execute(
+        select(order_detail_model.OrderDetail.order_id,
+               func.sum(order_detail_model.OrderDetail.amount * sandwich_model.Sandwich.price))
+        .join(sandwich_model.Sandwich)
+        .group_by(order_detail_model.OrderDetail.order_id)
+    ).all())
+    for payment in db.scalars(select(payment_model.Payment)):
+        assert float(payment.amount) == pytest.approx(float(totals[payment.order_id]))
+    reviewed = select(order_model.Order.status).join(review_model.Review).distinct()
+    assert set(db.scalars(reviewed)) <= {"Delivered"}
+
+
+def test_second_run_appends_after_existing_ids(db):
+    load(db)
+    load(db)
+
+    assert db.scalar(select(func.count()).select_from(order_model.Order)) == 600
+    assert db.scalar(select(func.count(func.distinct(sandwich_model.Sandwich.sandwich_name)))) == 16
+
+
+def test_load_data_requires_mysql(db):
+    with pytest.raises(ValueError, match="MySQL"):
+        loader.load(db.connection(), [], method="load-data")
@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from ..controllers.export import CHUNK_ROWS
+from ..models import orders as order_model
+from ..models import order_details as order_detail_model
+from ..models import payment as payment_model
+from ..models import sandwiches as sandwich_model
+from ..models import user as user_model
+
+
+def seed(db):
+    user = user_model.User(name="Jane", email="jane@example.com", password="secret")
+    blt = sandwich_model.Sandwich(sandwich_name="BLT", price=5.0)
+    db.add_all([user, blt])
+    db.flush()
+    for day in (1, 2, 3):
+        order = order_model.Order(user_id=user.id, customer_name="Jane", order_date=datetime(2024, 3, day))
+        db.add(order)
+        db.flush()
+        db.add(order_detail_model.OrderDetail(order_id=order.id, sandwich_id=blt.id, amount=day))
+        db.add(payment_model.Payment(order_id=order.id, amount=5 * day, payment_method="Cash",
+                                     payment_date=datetime(2024, 3, day)))
+    db.commit()
+
+
+def test_orders_export_streams_ndjson_with_totals(client, db):
+    seed(db)
+
+    response = client.get("/orders/export", params={"start_date": "2024-03-02T00:00:00"})
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [(row["id"], float(row["total"])) for row in rows] == [(2, 10.0), (3, 15.0)]
+
+
+def test_payment_export_streams_csv(client, db):
+    seed(db)
+
+    response = client.get("/payment/export", params={"format": "csv"})
+
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["order_id"] for row in rows] == ["1", "2", "3"]
+    assert rows[0]["payment_method"] == "Cash"
+
+
+def test_csv_export_spans_several_chunks_within_the_date_range(client, db):
+    seed(db)
+    start = datetime(2024, 4, 1)
+    db.execute(insert(payment_model.Payment), [
+        {"order_id": 1, "amount": 1, "payment_method": "Card", "payment_date": start + timedelta(minutes=minute)}
+        for minute in range(3 * CHUNK_ROWS)
+    ])
+    db.commit()
+
+    # Start inclusive, end exclusive: minutes 500 to 2499 of the bulk rows
+    response = client.get("/payment/export", params={
+        "format": "csv",
+        "start_date": (start + timedelta(minutes=500)).isoformat(),
+        "end_date": (start + timedelta(minutes=2500)).isoformat(),
+    })
+
+    lines = response.text.splitlines()
+    assert lines.count(lines[0]) == 1
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 2000 > CHUNK_ROWS
+    dates = [row["payment_date"] for row in rows]
+    assert dates[0] == str(start + timedelta(minutes=500))
+    assert dates[-1] == str(start + timedelta(minutes=2499))
@@ -0,0 +1,61 @@
+import asyncio
+import pytest
+from ..controllers import health
+from ..dependencies.config import conf
+from ..dependencies.startup import Startup
+from .test_availability import seed
+
+
+@pytest.fixture
+def started(monkeypatch):
+    startup = Startup([("noop", lambda: None)])
+    asyncio.run(startup.run())
+    monkeypatch.setattr(health, "startup", startup)
+    return startup
+
+
+def test_live_needs_nothing(client):
+    assert client.get("/health/live").json() == {"status": "live"}
+
+
+def test_not_ready_until_startup_has_run(client):
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["detail"]["ready"] is False
+
+
+def test_ready_reports_phase_timings(client, started):
+    body = client.get("/health/ready").json()
+
+    assert body["status"] == "ready"
+    assert list(body["phases_ms"]) == ["noop"]
+    assert body["total_ms"] >= 0
+
+
+def test_failed_phases_are_retried_in_order(monkeypatch):
+    monkeypatch.setattr(conf, "startup_retry_initial", 0)
+    calls = []
+
+    def flaky():
+        calls.append("schema")
+        if calls.count("schema") < 3:
+            raise RuntimeError("database not reachable")
+
+    startup = Startup([("mappers", lambda: calls.append("mappers")), ("schema", flaky),
+                       ("pool", lambda: calls.append("pool"))])
+    asyncio.run(startup.run())
+
+    assert calls == ["mappers", "schema", "schema", "schema", "pool"]
+    assert startup.ready and startup.error is None
+    assert list(startup.report()["phases_ms"]) == ["mappers", "schema", "pool"]
+
+
+def test_warm_reads_leave_the_first_request_warm(client, db, query_counter):
+    seed(db)
+    health.warm_reads(db)
+    query_counter.clear()
+
+    assert client.get("/sandwiches/").status_code == 200
+    assert client.get("/search/", params={"q": "blt"}).json()[0]["text"] == "BLT"
+    assert not query_counter
@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+import pytest
+from ..controllers import kitchen
+from ..dependencies.config import conf
+from ..models import order_details as order_detail_model
+from ..models import orders as order_model
+from ..models import sandwiches as sandwich_model
+from ..models import user as user_model
+
+NOW = datetime(2026, 10, 18, 12, 0)
+
+
+@pytest.fixture(autouse=True)
+def kitchen_conf(monkeypatch):
+    for name, value in {"kitchen_stations": 2, "kitchen_batch_size": 4, "kitchen_batch_seconds": 60,
+                        "kitchen_item_seconds": 10, "kitchen_item_weight": 30,
+                        "kitchen_replan_min_interval": 0}.items():
+        monkeypatch.setattr(conf, name, value)
+
+
+def rows(*orders):
+    """``(order_id, minutes_ago, status, {sandwich_id: amount})`` -> rows as plan() reads them."""
+    for order_id, minutes_ago, order_status, lines in orders:
+        for sandwich_id, amount in lines.items():
+            yield order_id, NOW - timedelta(minutes=minutes_ago), order_status, sandwich_id, amount
+
+
+def test_older_orders_go_first_but_small_ones_can_slip_ahead():
+    schedule = kitchen.plan(rows(
+        (1, 10, "Placed", {1: 1}),
+        (2, 12, "Placed", {2: 1}),
+        (3, 12.2, "Placed", {3: 4, 4: 4}),  # 12s older than #2 but 7 sandwiches bigger
+    ), NOW)
+
+    assert [batch.order_ids for batch in schedule.batches][:2] == [[2], [1]]
+    assert schedule.positions == {2: 1, 1: 2, 3: 3}
+
+
+def test_orders_being_prepared_come_first():
+    schedule = kitchen.plan(rows((1, 30, "Placed", {1: 1}), (2, 1, "Preparing", {2: 1})), NOW)
+
+    assert schedule.batches[0].order_ids == [2]
+
+
+def test_identical_sandwiches_are_batched_across_orders():
+    schedule = kitchen.plan(rows(
+        (1, 10, "Placed", {1: 2}),
+        (2, 9, "Placed", {2: 1}),
+        (3, 8, "Placed", {1: 3}),
+    ), NOW)
+
+    first = schedule.batches[0]
+    assert (first.sandwich_id, first.amount, first.order_ids) == (1, 4, [1, 3])
+    # The rest of #3 has to wait for a station to free up
+    assert [(batch.sandwich_id, batch.amount, batch.order_ids) for batch in schedule.batches[1:]] == [
+        (2, 1, [2]), (1, 1, [3]),
+    ]
+
+
+def test_eta_is_when_the_last_batch_of_an_order_finishes():
+    schedule = kitchen.plan(rows(
+        (1, 20, "Placed", {1: 4, 2: 1}),
+        (2, 9, "Placed", {3: 1}),
+    ), NOW)
+
+    # Two stations: #1's two batches run side by side, then #2 waits for the first free one
+    assert schedule.ready == {1: 100, 2: 140}
+    assert schedule.at(schedule.ready[2]) == NOW + timedelta(seconds=140)
+
+
+def add_orders(db, *orders):
+    db.add(user_model.User(id=1, name="Jane", email="jane@example.com", password="x"))
+    db.add_all([sandwich_model.Sandwich(id=1, sandwich_name="BLT", price=5),
+                sandwich_model.Sandwich(id=2, sandwich_name="Club", price=6)])
+    for order_id, order_status, lines in orders:
+        db.add(order_model.Order(id=order_id, user_id=1, customer_name="Jane", status=order_status,
+                                 order_date=datetime.now() - timedelta(minutes=order_id)))
+        db.add_all([order_detail_model.OrderDetail(order_id=order_id, sandwich_id=sandwich_id, amount=amount)
+                    for sandwich_id, amount in lines.items()])
+    db.commit()
+
+
+def test_queue_and_eta_routes(client, db):
+    add_orders(db, (1, "Placed", {1: 2}), (2, "Placed", {1: 1, 2: 1}), (3, "Delivered", {2: 5}))
+
+    queue = client.get("/kitchen/").json()
+    assert (queue["open_orders"], queue["pending_batches"]) == (2, 2)
+    assert queue["batches"][0]["order_ids"] == [2, 1]
+
+    eta = client.get("/kitchen/orders/1").json()
+    assert (eta["position"], eta["wait_seconds"]) == (2, 90)
+    assert client.get("/kitchen/orders/3").status_code == 404
+
+
+def test_schedule_is_reused_until_an_order_changes(client, db, query_counter):
+    add_orders(db, (1, "Placed", {1: 2}))
+    client.get("/kitchen/")
+    query_counter.clear()
+
+    client.get("/kitchen/orders/1")
+    assert query_counter == []
+
+    client.put("/orders/1", json={"status": "Ready"})
+    assert client.get("/kitchen/orders/1").status_code == 404
+
+
+def test_replans_are_throttled_during_a_rush(client, db, monkeypatch):
+    monkeypatch.setattr(conf, "kitchen_replan_min_interval", 60)
+    add_orders(db, (1, "Placed", {1: 2}))
+    client.get("/kitchen/")
+
+    client.put("/orders/1", json={"status": "Ready"})
+    assert client.get("/kitchen/orders/1").status_code == 200
+
+    later = datetime.now() + timedelta(seconds=61)
+    assert 1 not in kitchen.kitchen.schedule(db, now=later).ready
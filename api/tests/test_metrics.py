@@ -0,0 +1,46 @@
+from ..models import sandwiches as sandwich_model
+
+
+def sample(text, name, **labels):
+    wanted = [f'{key}="{value}"' for key, value in labels.items()]
+    for line in text.splitlines():
+        if line.startswith(f"{name}{{") and all(label in line for label in wanted):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_metrics_count_requests_per_route_template(client, db):
+    db.add(sandwich_model.Sandwich(sandwich_name="BLT", price=5.0))
+    db.commit()
+    before = client.get("/metrics").text
+
+    client.get("/sandwiches/1")
+    client.get("/sandwiches/999")
+    after = client.get("/metrics")
+
+    assert after.headers["content-type"].startswith("text/plain")
+    route = {"method": "GET", "route": "/sandwiches/{item_id}"}
+    assert sample(after.text, "http_requests_total", status="200", **route) \
+        - sample(before, "http_requests_total", status="200", **route) == 1
+    assert sample(after.text, "http_requests_total", status="404", **route) \
+        - sample(before, "http_requests_total", status="404", **route) == 1
+    assert sample(after.text, "http_request_duration_seconds_count", **route) \
+        - sample(before, "http_request_duration_seconds_count", **route) == 2
+
+
+def test_metrics_record_db_time_and_response_size(client, db):
+    before = client.get("/metrics").text
+
+    client.get("/sandwiches/")
+    after = client.get("/metrics").text
+
+    route = {"method": "GET", "route": "/sandwiches/"}
+    assert sample(after, "http_request_db_seconds_sum", **route) > sample(before, "http_request_db_seconds_sum", **route)
+    assert sample(after, "http_response_size_bytes_sum", **route) \
+        - sample(before, "http_response_size_bytes_sum", **route) == len(b"[]")
+
+
+def test_unknown_paths_share_one_label(client):
+    client.get("/no-such-page")
+
+    assert 'route="<unmatched>"' in client.get("/metrics").text
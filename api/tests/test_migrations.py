@@ -0,0 +1,69 @@
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.pool import StaticPool
+from ..models import model_loader
+
+
+def _migrated_engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as connection:
+        command.upgrade(model_loader.alembic_config(connection), "head")
+    return engine
+
+
+def test_upgrade_head_builds_every_table():
+    engine = _migrated_engine()
+    tables = set(inspect(engine).get_table_names())
+
+    assert set(model_loader.Base.metadata.tables) <= tables
+    assert "alembic_version" in tables
+
+
+def test_upgrade_head_creates_hot_path_indexes():
+    engine = _migrated_engine()
+    inspector = inspect(engine)
+    orders = {index["name"]: index["column_names"] for index in inspector.get_indexes("orders")}
+    details = {index["name"]: index["column_names"] for index in inspector.get_indexes("order_details")}
+
+    assert orders["ix_orders_user_id_order_date"] == ["user_id", "order_date"]
+    assert orders["ix_orders_status_order_date"] == ["status", "order_date"]
+    assert details["ix_order_details_order_id_sandwich_id_amount"] == ["order_id", "sandwich_id", "amount"]
+
+
+def test_date_defaults_move_from_the_frozen_timestamp_to_current_timestamp():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+
+    def defaults():
+        inspector = inspect(engine)
+        return {table: {column["name"]: column["default"] for column in inspector.get_columns(table)}[column_name]
+                for table, column_name in (("orders", "order_date"), ("payments", "payment_date"),
+                                           ("reviews", "review_date"))}
+
+    with engine.begin() as connection:
+        command.upgrade(model_loader.alembic_config(connection), "0001")
+    assert not any("CURRENT_TIMESTAMP" in default for default in defaults().values())
+
+    with engine.begin() as connection:
+        command.upgrade(model_loader.alembic_config(connection), "head")
+    assert all(default == "CURRENT_TIMESTAMP" for default in defaults().values())
+
+
+def test_startup_check_rejects_unmigrated_database(mocker):
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    mocker.patch.object(model_loader, "engine", engine)
+    mocker.patch.object(model_loader.conf, "db_auto_migrate", False)
+
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        model_loader.index()
+
+
+def test_startup_check_can_auto_migrate(mocker):
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    mocker.patch.object(model_loader, "engine", engine)
+    mocker.patch.object(model_loader.conf, "db_auto_migrate", True)
+
+    model_loader.index()
+    model_loader.index()
+
+    assert "orders" in inspect(engine).get_table_names()
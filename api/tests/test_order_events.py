@@ -0,0 +1,118 @@
+import asyncio
+import pytest
+from ..dependencies import events
+from ..dependencies.config import conf
+from ..models import orders as order_model
+from ..models import user as user_model
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    broker = events.LocalBroker()
+    monkeypatch.setattr(events, "broker", broker)
+    return broker
+
+
+def add_order(db, user_id=1):
+    if db.get(user_model.User, user_id) is None:
+        db.add(user_model.User(id=user_id, name=f"user{user_id}", email=f"u{user_id}@example.com", password="x"))
+    order = order_model.Order(user_id=user_id, customer_name="Jane")
+    db.add(order)
+    db.commit()
+    return order.id
+
+
+def collect(broker, action, count=1, **filters):
+    """Run ``action`` in a worker thread, as a sync route would, and return the events a subscriber got."""
+    async def scenario():
+        subscription = broker.subscribe(
+            lambda event: all(event[key] == value for key, value in filters.items())
+        )
+        await asyncio.to_thread(action)
+        received = []
+        while len(received) < count:
+            event = await subscription.get(0.5)
+            if event is None:
+                break
+            received.append(event)
+        broker.unsubscribe(subscription)
+        return received
+
+    return asyncio.run(scenario())
+
+
+def test_update_publishes_only_the_changed_fields(client, db, broker):
+    order_id = add_order(db)
+
+    received = collect(broker, lambda: client.put(f"/orders/{order_id}", json={"status": "Ready",
+                                                                               "tracking_number": "TRK1"}))
+
+    assert received == [{"type": "updated", "order_id": order_id, "user_id": 1,
+                         "data": {"status": "Ready", "tracking_number": "TRK1"}}]
+    assert client.get(f"/orders/{order_id}").json()["tracking_number"] == "TRK1"
+
+
+def test_create_and_delete_are_published(client, db, broker):
+    add_order(db)
+
+    created = collect(broker, lambda: client.post("/orders/", json={"customer_name": "Jo", "user_id": 1}))
+    order_id = created[0]["order_id"]
+    deleted = collect(broker, lambda: client.delete(f"/orders/{order_id}"))
+
+    assert created[0]["type"] == "created"
+    assert created[0]["data"]["status"] == "Placed"
+    assert deleted == [{"type": "deleted", "order_id": order_id, "user_id": 1, "data": {}}]
+
+
+def test_subscribers_only_get_their_user_or_order(client, db, broker):
+    mine, theirs = add_order(db, user_id=1), add_order(db, user_id=2)
+
+    def update_both():
+        client.put(f"/orders/{mine}", json={"status": "Ready"})
+        client.put(f"/orders/{theirs}", json={"status": "Ready"})
+
+    assert [event["order_id"] for event in collect(broker, update_both, count=2, user_id=1)] == [mine]
+    assert [event["order_id"] for event in collect(broker, update_both, count=2, order_id=theirs)] == [theirs]
+
+
+def test_bulk_writes_publish_one_event_per_order(client, db, broker):
+    first, second = add_order(db), add_order(db)
+
+    received = collect(broker, lambda: client.put("/orders/bulk", json=[
+        {"id": first, "status": "Preparing"}, {"id": second, "status": "Ready"}, {"id": 999, "status": "Ready"},
+    ]), count=3)
+
+    assert [(event["order_id"], event["data"]) for event in received] == [
+        (first, {"status": "Preparing"}), (second, {"status": "Ready"}),
+    ]
+
+
+def test_slow_subscriber_is_told_to_resync(broker, monkeypatch):
+    monkeypatch.setattr(conf, "events_queue_size", 2)
+
+    async def scenario():
+        subscription = broker.subscribe()
+        for order_id in range(5):
+            broker.publish({"type": "updated", "order_id": order_id, "user_id": 1, "data": {}})
+        await asyncio.sleep(0)
+        return [await subscription.get(0.1) for _ in range(2)]
+
+    assert asyncio.run(scenario()) == [events.RESYNC, None]
+
+
+def test_sse_frames_events_and_heartbeats(broker):
+    async def scenario():
+        stream = events.sse(broker, lambda event: True, heartbeat=0.05)
+        frames = [await anext(stream)]
+        frames.append(await anext(stream))  # idle: heartbeat
+        broker.publish({"type": "created", "order_id": 7, "user_id": 1, "data": {}})
+        frames.append(await anext(stream))
+        await stream.aclose()
+        return frames
+
+    assert asyncio.run(scenario()) == [
+        "retry: 3000\n\n",
+        ": ping\n\n",
+        'event: created\ndata: {"type": "created", "order_id": 7, "user_id": 1, "data": {}}\n\n',
+    ]
+    assert not broker.listening()
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+from ..models import orders as order_model
+from ..models import sandwiches as sandwich_model
+from ..models import user as user_model
+
+
+def seed_orders(db, count):
+    user = user_model.User(name="Jane", email="jane@example.com", password="secret")
+    db.add(user)
+    db.flush()
+    start = datetime(2024, 1, 1)
+    for i in range(count):
+        db.add(order_model.Order(
+            user_id=user.id,
+            customer_name=f"Customer {i}",
+            order_date=start + timedelta(days=i % 5),
+            status="Placed" if i % 2 else "Delivered",
+        ))
+    db.commit()
+    return user
+
+
+def test_keyset_pages_cover_every_row_once(client, db):
+    seed_orders(db, 25)
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 10, "sort": "-order_date"}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/orders/", params=params)
+        assert response.status_code == 200
+        seen.extend(order["id"] for order in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert sorted(seen) == list(range(1, 26))
+    assert len(seen) == len(set(seen))
+
+
+def test_filters_by_status_and_date_range(client, db):
+    seed_orders(db, 10)
+
+    response = client.get("/orders/", params={
+        "status": "Placed",
+        "start_date": "2024-01-02T00:00:00",
+        "end_date": "2024-01-04T00:00:00",
+    })
+
+    orders = response.json()
+    assert orders
+    assert all(order["status"] == "Placed" for order in orders)
+    assert all("2024-01-02" <= order["order_date"] < "2024-01-04" for order in orders)
+
+
+def test_rejects_unknown_sort_key_and_bad_cursor(client, db):
+    db.add(sandwich_model.Sandwich(sandwich_name="BLT", price=5.5))
+    db.commit()
+
+    assert client.get("/sandwiches/", params={"sort": "sandwich_name"}).status_code == 400
+    assert client.get("/sandwiches/", params={"cursor": "not-a-cursor"}).status_code == 400
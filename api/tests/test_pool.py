@@ -0,0 +1,33 @@
+from sqlalchemy import create_engine, text
+from ..dependencies import pool_metrics
+from ..dependencies.pool_metrics import InstrumentedQueuePool
+
+
+def test_pool_snapshot_tracks_checkouts_and_invalidations(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=2,
+        max_overflow=1,
+    )
+    pool_metrics.instrument(engine)
+
+    with engine.connect() as first, engine.connect():
+        first.execute(text("SELECT 1"))
+        stats = pool_metrics.snapshot(engine.pool)
+        assert stats["checked_out"] == 2
+        first.invalidate()
+
+    stats = pool_metrics.snapshot(engine.pool)
+    assert stats["checked_out"] == 0
+    assert stats["connects"] == 2
+    assert stats["invalidations"] == 1
+    assert stats["wait_time"]["count"] == 2
+    engine.dispose()
+
+
+def test_pool_endpoint_reports_engine_pool(client):
+    stats = client.get("/pool/").json()
+
+    assert stats["size"] == 5
+    assert "+Inf" in stats["wait_time"]["buckets"]
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+from ..dependencies.config import conf
+from ..models import payment as payment_model
+from ..models import promo as promo_model
+from .test_checkout import seed_menu
+
+
+def add_promo(db, code, discount_type="Percentage", value=10, days=(-1, 1), is_active=1):
+    now = datetime.now()
+    promo = promo_model.Promo(
+        code=code, discount_type=discount_type, value=value, is_active=is_active,
+        start_date=now + timedelta(days=days[0]), end_date=now + timedelta(days=days[1]),
+    )
+    db.add(promo)
+    db.commit()
+    return promo
+
+
+def test_validate_checks_active_flag_and_dates(client, db):
+    add_promo(db, "SAVE10", value=10)
+    add_promo(db, "OLD", days=(-10, -5))
+    add_promo(db, "OFF", is_active=0)
+
+    ok = client.post("/promos/validate", json={"code": "save10", "subtotal": 20}).json()
+    assert (ok["valid"], ok["discount"], ok["total"]) == (True, 2.0, 18.0)
+    assert client.post("/promos/validate", json={"code": "OLD"}).json()["reason"] == "Promo has expired"
+    assert client.post("/promos/validate", json={"code": "OFF"}).json()["valid"] is False
+    assert client.post("/promos/validate", json={"code": "NOPE"}).json()["valid"] is False
+
+
+def test_lookups_hit_the_index_not_the_database(client, db, query_counter):
+    add_promo(db, "SAVE10")
+    client.post("/promos/validate", json={"code": "SAVE10"})
+    query_counter.clear()
+
+    for _ in range(5):
+        assert client.post("/promos/validate", json={"code": "SAVE10"}).json()["valid"]
+
+    assert query_counter == []
+
+
+def test_promo_writes_refresh_the_index(client, db):
+    promo = add_promo(db, "SAVE10")
+    assert client.post("/promos/validate", json={"code": "SAVE10"}).json()["valid"]
+
+    client.put(f"/promos/{promo.id}", json={"is_active": 0})
+
+    assert client.post("/promos/validate", json={"code": "SAVE10"}).json()["valid"] is False
+
+
+def test_writes_in_other_workers_reach_the_index_within_the_ttl(client, db, monkeypatch):
+    promo = add_promo(db, "SAVE10")
+    assert client.post("/promos/validate", json={"code": "SAVE10"}).json()["valid"]
+
+    # Another worker's write changes the row but not this worker's versions
+    promo.is_active = 0
+    db.commit()
+    assert client.post("/promos/validate", json={"code": "SAVE10"}).json()["valid"]
+
+    monkeypatch.setattr(conf, "cache_ttl", 0)
+    assert client.post("/promos/validate", json={"code": "SAVE10"}).json()["valid"] is False
+
+
+def test_quote_stacks_percentage_before_fixed_amounts(client, db):
+    user, blt = seed_menu(db)
+    add_promo(db, "FIVE", discount_type="Fixed Amount", value=5)
+    add_promo(db, "HALF", value=50)
+
+    quote = client.post("/promos/quote", json={
+        "codes": ["FIVE", "HALF", "half", "BOGUS"], "items": [{"sandwich_id": blt.id, "amount": 4}],
+    }).json()
+
+    assert [promo["code"] for promo in quote["applied"]] == ["HALF", "FIVE"]
+    assert (quote["subtotal"], quote["discount"], quote["total"]) == (20.0, 15.0, 5.0)
+    assert quote["rejected"] == [{"code": "BOGUS", "reason": "Unknown or inactive promo code"}]
+
+
+def test_checkout_charges_the_discounted_total(client, db):
+    user, blt = seed_menu(db)
+    add_promo(db, "SAVE10", value=10)
+
+    response = client.post("/orders/checkout", json={
+        "customer_name": "Jane", "user_id": user.id, "items": [{"sandwich_id": blt.id, "amount": 2}],
+        "payment": {"payment_method": "Cash"}, "promo_codes": ["SAVE10"],
+    })
+
+    assert response.status_code == 200
+    assert float(db.query(payment_model.Payment).one().amount) == 9.0
+
+
+def test_checkout_rejects_invalid_promo_codes(client, db):
+    user, blt = seed_menu(db)
+
+    response = client.post("/orders/checkout", json={
+        "customer_name": "Jane", "user_id": user.id, "items": [{"sandwich_id": blt.id, "amount": 1}],
+        "promo_codes": ["BOGUS"],
+    })
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["invalid_promo_codes"][0]["code"] == "BOGUS"
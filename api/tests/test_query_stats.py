@@ -0,0 +1,45 @@
+from ..datagen import loader
+from ..datagen.generator import Generator
+from ..dependencies import query_stats
+from ..dependencies.config import conf
+from .conftest import QUERY_BUDGETS
+
+
+def seed(db):
+    generator = Generator(users=5, sandwiches=6, resources=6, orders=12, promos=3, seed_value=1)
+    loader.load(db.connection(), generator.batches())
+    db.commit()
+
+
+def test_shape_ignores_values_and_list_lengths():
+    assert query_stats.shape("SELECT * FROM t WHERE id IN (?, ?, ?)") == \
+        query_stats.shape("SELECT *\n  FROM t WHERE id IN (?, ?)")
+    assert query_stats.shape("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") == \
+        query_stats.shape("INSERT INTO t (a, b) VALUES (?, ?)")
+
+
+def test_debug_headers_report_queries(client, db, monkeypatch):
+    seed(db)
+    monkeypatch.setattr(conf, "debug", True)
+
+    response = client.get("/recipes/")
+
+    assert response.headers["X-Query-Count"] == "1"
+    assert response.headers["X-Query-Duplicates"] == "0"
+    assert float(response.headers["X-Query-Time-Ms"]) >= 0
+
+
+def test_headers_are_off_outside_debug(client):
+    assert "X-Query-Count" not in client.get("/sandwiches/").headers
+
+
+def test_list_routes_load_relationships_without_n_plus_one(client, db):
+    seed(db)
+
+    with query_stats.record() as requests:
+        for url in ["/recipes/", "/orderdetails/", "/orders/", "/payment/", "/reviews/", "/users/"]:
+            assert client.get(url).status_code == 200
+
+    for method, route, stats in requests:
+        assert stats.count <= QUERY_BUDGETS[f"{method} {route}"], route
+        assert stats.duplicates == 0, route
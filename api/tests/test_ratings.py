@@ -0,0 +1,184 @@
+from alembic import command
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+from ..controllers import ratings
+from ..dependencies import auth
+from ..models import model_loader
+from ..models import order_details as order_detail_model
+from ..models import orders as order_model
+from ..models import rating_summary as summary_model
+from ..models import sandwiches as sandwich_model
+from ..models import user as user_model
+
+
+def seed(db):
+    """Two customers; order 1 has a BLT and a Club, order 2 only a BLT."""
+    jane = user_model.User(name="Jane", email="jane@example.com", password="x")
+    john = user_model.User(name="John", email="john@example.com", password="x")
+    blt = sandwich_model.Sandwich(sandwich_name="BLT", price=5.0)
+    club = sandwich_model.Sandwich(sandwich_name="Club", price=6.0)
+    db.add_all([jane, john, blt, club])
+    db.flush()
+    first = order_model.Order(customer_name="Jane", user_id=jane.id)
+    second = order_model.Order(customer_name="John", user_id=john.id)
+    db.add_all([first, second])
+    db.flush()
+    db.add_all([
+        order_detail_model.OrderDetail(order_id=first.id, sandwich_id=blt.id, amount=1),
+        order_detail_model.OrderDetail(order_id=first.id, sandwich_id=blt.id, amount=2),
+        order_detail_model.OrderDetail(order_id=first.id, sandwich_id=club.id, amount=1),
+        order_detail_model.OrderDetail(order_id=second.id, sandwich_id=blt.id, amount=1),
+    ])
+    db.commit()
+    return jane, john, blt, club, first, second
+
+
+def review(client, user, order, rating):
+    response = client.post("/reviews/", json={"user_id": user.id, "order_id": order.id, "rating": rating})
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def summary(client, path):
+    body = client.get(f"/ratings/{path}").json()
+    return body["count"], body["average"], body["histogram"]
+
+
+def test_reviews_update_the_summaries(client, db):
+    jane, john, blt, club, first, second = seed(db)
+
+    jane_review = review(client, jane, first, 5)
+    review(client, john, second, 2)
+
+    # The BLT appears twice on order 1 but the review counts once for it
+    assert summary(client, f"sandwiches/{blt.id}") == (2, 3.5, [0, 1, 0, 0, 1])
+    assert summary(client, f"sandwiches/{club.id}") == (1, 5.0, [0, 0, 0, 0, 1])
+    assert summary(client, f"users/{jane.id}") == (1, 5.0, [0, 0, 0, 0, 1])
+    assert summary(client, "") == (2, 3.5, [0, 1, 0, 0, 1])
+
+    client.put(f"/reviews/{jane_review}", json={"rating": 3})
+    assert summary(client, f"sandwiches/{club.id}") == (1, 3.0, [0, 0, 1, 0, 0])
+    client.put(f"/reviews/{jane_review}", json={"comment": "Fine"})
+    assert summary(client, "") == (2, 2.5, [0, 1, 1, 0, 0])
+
+    client.delete(f"/reviews/{jane_review}")
+    assert summary(client, f"sandwiches/{club.id}") == (0, None, [0, 0, 0, 0, 0])
+    assert [row["subject_id"] for row in client.get("/ratings/sandwiches").json()] == [blt.id]
+
+
+def test_reads_do_not_touch_reviews(client, db, query_counter):
+    jane, _, blt, _, first, _ = seed(db)
+    review(client, jane, first, 4)
+    query_counter.clear()
+
+    client.get("/ratings/sandwiches")
+    client.get(f"/ratings/sandwiches/{blt.id}")
+
+    assert query_counter and not any("reviews" in statement for statement in query_counter)
+
+
+def test_sandwich_and_stats_reads_use_the_summaries(client, db, query_counter):
+    jane, john, blt, club, first, second = seed(db)
+    review(client, jane, first, 5)
+    review(client, john, second, 2)
+    query_counter.clear()
+
+    listed = {item["id"]: item for item in client.get("/sandwiches/").json()}
+    stats = client.get("/stats/").json()
+
+    assert (listed[blt.id]["rating_count"], listed[blt.id]["average_rating"]) == (2, 3.5)
+    assert (listed[club.id]["rating_count"], listed[club.id]["average_rating"]) == (1, 5.0)
+    assert (stats["total_reviews"], stats["average_rating"]) == (2, 3.5)
+    assert not any("FROM reviews" in statement for statement in query_counter)
+
+    client.delete("/reviews/1")
+    item = client.get(f"/sandwiches/{club.id}").json()
+    assert (item["rating_count"], item["average_rating"]) == (0, None)
+
+
+def test_etag_follows_review_writes(client, db):
+    jane, _, _, _, first, _ = seed(db)
+    etag = client.get("/ratings/").headers["etag"]
+    assert client.get("/ratings/", headers={"If-None-Match": etag}).status_code == 304
+
+    review(client, jane, first, 4)
+
+    assert client.get("/ratings/", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_bulk_routes_update_the_summaries(client, db):
+    jane, john, blt, _, first, second = seed(db)
+
+    created = client.post("/reviews/bulk", json=[
+        {"user_id": jane.id, "order_id": first.id, "rating": 4},
+        {"user_id": john.id, "order_id": second.id, "rating": 2},
+    ]).json()
+    client.put("/reviews/bulk", json=[{"id": created[1]["id"], "rating": 5}])
+    assert summary(client, f"sandwiches/{blt.id}") == (2, 4.5, [0, 0, 0, 1, 1])
+
+    client.request("DELETE", "/reviews/bulk", json={"ids": [created[0]["id"]]})
+    assert summary(client, f"users/{jane.id}") == (0, None, [0, 0, 0, 0, 0])
+
+
+def test_ratings_must_be_one_to_five(client, db):
+    jane, _, _, _, first, _ = seed(db)
+
+    assert client.post("/reviews/", json={"user_id": jane.id, "order_id": first.id, "rating": 6}).status_code == 422
+    assert client.put("/reviews/1", json={"rating": 0}).status_code == 422
+
+
+def test_rebuild_repairs_drift(client, db):
+    jane, _, blt, club, first, _ = seed(db)
+    review(client, jane, first, 4)
+    # The Club is taken off the reviewed order and a stray row appears
+    db.query(order_detail_model.OrderDetail).filter_by(sandwich_id=club.id).delete()
+    db.add(summary_model.RatingSummary(scope="user", subject_id=99, count=1, total=3,
+                                       stars_1=0, stars_2=0, stars_3=1, stars_4=0, stars_5=0))
+    db.commit()
+
+    assert ratings.rebuild(db) == {"checked": 5, "fixed": 2}
+    assert summary(client, f"sandwiches/{club.id}") == (0, None, [0, 0, 0, 0, 0])
+    assert summary(client, f"sandwiches/{blt.id}") == (1, 4.0, [0, 0, 0, 1, 0])
+    assert ratings.rebuild(db) == {"checked": 3, "fixed": 0}
+
+
+def test_details_without_a_sandwich_are_skipped(client, db):
+    jane, _, blt, _, first, _ = seed(db)
+    db.add(order_detail_model.OrderDetail(order_id=first.id, sandwich_id=None, amount=1))
+    db.commit()
+
+    review(client, jane, first, 4)
+
+    assert [row["subject_id"] for row in client.get("/ratings/sandwiches").json()] == [blt.id, blt.id + 1]
+    assert ratings.rebuild(db) == {"checked": 4, "fixed": 0}
+
+
+def test_rebuild_route_is_admin_only(client, db):
+    admin = user_model.User(id=1, name="A", email="a@x.com", user_role="Admin")
+    customer = user_model.User(id=2, name="C", email="c@x.com", user_role="Customer")
+
+    def post(user):
+        return client.post("/ratings/rebuild", headers={"Authorization": f"Bearer {auth.issue_token(user)}"})
+
+    assert post(customer).status_code == 403
+    assert post(admin).json() == {"checked": 0, "fixed": 0}
+
+
+def test_migration_backfills_existing_reviews():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as connection:
+        config = model_loader.alembic_config(connection)
+        command.upgrade(config, "0002")
+        connection.execute(text("INSERT INTO users (id, name, email, password) "
+                                "VALUES (1, 'Jane', 'jane@example.com', 'x')"))
+        connection.execute(text("INSERT INTO sandwiches (id, sandwich_name, price) VALUES (1, 'BLT', 5)"))
+        connection.execute(text("INSERT INTO orders (id, customer_name, user_id) VALUES (1, 'Jane', 1)"))
+        connection.execute(text("INSERT INTO order_details (order_id, sandwich_id, amount) "
+                                "VALUES (1, 1, 2), (1, NULL, 1)"))
+        connection.execute(text("INSERT INTO reviews (user_id, order_id, rating) VALUES (1, 1, 4), (1, 1, 2)"))
+        command.upgrade(config, "head")
+
+        rows = connection.execute(text("SELECT scope, subject_id, count, total, stars_2, stars_4 "
+                                       "FROM rating_summaries ORDER BY scope")).all()
+
+    assert rows == [("global", 0, 2, 6, 1, 1), ("sandwich", 1, 2, 6, 1, 1), ("user", 1, 2, 6, 1, 1)]
@@ -0,0 +1,120 @@
+import time
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from ..dependencies import replicas
+from ..dependencies.cache import versions
+from ..dependencies.config import conf
+from ..dependencies.database import Base
+from ..models import user as user_model
+
+
+def make_replica(tmp_path, name, lag_probe=replicas.replication_lag):
+    # A SQLite file per replica stands in for a MySQL read replica
+    replica = replicas.Replica(f"sqlite:///{tmp_path / name}.db", lag_probe=lag_probe)
+    Base.metadata.create_all(replica.engine)
+    session = sessionmaker(bind=replica.engine)()
+    session.add(user_model.User(name=name, email=f"{name}@example.com", password="secret"))
+    session.commit()
+    session.close()
+    replica.available()  # probe now so the lag check is not counted in a request's query budget
+    return replica
+
+
+@pytest.fixture
+def use_replicas(monkeypatch):
+    # Writes made by earlier tests would otherwise pin every read to the primary
+    started = time.time()
+    last_modified = versions.last_modified
+
+    def since_test_started(table):
+        written = last_modified(table)
+        return written if written is not None and written >= started else None
+
+    monkeypatch.setattr(versions, "last_modified", since_test_started)
+
+    def install(*replica_list):
+        monkeypatch.setattr(replicas, "replica_set", replicas.ReplicaSet(replica_list))
+    yield install
+
+
+def names(client):
+    return [user["name"] for user in client.get("/users/").json()]
+
+
+def test_reads_use_the_primary_without_replicas(client, db):
+    db.add(user_model.User(name="primary", email="primary@example.com", password="secret"))
+    db.commit()
+
+    assert names(client) == ["primary"]
+
+
+def test_reads_round_robin_across_replicas(client, tmp_path, use_replicas):
+    use_replicas(make_replica(tmp_path, "replica1"), make_replica(tmp_path, "replica2"))
+
+    assert [names(client) for _ in range(4)] == [["replica1"], ["replica2"], ["replica1"], ["replica2"]]
+    assert client.get("/users/1").json()["name"] == "replica1"
+
+
+def test_lagging_replica_is_skipped(client, tmp_path, use_replicas):
+    behind = make_replica(tmp_path, "behind", lag_probe=lambda connection: conf.db_replica_max_lag + 1)
+    use_replicas(behind, make_replica(tmp_path, "caught_up"))
+
+    assert [names(client) for _ in range(3)] == [["caught_up"]] * 3
+
+
+def test_unreachable_replicas_fall_back_to_the_primary(client, db, tmp_path, use_replicas):
+    def down(connection):
+        raise OperationalError("SHOW REPLICA STATUS", {}, Exception("connection refused"))
+
+    db.add(user_model.User(name="primary", email="primary@example.com", password="secret"))
+    db.commit()
+    use_replicas(make_replica(tmp_path, "down", lag_probe=down))
+
+    assert names(client) == ["primary"]
+
+
+def test_recent_writes_are_read_from_the_primary(client, tmp_path, use_replicas, monkeypatch):
+    use_replicas(make_replica(tmp_path, "replica1"))
+    created = client.post("/users/", json={"name": "new", "email": "new@example.com", "password": "secret"})
+    assert created.status_code == 200
+
+    assert names(client) == ["new"]
+
+    # Once the write is older than the allowed lag the replica is safe again
+    written = versions.last_modified("users")
+    monkeypatch.setattr(replicas.time, "time", lambda: written + conf.db_replica_max_lag)
+    assert names(client) == ["replica1"]
+
+
+def test_writes_always_use_the_primary(client, db, tmp_path, use_replicas):
+    use_replicas(make_replica(tmp_path, "replica1"))
+    client.post("/users/", json={"name": "new", "email": "new@example.com", "password": "secret"})
+
+    assert [user.name for user in db.query(user_model.User)] == ["new"]
+
+
+def test_lag_is_probed_once_per_interval(tmp_path, monkeypatch):
+    probes = []
+    replica = make_replica(tmp_path, "replica1", lag_probe=lambda connection: probes.append(1) or 0)
+    monkeypatch.setattr(conf, "db_replica_check_interval", 60)
+
+    assert all(replica.available() for _ in range(5))
+    assert len(probes) == 1
+
+
+def test_lag_probe_falls_back_to_the_pre_8_0_22_statement(mocker):
+    connection = mocker.Mock()
+    connection.dialect.name = "mysql"
+
+    def execute(statement):
+        if str(statement) == "SHOW REPLICA STATUS":
+            raise OperationalError(str(statement), {}, Exception("You have an error in your SQL syntax"))
+        result = mocker.Mock()
+        result.mappings.return_value.first.return_value = {"Seconds_Behind_Master": 3}
+        return result
+
+    connection.execute.side_effect = execute
+
+    assert replicas.replication_lag(connection) == 3
+    connection.rollback.assert_called_once()
@@ -0,0 +1,119 @@
+from ..controllers.search import SearchIndex
+from ..dependencies.cache import LocalVersionStore
+from ..dependencies.config import conf
+from ..models import orders as order_model
+from ..models import review as review_model
+from ..models import sandwiches as sandwich_model
+from ..models import user as user_model
+
+
+def seed(db):
+    user = user_model.User(name="Jane", email="jane@example.com", password="x")
+    db.add_all([
+        user,
+        sandwich_model.Sandwich(sandwich_name="Turkey Club", price=6.0),
+        sandwich_model.Sandwich(sandwich_name="Tuna Melt", price=5.0),
+        sandwich_model.Sandwich(sandwich_name="BLT", price=5.0),
+    ])
+    db.flush()
+    order = order_model.Order(customer_name="Jane", user_id=user.id, description="No tomato on the turkey")
+    db.add(order)
+    db.flush()
+    db.add_all([
+        review_model.Review(user_id=user.id, order_id=order.id, rating=2, comment="Bread was soggy, soggy!"),
+        review_model.Review(user_id=user.id, order_id=order.id, rating=4, comment="Soggy fries but great turkey"),
+        review_model.Review(user_id=user.id, order_id=order.id, rating=5, comment=None),
+    ])
+    db.commit()
+    return user, order
+
+
+def search(client, q, **params):
+    return [(hit["kind"], hit["id"]) for hit in client.get("/search/", params={"q": q, **params}).json()]
+
+
+def test_results_are_ranked_across_kinds(client, db):
+    seed(db)
+
+    # Two mentions outrank one
+    assert search(client, "soggy") == [("review", 1), ("review", 2)]
+    assert search(client, "turkey") == [("sandwich", 1), ("review", 2), ("order", 1)]
+    assert search(client, "turkey", kind="review") == [("review", 2)]
+    # Every word has to match
+    assert search(client, "soggy turkey") == [("review", 2)]
+    assert search(client, "soggy tuna") == []
+
+
+def test_partial_words_match_by_prefix(client, db):
+    seed(db)
+
+    assert search(client, "tu", kind="sandwich") == [("sandwich", 2), ("sandwich", 1)]
+    assert search(client, "MEL") == [("sandwich", 2)]
+    # Too short to expand
+    assert search(client, "t") == []
+
+
+def test_pages_follow_the_cursor(client, db):
+    seed(db)
+
+    first = client.get("/search/", params={"q": "turkey", "limit": 2})
+    second = client.get("/search/", params={"q": "turkey", "limit": 2, "cursor": first.headers["x-next-cursor"]})
+
+    assert [hit["id"] for hit in first.json()] == [1, 2]
+    assert [(hit["kind"], hit["id"]) for hit in second.json()] == [("order", 1)]
+    assert "x-next-cursor" not in second.headers
+    assert client.get("/search/", params={"q": "turkey", "cursor": "bad"}).status_code == 400
+
+
+def test_controller_writes_update_the_index_without_reloading(client, db, query_counter):
+    user, order = seed(db)
+    search(client, "soggy")
+    query_counter.clear()
+
+    client.post("/sandwiches/", json={"sandwich_name": "Soggy Surprise", "price": 1.0})
+    client.put("/reviews/1", json={"comment": "Crisp bread"})
+    client.post("/reviews/", json={"user_id": user.id, "order_id": order.id, "rating": 3, "comment": "soggy"})
+    client.put(f"/orders/{order.id}", json={"description": "Extra soggy"})
+    client.delete("/reviews/2")
+    query_counter.clear()
+
+    assert search(client, "soggy") == [("review", 4), ("sandwich", 4), ("order", 1)]
+    assert search(client, "crisp") == [("review", 1)]
+    assert not query_counter
+
+
+def test_bulk_writes_reload_the_column(client, db):
+    seed(db)
+    search(client, "soggy")
+
+    client.post("/sandwiches/bulk", json=[{"sandwich_name": "Soggy Sub", "price": 1.0}])
+
+    assert search(client, "sub") == [("sandwich", 4)]
+
+
+def test_writes_in_other_workers_show_up_within_the_ttl(db, monkeypatch):
+    seed(db)
+    index = SearchIndex(LocalVersionStore())
+    assert index.search(db, "sub") == []
+
+    # Another worker's write adds the row but moves none of this worker's versions
+    db.add(sandwich_model.Sandwich(sandwich_name="Soggy Sub", price=1.0))
+    db.commit()
+    assert index.search(db, "sub") == []
+
+    monkeypatch.setattr(conf, "cache_ttl", 0)
+    assert [hit[:2] for hit in index.search(db, "sub")] == [("sandwich", 4)]
+
+
+def test_removed_words_stop_matching(db):
+    seed(db)
+    versions = LocalVersionStore()
+    index = SearchIndex(versions)
+    index.search(db, "melt")
+
+    versions.bump("sandwiches")
+    index.changed("sandwich", 2, None)
+
+    assert index.search(db, "melt") == []
+    assert index.search(db, "tuna") == []
+    assert [hit[1] for hit in index.search(db, "club")] == [1]
@@ -0,0 +1,51 @@
+import json
+from sqlalchemy import select
+from ..benchmarks import serialization as bench
+from ..datagen import loader
+from ..datagen.generator import Generator
+from ..dependencies import serialization
+from ..dependencies.config import conf
+from ..models import orders as order_model
+from ..models import sandwiches as sandwich_model
+from ..schemas import orders as order_schema
+from ..schemas import sandwiches as sandwich_schema
+
+
+def seed(db):
+    loader.load(db.connection(), Generator(users=4, sandwiches=5, resources=5, orders=15, seed_value=2).batches())
+    db.commit()
+
+
+def test_schemas_read_orm_attributes(db):
+    seed(db)
+    sandwich = db.scalars(select(sandwich_model.Sandwich)).first()
+
+    assert sandwich_schema.Sandwich.model_validate(sandwich).id == sandwich.id
+
+
+def test_fast_path_matches_response_model_output(db):
+    seed(db)
+    orders = db.scalars(select(order_model.Order)).all()
+
+    adapter = serialization.adapter(order_schema.Order)
+    expected = json.loads(adapter.dump_json(adapter.validate_python(orders, from_attributes=True)))
+    assert json.loads(serialization.dumps(order_schema.Order, orders)) == expected
+
+
+def test_fast_json_routes_keep_cursor_and_etag(client, db, monkeypatch):
+    seed(db)
+    slow = client.get("/orders/?limit=5")
+    monkeypatch.setattr(conf, "fast_json", True)
+
+    fast = client.get("/orders/?limit=5")
+
+    assert fast.json() == slow.json()
+    assert fast.headers["X-Next-Cursor"] == slow.headers["X-Next-Cursor"]
+    assert fast.headers["ETag"] == slow.headers["ETag"]
+
+
+def test_serialization_benchmark_reports_every_strategy():
+    results = bench.measure(bench.load_rows(50), repeat=1)
+
+    assert set(results) == {"orders", "payments"}
+    assert set(bench.STRATEGIES) <= set(results["orders"]["ms_per_10k"])